@@ -1,4 +1,3 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 import os
 from dotenv import load_dotenv
@@ -13,6 +12,7 @@ from mcp_servers.compliance.server import redact_pii
 from mcp_servers.citation_validation.server import verify_citations_internal, parse_web_search_results
 
 from .report_generator import ReportGenerator
+from .llm_factory import get_chat_model
 from datetime import datetime
 from typing import Optional
 from langfuse.langchain import CallbackHandler
@@ -25,7 +25,7 @@ if not api_key:
     print("WARNING: OPENAI_API_KEY not found. Using mock LLM response.")
     llm = None
 else:
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    llm = get_chat_model("gpt-4o-mini", temperature=0)
 
 from .graph import graph
 from langchain_core.messages import HumanMessage
@@ -38,16 +38,16 @@ class ResearchAgent:
         self.langfuse_handler = CallbackHandler()
         self.orchestrator = OrchestratorAgent(self.graph)
 
-    async def run(self, query: str, thread_id: str = "default", job_id: Optional[int] = None):
+    async def run(self, query: str, thread_id: str = "default", job_id: Optional[int] = None, profile: Optional[str] = None, use_cache: bool = True, delta: bool = True):
         """Executes the agent workflow for a given query."""
         # Use provided job_id or try to parse from thread_id
         if job_id is None and thread_id.isdigit():
             job_id = int(thread_id)
             
-        print(f"--- Starting ResearchAgent for Query: {query} (job_id: {job_id}) ---")
+        print(f"--- Starting ResearchAgent for Query: {query} (job_id: {job_id}, profile: {profile}) ---")
         
         try:
-            result = await self.orchestrator.run_research_flow(query, job_id=job_id)
+            result = await self.orchestrator.run_research_flow(query, job_id=job_id, profile=profile, use_cache=use_cache, delta=delta)
             return result
         except Exception as e:
             import traceback
@@ -5,6 +5,9 @@ import time
 import asyncio
 import structlog
 
+from ..deadlines import time_left
+from ..metrics import metrics
+
 logger = structlog.get_logger()
 
 
@@ -45,8 +48,12 @@ class BaseAgent:
     # -------------------------
     # Standard Agent Call Wrapper
     # -------------------------
-    async def call(self, method: str, *args, **kwargs):
-        """Wraps all agent method calls with rate limiting + logging."""
+    async def call(self, method: str, *args, timeout: float | None = None, **kwargs):
+        """
+        Wraps all agent method calls with rate limiting + logging.
+        The call is bounded by `timeout`, or by the running graph node's deadline;
+        asyncio.TimeoutError is raised when it is exceeded.
+        """
         if not hasattr(self, method):
             raise AttributeError(f"Agent '{self.card.name}' has no method '{method}'")
 
@@ -61,8 +68,18 @@ class BaseAgent:
         )
 
         fn = getattr(self, method)
+        if timeout is None:
+            timeout = time_left()
         # Assuming all agent methods are async
-        result = await fn(*args, **kwargs)
+        try:
+            if timeout is None:
+                result = await fn(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(fn(*args, **kwargs), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            metrics.incr("agent_call_timeouts", agent=self.card.name, method=method)
+            logger.warning("agent_call_timeout", agent=self.card.name, method=method, timeout=timeout)
+            raise
 
         logger.info(
             "agent_call_complete",
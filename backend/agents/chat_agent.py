@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from typing import List, Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from langchain_openai import ChatOpenAI
 
 from .base import BaseAgent, AgentCard
+from ..llm_factory import get_chat_model
 
 
 class ChatAgent(BaseAgent):
@@ -18,7 +18,7 @@ class ChatAgent(BaseAgent):
                 capabilities=["store_history", "summarize_thread", "chat_memory"],
             )
         )
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.llm = get_chat_model("gpt-4o-mini", temperature=0, agent=self.card.name)
         self.history: Dict[str, List[BaseMessage]] = {}
 
     # ---------------------------------------------------------------
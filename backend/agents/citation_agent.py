@@ -8,7 +8,13 @@ from .base import BaseAgent, AgentCard
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-from mcp_servers.citation_validation.server import verify_citations_internal  # type: ignore
+from mcp_servers.citation_validation.server import verify_citations, check_citation_markers  # type: ignore
+
+
+def _embed(texts: List[str]) -> List[List[float]]:
+    # Same local model as document retrieval; imported lazily with the vector store
+    from ..rag import embeddings
+    return embeddings.embed_documents(texts)
 
 
 class CitationAgent(BaseAgent):
@@ -24,11 +30,15 @@ class CitationAgent(BaseAgent):
             )
         )
 
-    async def verify(self, draft_answer: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate citations using MCP parser/validator."""
+    async def verify(self, draft_answer: str, sources: List[Dict[str, Any]], use_llm: bool = True) -> Dict[str, Any]:
+        """
+        Validate citations: local claim scoring first, the LLM only for uncertain
+        claims. use_llm=False runs the local marker check only.
+        """
+        if not use_llm:
+            return check_citation_markers(draft_answer, sources)
         try:
-            # verify_citations_internal is async, so we await it directly
-            result = await verify_citations_internal(draft_answer, sources)
+            result = await verify_citations(draft_answer, sources, embed=_embed)
             return result
         except Exception as e:
             print(f"Citation verification failed (likely no API key): {e}")
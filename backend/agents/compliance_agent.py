@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import Dict, Any
 
 from .base import BaseAgent, AgentCard
+from ..rendered_report import RenderedReport
 
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-from mcp_servers.compliance.server import redact_pii  # type: ignore
+from mcp_servers.compliance.detector import redact_spans  # type: ignore
+from ..redaction import redact_text, entity_counts
+
+# Scan results kept per content hash: the compliance node scans before its
+# approval interrupt and re-runs on resume
+SCAN_CACHE_ENTRIES = 32
 
 
 class ComplianceAgent(BaseAgent):
@@ -23,17 +30,57 @@ class ComplianceAgent(BaseAgent):
                 rate_limit_per_minute=20,
             )
         )
+        self._scans: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _cached(self, key: str) -> Dict[str, Any] | None:
+        if key in self._scans:
+            self._scans.move_to_end(key)
+            return self._scans[key]
+        return None
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        self._scans[key] = result
+        while len(self._scans) > SCAN_CACHE_ENTRIES:
+            self._scans.popitem(last=False)
+        return result
 
     async def redact(self, text: str, require_approval: bool = False) -> Dict[str, Any]:
         """
         Redact sensitive information using MCP compliance tool.
         """
-        redacted = await asyncio.to_thread(redact_pii, text)
+        key = "text:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+        cached = self._cached(key)
+        if cached is None:
+            redacted, spans = await redact_text(text)
+            cached = self._remember(key, {"redacted_text": redacted, "entities": entity_counts(spans)})
+
+        return {**cached, "approval_required": require_approval}
+
+    async def redact_report(self, rendered: RenderedReport) -> Dict[str, Any]:
+        """
+        Redacts a rendered report, keeping block offsets so the result can still
+        be addressed per section. Entities never span a line break and blocks are
+        joined by one, so every span falls inside a single block.
+        """
+        key = "report:" + rendered.content_hash
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        _, spans = await redact_text(rendered.text)
+        by_block: Dict[str, list] = {}
+        for span in spans:
+            block = rendered.block_at(span.start)
+            by_block.setdefault(block.key, []).append(span._replace(start=span.start - block.start, end=span.end - block.start))
+
+        redacted = rendered.map_blocks(lambda key, text: redact_spans(text, by_block[key]) if key in by_block else text)
 
-        return {
-            "redacted_text": redacted,
-            "approval_required": require_approval,
-        }
+        return self._remember(key, {
+            "rendered": redacted,
+            "redacted_text": redacted.text,
+            "redacted_blocks": list(by_block),
+            "entities": entity_counts(spans),
+        })
 
     async def enforce(self, text: str, require_approval: bool = False) -> Dict[str, Any]:
         """Alias for redact to maintain compatibility."""
@@ -5,6 +5,8 @@ import asyncio
 
 from .base import BaseAgent, AgentCard
 from ..rag import add_document, query_documents
+from ..summaries import summarize_document, summaries_enabled
+from ..redaction import redact_for_ingest
 
 
 class IngestionRetrievalAgent(BaseAgent):
@@ -17,6 +19,7 @@ class IngestionRetrievalAgent(BaseAgent):
                 description="Ingests documents, maintains vector store and serves retrieval results.",
                 capabilities=[
                     "ingest_text",
+                    "summarize",
                     "retrieve",
                 ],
                 rate_limit_per_minute=15,
@@ -24,12 +27,39 @@ class IngestionRetrievalAgent(BaseAgent):
         )
 
     async def ingest_text(self, content: str, source: str, job_id: int | str | None = None) -> Dict[str, Any]:
+        content = await redact_for_ingest(content, source)
         chunks_added = await asyncio.to_thread(add_document, content, source=source, job_id=str(job_id) if job_id else None)
-        return {"chunks_added": chunks_added}
+        result = {"chunks_added": chunks_added}
+        if summaries_enabled(content):
+            result.update(await self.summarize(content, source, job_id))
+        return result
 
-    async def retrieve(self, query: str, top_k: int = 5, job_id: int | str | None = None) -> str:
+    async def summarize(self, content: str, source: str, job_id: int | str | None = None) -> Dict[str, Any]:
+        """Build and store per-section and per-document summaries for summary-first retrieval."""
+        try:
+            return await summarize_document(content, source, job_id=str(job_id) if job_id else None)
+        except Exception as e:
+            # Summaries are an optimization; ingestion still succeeds without them
+            print(f"Summarization failed: {e}")
+            return {"summaries_added": 0}
+
+    async def retrieve(
+        self,
+        query: str,
+        top_k: int = 5,
+        job_id: int | str | None = None,
+        summary_first: bool | None = None,
+        token_budget: int | None = None,
+    ) -> str:
         """Return raw retrieved text block."""
-        result = await asyncio.to_thread(query_documents, query, n_results=top_k, job_id=str(job_id) if job_id else None)
+        result = await asyncio.to_thread(
+            query_documents,
+            query,
+            n_results=top_k,
+            job_id=str(job_id) if job_id else None,
+            summary_first=summary_first,
+            token_budget=token_budget,
+        )
         return result
 
     async def extract_text(self, file_path: str) -> str:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, Any
-from langchain_core.messages import HumanMessage
+import asyncio
+import time
+from typing import Dict, Any, AsyncIterator
+from langchain_core.messages import HumanMessage, AIMessage
 
 from .ingestion_agent import IngestionRetrievalAgent
 from .web_research_agent import WebResearchAgent
@@ -9,6 +11,16 @@ from .synthesis_agent import SynthesisReportAgent
 from .citation_agent import CitationAgent
 from .compliance_agent import ComplianceAgent
 from .chat_agent import ChatAgent
+from ..profiles import get_profile
+from ..deadlines import new_deadline
+from ..llm_factory import TokenUsageHandler
+from ..task_registry import task_registry
+from .. import report_cache
+from ..delta_research import DELTA_RESEARCH_ENABLED, plan_followup, merge_web_results, merge_context, SectionUpdate
+from ..metrics import metrics
+from ..blob_store import offload, load
+from ..rendered_report import draft_artifacts, load_rendered, render_report
+from .synthesis_agent import SectionPlan
 
 
 
@@ -26,28 +38,269 @@ class OrchestratorAgent:
 
 
 
-    async def run_research_flow(self, query: str, job_id: int | None = None) -> Dict[str, Any]:
-        """
-        Execute the graph-based multi-agent research flow.
-        """
-        initial_state = {
+    def _initial_state(self, query: str, job_id: int | None, profile: str | None) -> Dict[str, Any]:
+        return {
             "messages": [HumanMessage(content=query)],
             "next_step": "start",
             "artifacts": {},
             "research_data": {},
             "final_report": {},
             "job_id": job_id,
+            "profile": get_profile(profile).name,
+            "deadline": new_deadline(get_profile(profile).latency_budget_seconds),
         }
 
-        final_state = await self.graph.ainvoke(
-            initial_state,
-            config={
-                "configurable": {"thread_id": str(job_id) if job_id else "adhoc"},
+    async def _cached_result(self, query: str, job_id: int | None, profile: str | None) -> Dict[str, Any] | None:
+        """A previous report for a near-identical query over the same corpus, attached to this job."""
+        try:
+            hit = await asyncio.to_thread(report_cache.lookup, query, job_id, profile)
+            if not hit:
+                return None
+            attached = await asyncio.to_thread(report_cache.attach_to_job, hit, job_id) if job_id else None
+        except Exception as e:
+            print(f"Report cache lookup failed: {e}")
+            return None
+
+        report = hit["report"]
+        # The attached copy's files are named after this job, so its download links work
+        served = attached or report
+        content = report.content or {}
+        answer = content.get("full_text") or (
+            render_report(content).text if "sections" in content else str(content)
+        )
+        return {
+            "answer": answer,
+            "reports": (served.report_metadata or {}).get("report_paths", {}),
+            "cached": {
+                "report_id": served.id,
+                "source_report_id": report.id,
+                "similarity": hit["similarity"],
+                "age_seconds": hit["age_seconds"],
             },
+        }
+
+    async def _prepare_delta(
+        self, query: str, job_id: int, profile: str | None, usage: TokenUsageHandler
+    ) -> Dict[str, Any] | None:
+        """
+        Follow-up on a job whose previous run finished: plan the missing evidence,
+        fetch only that, patch the affected sections and write the result back to
+        the job's checkpoint so the graph resumes at verification.
+        Returns {"answer": ...} when the existing report already answers the
+        question, {"delta": ...} when the graph should resume, or None to run in full.
+        """
+        config = {"configurable": {"thread_id": str(job_id)}}
+        snapshot = await self.graph.aget_state(config)
+        values = snapshot.values if snapshot else {}
+        artifacts = values.get("artifacts") or {}
+        report = load(artifacts.get("draft_answer"))
+        if not values or snapshot.next or not isinstance(report, dict):
+            return None
+        if artifacts.get("final_answer") == "[BLOCKED BY COMPLIANCE]":
+            return None
+
+        started = time.perf_counter()
+        profile_cfg = get_profile(profile or values.get("profile"))
+        research_data = values.get("research_data") or {}
+        original_query = values["messages"][0].content
+        web_results = load(research_data.get("web_results")) or []
+
+        plan = await plan_followup(query, original_query, report, web_results, callbacks=[usage])
+        print(f"--- Follow-up plan for job {job_id}: {plan.model_dump()} ---")
+
+        if not (plan.web_queries or plan.search_documents or plan.updates):
+            # Nothing new to research: answer from the approved report
+            context = load(artifacts.get("final_answer")) or load_rendered(artifacts).text
+            response = await self.chat_agent.llm.ainvoke([
+                {"role": "system", "content": "Answer the user's question based ONLY on the following report. If the answer is not in the report, say so."},
+                {"role": "user", "content": f"Report:\n{context}\n\nQuestion: {query}"},
+            ], config={"callbacks": [usage]})
+            return {
+                "answer": response.content,
+                "reports": values.get("final_report") or {},
+                "delta": self._delta_summary(plan, [], [], started, usage),
+            }
+
+        async def no_result(value):
+            return value
+
+        new_web, new_context = await asyncio.gather(
+            self.web_agent.call("search_many", plan.web_queries, max_results=profile_cfg.web_results, fetch_pages=profile_cfg.fetch_pages)
+            if plan.web_queries else no_result([]),
+            self.ingestion_agent.call("retrieve", query, top_k=profile_cfg.rag_results, job_id=job_id)
+            if plan.search_documents else no_result(""),
+            return_exceptions=True,
+        )
+        merged, added = merge_web_results(web_results, [] if isinstance(new_web, Exception) else new_web)
+        context = merge_context(load(research_data.get("context", "")), "" if isinstance(new_context, Exception) else new_context)
+
+        # New evidence with no section assigned to it gets its own section
+        updates = plan.updates or [SectionUpdate(title=f"Follow-up: {query}"[:120], focus=query)]
+        patch = await self.synthesis_agent.call(
+            "patch_report",
+            f"{original_query}\nFollow-up question: {query}",
+            report,
+            {"web_results": merged, "context": context},
+            [(u.section, SectionPlan(title=u.title, focus=u.focus)) for u in updates],
+            model=(profile_cfg.synthesis_models or [None])[-1],
+            length=profile_cfg.report_length,
         )
-        final_answer = final_state["artifacts"].get("final_answer", "No answer generated.")
-        report_paths = final_state.get("final_report", {})
-        return {"answer": final_answer, "reports": report_paths}
+        usage.total_tokens += patch["tokens"]
+        delta = self._delta_summary(plan, added, patch["updated_sections"], started, usage)
+
+        # Previous verification, approval and files no longer apply to the patched report
+        stale = {"final_answer", "final_rendered", "redacted_blocks", "verification_result", "final_report", "report_id", "cascade"}
+        await self.graph.aupdate_state(config, {
+            "messages": [
+                HumanMessage(content=query),
+                AIMessage(content=f"Report patched for follow-up: sections {patch['updated_sections']} rewritten, {len(added)} new sources."),
+            ],
+            "next_step": "synthesis",
+            "research_data": {**research_data, "context": offload(context), "web_results": offload(merged)},
+            "artifacts": {
+                **{k: v for k, v in artifacts.items() if k not in stale},
+                **draft_artifacts(patch["report"]),
+                "delta": delta,
+            },
+            "profile": profile_cfg.name,
+            "deadline": new_deadline(profile_cfg.latency_budget_seconds),
+        }, as_node="synthesis")
+        return {"delta": delta}
+
+    def _delta_summary(self, plan, added, updated_sections, started: float, usage: TokenUsageHandler) -> Dict[str, Any]:
+        seconds = time.perf_counter() - started
+        metrics.observe("followup_delta_seconds", seconds)
+        metrics.observe("followup_delta_tokens", usage.total_tokens)
+        return {
+            "plan": plan.model_dump(),
+            "new_sources": added,
+            "updated_sections": updated_sections,
+            "delta_seconds": seconds,
+            "delta_tokens": usage.total_tokens,
+        }
+
+    async def run_research_flow(
+        self,
+        query: str,
+        job_id: int | None = None,
+        profile: str | None = None,
+        use_cache: bool = True,
+        delta: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Execute the graph-based multi-agent research flow under the given execution profile.
+        With use_cache, a fresh report for a near-identical question over the same
+        corpus is returned instead (marked "cached"); pass use_cache=False to re-run.
+        With delta, a follow-up on a job with a finished report reuses its evidence
+        and patches only the affected sections (marked "delta").
+        """
+        if use_cache:
+            cached = await self._cached_result(query, job_id, profile)
+            if cached:
+                return cached
+
+        usage = TokenUsageHandler()
+        run = None
+
+        async def execute() -> Dict[str, Any]:
+            payload: Dict[str, Any] | None = self._initial_state(query, job_id, profile)
+            delta_info = None
+            if delta and job_id and DELTA_RESEARCH_ENABLED:
+                try:
+                    prepared = await self._prepare_delta(query, job_id, profile, usage)
+                except Exception as e:
+                    print(f"Delta research failed, running full research: {e}")
+                    prepared = None
+                if prepared and "answer" in prepared:
+                    return prepared
+                if prepared:
+                    # Resume the job's checkpoint (patched in place) instead of starting over
+                    payload, delta_info = None, prepared["delta"]
+            if run and run.cancelled:
+                raise asyncio.CancelledError()
+
+            final_state = await self.graph.ainvoke(
+                payload,
+                config={
+                    "configurable": {"thread_id": str(job_id) if job_id else "adhoc"},
+                    "callbacks": [usage],
+                },
+            )
+            final_answer = load(final_state["artifacts"].get("final_answer")) or "No answer generated."
+            result = {"answer": final_answer, "reports": final_state.get("final_report", {})}
+            if delta_info:
+                result["delta"] = delta_info
+            return result
+
+        # Delta planning, searches and patching run inside the registered task
+        # too, so POST /jobs/{id}/cancel can stop a follow-up at any point
+        task = asyncio.create_task(execute())
+        run = task_registry.register(job_id, task, get_profile(profile).name, usage) if job_id else None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if run and run.cancelled:
+                return {"answer": "Job cancelled.", "reports": {}, "cancelled": True}
+            raise
+        finally:
+            if run:
+                task_registry.finish(run)
+
+    async def stream_research_flow(
+        self, query: str, job_id: int | None = None, profile: str | None = None, use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same flow as run_research_flow, yielding report items as soon as the
+        synthesis agent finishes them, followed by a final "done" event.
+        """
+        if use_cache:
+            cached = await self._cached_result(query, job_id, profile)
+            if cached:
+                yield {"event": "done", "job_id": job_id, **cached}
+                return
+
+        initial_state = self._initial_state(query, job_id, profile)
+        usage = TokenUsageHandler()
+        config = {"configurable": {"thread_id": str(job_id) if job_id else "adhoc"}, "callbacks": [usage]}
+
+        # The graph runs in a producer task (cancellable via the task registry);
+        # this generator only relays its events
+        queue: asyncio.Queue = asyncio.Queue()
+        final_state: Dict[str, Any] = {}
+
+        async def produce():
+            async for mode, payload in self.graph.astream(initial_state, config=config, stream_mode=["custom", "values"]):
+                await queue.put((mode, payload))
+
+        task = asyncio.create_task(produce())
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        run = task_registry.register(job_id, task, initial_state["profile"], usage) if job_id else None
+        try:
+            while (item := await queue.get()) is not None:
+                mode, payload = item
+                if mode == "custom":
+                    yield payload
+                else:
+                    final_state = payload
+        finally:
+            # Client went away: stop the graph as well
+            if not task.done():
+                task.cancel()
+            if run:
+                task_registry.finish(run)
+
+        if run and run.cancelled:
+            yield {"event": "cancelled", "job_id": job_id}
+            return
+        if not task.cancelled() and task.exception():
+            raise task.exception()
+
+        yield {
+            "event": "done",
+            "job_id": job_id,
+            "answer": load(final_state.get("artifacts", {}).get("final_answer")),
+            "reports": final_state.get("final_report", {}),
+        }
 
     async def ingest_and_retrieve(self, content: str, source: str, job_id: int | None = None):
         return await self.ingestion_agent.ingest_text(content, source, job_id)
@@ -4,18 +4,92 @@ import asyncio
 
 import os
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Awaitable, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
+import re
+
+import time
+
+from dataclasses import dataclass
 
 from langchain_core.prompts import ChatPromptTemplate
 
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from langchain_core.utils.json import parse_partial_json
+
 from pydantic import BaseModel, Field
 
 from .base import BaseAgent, AgentCard
 
 from ..report_generator import ReportGenerator
 
+from ..llm_factory import get_chat_model, llm_limiter, TokenUsageHandler
+
+from ..metrics import metrics
+
+from ..page_fetcher import source_text
+
+from ..rendered_report import RenderedReport, render_report
+
+# "single": one structured-output call for the whole report.
+# "sectioned": fast outline call, then sections written concurrently.
+SYNTHESIS_MODE = os.getenv("SYNTHESIS_MODE", "single")
+
+SYNTHESIS_MODEL = os.getenv("SYNTHESIS_MODEL", "gpt-4o")
+
+SYNTHESIS_OUTLINE_MODEL = os.getenv("SYNTHESIS_OUTLINE_MODEL", "gpt-4o-mini")
+
+CITATION_MARKER = re.compile(r"\[(\d+)\]")
+
+# Consumer of finished report items: (kind, index, item) where kind is
+# "summary", "section", "table" or "citation"
+ItemCallback = Callable[[str, int, Dict[str, Any]], Awaitable[None]]
+
+# ResearchReport fields in schema order; a list item is complete once the next
+# item or a later field has started
+REPORT_LIST_FIELDS = ["sections", "tables", "citations"]
+
+# Length targets selected by the execution profile (see backend/profiles.py)
+REPORT_LENGTHS: Dict[str, Dict[str, str]] = {
+    "long": {
+        "lead": "Write a long, detailed research report based ONLY on the evidence.",
+        "report": (
+            "- The executive summary must be 2–3 paragraphs.\n\n"
+            "- Each section MUST contain 3–4 paragraphs.\n\n"
+            "- Each paragraph MUST be 5–8 sentences minimum. Never compress content."
+        ),
+        "summary": "2–3 paragraphs",
+        "section": (
+            "- The section MUST contain 3–4 paragraphs.\n"
+            "- Each paragraph MUST be 5–8 sentences minimum. Never compress content."
+        ),
+    },
+    "standard": {
+        "lead": "Write a research report based ONLY on the evidence.",
+        "report": (
+            "- The executive summary must be 1–2 paragraphs.\n\n"
+            "- Write 3–4 sections of 2–3 paragraphs each.\n\n"
+            "- Each paragraph should be 4–6 sentences."
+        ),
+        "summary": "1–2 paragraphs",
+        "section": (
+            "- The section should contain 2–3 paragraphs.\n"
+            "- Each paragraph should be 4–6 sentences."
+        ),
+    },
+    "brief": {
+        "lead": "Write a short, direct answer based ONLY on the evidence.",
+        "report": (
+            "- The executive summary must be a single paragraph that answers the query directly.\n\n"
+            "- Write 1–3 short sections of one paragraph each.\n\n"
+            "- Keep the whole answer under 300 words."
+        ),
+        "summary": "one paragraph",
+        "section": "- The section should be a single paragraph of 3–5 sentences.",
+    },
+}
+
 # ----------------------------
 
 # Pydantic Models
@@ -60,6 +134,101 @@ class ResearchReport(BaseModel):
 
     citations: List[Citation] = []
 
+class SectionPlan(BaseModel):
+
+    title: str
+
+    focus: str = Field(description="What this section must cover, in one or two sentences.")
+
+    source_ids: List[int] = Field(default_factory=list, description="IDs of the web sources this section should cite.")
+
+class ReportOutline(BaseModel):
+
+    sections: List[SectionPlan]
+
+    tables: List[Table] = []
+
+# ----------------------------
+
+# Incremental structured-output parsing
+
+# ----------------------------
+
+class ReportStreamHandler(AsyncCallbackHandler):
+    """
+    Receives the JSON tokens of a streaming ResearchReport call, parses the
+    partial JSON and hands each finished summary/section/table/citation to the
+    consumer while the rest of the report is still being written. With
+    method="json_schema" (the langchain-openai default) the JSON streams as
+    message content; with method="function_calling" as tool-call arguments.
+    """
+
+    def __init__(self, on_item: ItemCallback, mode: str) -> None:
+        self.on_item = on_item
+        self.mode = mode
+        self.buffer = ""
+        self.emitted = {"summary": 0, **{field: 0 for field in REPORT_LIST_FIELDS}}
+        self.started = time.perf_counter()
+        self.first_section_recorded = False
+
+    async def on_llm_new_token(self, token: str, *, chunk=None, **kwargs: Any) -> None:
+        message = getattr(chunk, "message", None)
+        tool_calls = getattr(message, "tool_call_chunks", None) or []
+        if tool_calls:
+            delta = "".join(tc.get("args") or "" for tc in tool_calls)
+        else:
+            content = getattr(message, "content", None)
+            delta = content if isinstance(content, str) and content else token
+        if not delta:
+            return
+        self.buffer += delta
+        # Items can only complete on a closing brace/quote; skip re-parsing otherwise
+        if "}" in delta or '"' in delta:
+            await self.emit(parse_partial_json(self.buffer), final=False)
+
+    async def emit(self, partial: Optional[Dict[str, Any]], final: bool) -> None:
+        if not isinstance(partial, dict):
+            return
+
+        if not self.emitted["summary"] and "summary" in partial and (final or "sections" in partial):
+            self.emitted["summary"] = 1
+            await self.on_item("summary", 0, {"summary": partial["summary"]})
+
+        for position, field in enumerate(REPORT_LIST_FIELDS):
+            items = partial.get(field)
+            if not isinstance(items, list):
+                continue
+            later_started = any(f in partial for f in REPORT_LIST_FIELDS[position + 1:])
+            complete = len(items) if (final or later_started) else len(items) - 1
+            while self.emitted[field] < complete:
+                index = self.emitted[field]
+                self.emitted[field] += 1
+                if field == "sections":
+                    self.record_first_section()
+                await self.on_item(field[:-1], index, items[index])
+
+    def record_first_section(self) -> None:
+        if not self.first_section_recorded:
+            self.first_section_recorded = True
+            metrics.observe("synthesis_time_to_first_section_seconds", time.perf_counter() - self.started, mode=self.mode)
+
+@dataclass
+class SynthesisRun:
+    """Per-call state shared by the single and sectioned generation paths."""
+
+    blocks: Dict[str, Any]
+
+    stream: ReportStreamHandler
+
+    usage: TokenUsageHandler
+
+    llm: Any
+
+    length: Dict[str, str]
+
+async def _ignore_item(kind: str, index: int, item: Dict[str, Any]) -> None:
+    return None
+
 # ----------------------------
 
 # Agent Implementation
@@ -88,7 +257,7 @@ class SynthesisReportAgent(BaseAgent):
 
         # IMPORTANT: Use large model for long structured output
 
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0)
+        self.llm = self._llm(SYNTHESIS_MODEL)
 
         self.structured_llm = self.llm.with_structured_output(ResearchReport)
 
@@ -98,7 +267,7 @@ class SynthesisReportAgent(BaseAgent):
 
 You are an expert Research Analyst.
 
-Write a long, detailed research report based ONLY on the evidence.
+{length_lead}
 
 ----------------
 
@@ -130,11 +299,7 @@ INSTRUCTIONS:
 
 - Produce a structured research report.
 
-- The executive summary must be 2–3 paragraphs.
-
-- Each section MUST contain 3–4 paragraphs.
-
-- Each paragraph MUST be 5–8 sentences minimum. Never compress content.
+{length_instructions}
 
 - Every section should include inline citations using [1], [2], etc.
 
@@ -146,57 +311,132 @@ INSTRUCTIONS:
 
         )
 
-        self.generator = ReportGenerator()
+        # Sectioned mode prompts
 
-    # -----------------------------
+        self.outline_llm = get_chat_model(SYNTHESIS_OUTLINE_MODEL, temperature=0, agent=self.card.name)
 
-    # MAIN METHOD CALLED BY GRAPH
+        self.outline_prompt = ChatPromptTemplate.from_template(
+            """
+You are an expert Research Analyst planning a research report.
 
-    # -----------------------------
+USER QUERY:
+{query}
 
-    async def generate_report(self, query: str, evidence: Dict[str, Any]) -> Dict[str, Any]:
+WEB FINDINGS:
+{web_block}
 
-        
+RAG CONTEXT:
+{rag_block}
 
-        # Build WEB BLOCK
-        web_sources = evidence.get("web_results", [])
-        web_block = ""
-        citation_block = ""
+INSTRUCTIONS:
+- Plan 3–4 non-overlapping sections that together answer the query.
+- For each section give a title, a one or two sentence focus, and the IDs of the web sources it should cite.
+- Add tables only when the evidence contains comparable figures.
+"""
+        )
 
-        # Fix Issue 2: Auto-generate IDs
-        for i, src in enumerate(web_sources, 1):
-            # Ensure ID exists, default to loop index
-            src_id = src.get("id", str(i))
-            title = src.get("title", "Unknown Source")
-            url = src.get("url", "N/A")
-            quote = src.get("quote", "") or src.get("snippet", "") or src.get("body", "")
-            
-            web_block += f"[{src_id}] {title}\nURL: {url}\nQuote: {quote}\n\n"
-            citation_block += f"[{src_id}] {title} — {url}\n"
+        self.summary_prompt = ChatPromptTemplate.from_template(
+            """
+You are an expert Research Analyst.
+Write the executive summary ({summary_length}) of a research report based ONLY on the evidence.
+The report will contain these sections:
+{section_titles}
 
-        # Fix Issue 1: Ensure RAG context is string
-        rag_raw = evidence.get("context", "")
-        if isinstance(rag_raw, (dict, list)):
-            rag_block = str(rag_raw)
-        else:
-            rag_block = str(rag_raw)
+USER QUERY:
+{query}
 
-        # Run LLM with structured output
-        chain = self.prompt | self.structured_llm
+WEB FINDINGS:
+{web_block}
 
-        try:
+RAG CONTEXT:
+{rag_block}
 
-            report: ResearchReport = await chain.ainvoke({
+Use inline citations [1], [2], etc. matching the web finding IDs. Return only the summary text.
+"""
+        )
 
-                "query": query,
+        self.section_prompt = ChatPromptTemplate.from_template(
+            """
+You are an expert Research Analyst writing ONE section of a research report, based ONLY on the evidence.
 
-                "web_block": web_block,
+USER QUERY:
+{query}
 
-                "rag_block": rag_block,
+ALL SECTIONS OF THE REPORT (do not cover the others):
+{section_titles}
 
-                "citation_block": citation_block,
+THIS SECTION: {title}
+FOCUS: {focus}
 
-            })
+WEB FINDINGS:
+{web_block}
+
+RAG CONTEXT:
+{rag_block}
+
+INSTRUCTIONS:
+{section_length}
+- Include inline citations using [1], [2], etc. matching the web finding IDs.
+- If evidence is weak, clearly state limitations.
+- Return only the section body, without the title.
+"""
+        )
+
+        self.generator = ReportGenerator()
+
+    # -----------------------------
+
+    # MAIN METHOD CALLED BY GRAPH
+
+    # -----------------------------
+
+    async def generate_report(
+        self,
+        query: str,
+        evidence: Dict[str, Any],
+        mode: str | None = None,
+        on_item: ItemCallback | None = None,
+        model: str | None = None,
+        length: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Generates the structured report. If on_item is given, every finished
+        summary/section/table/citation is passed to it as soon as it is complete.
+        """
+        draft = await self.generate_draft(query, evidence, mode=mode, on_item=on_item, model=model, length=length)
+        return draft["report"]
+
+    async def generate_draft(
+        self,
+        query: str,
+        evidence: Dict[str, Any],
+        mode: str | None = None,
+        on_item: ItemCallback | None = None,
+        model: str | None = None,
+        length: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        generate_report plus run statistics: the model used, latency, tokens and
+        whether the structured output failed (used by the model cascade).
+        """
+
+        mode = mode or SYNTHESIS_MODE
+        model = model or SYNTHESIS_MODEL
+        run = SynthesisRun(
+            blocks=self._build_evidence_blocks(evidence),
+            stream=ReportStreamHandler(on_item or _ignore_item, mode),
+            usage=TokenUsageHandler(),
+            llm=self._llm(model),
+            length=REPORT_LENGTHS.get(length or "long", REPORT_LENGTHS["long"]),
+        )
+        failed = False
+
+        try:
+
+            if mode == "sectioned":
+                report = await self._generate_sectioned(query, run)
+            else:
+                report = await self._generate_single(query, run)
 
             parsed = report.model_dump()
 
@@ -206,17 +446,22 @@ INSTRUCTIONS:
 
                 table["rows"] = [row["cells"] for row in table.get("rows", [])]
 
-            return parsed
+            # Flush whatever was not streamed (cache hits, trailing items)
+            await run.stream.emit(parsed, final=True)
 
         except Exception as e:
 
-            return {
+            failed = True
+            # Details go to the logs, not into report content users see
+            print(f"[Synthesis] {model} report generation failed: {e!r}")
+
+            parsed = {
 
                 "summary": "Failed to generate structured report.",
 
                 "sections": [
 
-                    {"title": "Error", "content": f"Error: {str(e)}"}
+                    {"title": "Error", "content": "The report could not be generated. Please try again."}
 
                 ],
 
@@ -226,47 +471,277 @@ INSTRUCTIONS:
 
             }
 
-    # -----------------------------
-
-    # FORMATTER FOR EXPORT
-
-    # -----------------------------
-
-    def format_report(self, report: Dict[str, Any]) -> str:
-
-        out = []
-
-        out.append("Summary\n=======\n")
-
-        out.append(report["summary"])
+        latency = time.perf_counter() - run.stream.started
+        metrics.observe("synthesis_seconds", latency, mode=mode)
+        metrics.observe("synthesis_model_seconds", latency, model=model)
+        metrics.observe("synthesis_model_tokens", run.usage.total_tokens, model=model)
+        if failed:
+            metrics.incr("synthesis_failures", model=model)
+
+        return {
+            "report": parsed,
+            "model": model,
+            "mode": mode,
+            "latency_seconds": latency,
+            "tokens": run.usage.total_tokens,
+            "failed": failed,
+        }
+
+    def _llm(self, model: str):
+        # Streaming lets finished sections be handed out before the full report
+        # is parsed; ainvoke still goes through the response cache
+        return get_chat_model(model, temperature=0, agent=self.card.name, streaming=True, stream_usage=True)
+
+    def _build_evidence_blocks(self, evidence: Dict[str, Any]) -> Dict[str, Any]:
+        # Build WEB BLOCK
+        web_sources = evidence.get("web_results", [])
+        web_block = ""
+        citation_block = ""
+        sources: Dict[str, Dict[str, str]] = {}
 
-        out.append("\n")
+        # Fix Issue 2: Auto-generate IDs
+        for i, src in enumerate(web_sources, 1):
+            # Ensure ID exists, default to loop index
+            src_id = str(src.get("id", str(i)))
+            title = src.get("title", "Unknown Source")
+            url = src.get("url", "N/A")
+            quote = source_text(src)
+            
+            web_block += f"[{src_id}] {title}\nURL: {url}\nQuote: {quote}\n\n"
+            citation_block += f"[{src_id}] {title} — {url}\n"
+            sources[src_id] = {"title": title or "Unknown Source", "url": url or "N/A", "quote": quote or ""}
 
-        for sec in report["sections"]:
+        # Fix Issue 1: Ensure RAG context is string
+        rag_raw = evidence.get("context", "")
+        rag_block = str(rag_raw)
+
+        return {
+            "web_block": web_block,
+            "rag_block": rag_block,
+            "citation_block": citation_block,
+            "sources": sources,
+        }
+
+    async def _generate_single(self, query: str, run: SynthesisRun) -> ResearchReport:
+        """One structured-output call for the whole report, parsed incrementally as it streams."""
+        # Run LLM with structured output; include_raw surfaces parse failures instead of None
+        chain = self.prompt | run.llm.with_structured_output(ResearchReport, include_raw=True)
+
+        result = await chain.ainvoke({
+            "query": query,
+            "web_block": run.blocks["web_block"],
+            "rag_block": run.blocks["rag_block"],
+            "citation_block": run.blocks["citation_block"],
+            "length_lead": run.length["lead"],
+            "length_instructions": run.length["report"],
+        }, config={"callbacks": [run.stream, run.usage]})
+
+        if result.get("parsing_error") or result.get("parsed") is None:
+            raise ValueError(f"Structured output failed to parse: {result.get('parsing_error')}")
+        return result["parsed"]
 
-            out.append(f"\n{sec['title']}\n{'-'*len(sec['title'])}\n{sec['content']}\n")
+    # -----------------------------
 
-        if report.get("tables"):
+    # SECTIONED MODE: OUTLINE, THEN CONCURRENT SECTION WRITERS
 
-            for t in report["tables"]:
+    # -----------------------------
 
-                out.append(f"\nTable: {t['title']}")
+    async def _generate_sectioned(self, query: str, run: SynthesisRun) -> ResearchReport:
+        """
+        Phase 1: a fast model plans the sections and assigns evidence to each.
+        Phase 2: the summary and every section are written concurrently under the
+        shared LLM limiter, so wall time approaches the longest single section.
+        """
+        blocks = run.blocks
+        outline: ReportOutline = await self._run_limited(
+            self.outline_prompt | self.outline_llm.with_structured_output(ReportOutline),
+            {
+                "query": query,
+                "web_block": blocks["web_block"],
+                "rag_block": blocks["rag_block"],
+            },
+            run,
+        )
 
-                out.append(" | ".join(t["headers"]))
+        section_titles = "\n".join(f"- {plan.title}" for plan in outline.sections)
+
+        async def write_summary() -> str:
+            try:
+                message = await self._run_limited(self.summary_prompt | run.llm, {
+                    "query": query,
+                    "section_titles": section_titles,
+                    "summary_length": run.length["summary"],
+                    "web_block": blocks["web_block"],
+                    "rag_block": blocks["rag_block"],
+                }, run)
+                summary = message.content
+            except Exception as e:
+                # A failed summary should not discard the sections written alongside it
+                print(f"[Synthesis] Summary could not be generated: {e!r}")
+                metrics.incr("synthesis_part_failures", part="summary")
+                summary = "The summary could not be generated; see the sections below."
+            run.stream.emitted["summary"] = 1
+            await run.stream.on_item("summary", 0, {"summary": summary})
+            return summary
+
+        summary_task = write_summary()
+        section_tasks = [
+            self._write_section(query, index, plan, section_titles, run)
+            for index, plan in enumerate(outline.sections)
+        ]
+        summary, *sections = await asyncio.gather(summary_task, *section_tasks)
+
+        return ResearchReport(
+            summary=summary,
+            sections=sections,
+            tables=outline.tables,
+            citations=self._collect_citations(
+                [summary] + [sec.content for sec in sections],
+                blocks["sources"],
+            ),
+        )
 
-                for row in t["rows"]:
+    async def _write_section(
+        self,
+        query: str,
+        index: int,
+        plan: SectionPlan,
+        section_titles: str,
+        run: SynthesisRun,
+    ) -> Section:
+        sources = run.blocks["sources"]
+        assigned = [str(i) for i in plan.source_ids if str(i) in sources]
+        # Sections without an assignment see all web evidence
+        ids = assigned or list(sources.keys())
+        web_block = "".join(
+            f"[{i}] {sources[i]['title']}\nURL: {sources[i]['url']}\nQuote: {sources[i]['quote']}\n\n"
+            for i in ids
+        )
 
-                    out.append(" | ".join(row))
+        try:
+            message = await self._run_limited(self.section_prompt | run.llm, {
+                "query": query,
+                "title": plan.title,
+                "focus": plan.focus,
+                "section_titles": section_titles,
+                "web_block": web_block,
+                "rag_block": run.blocks["rag_block"],
+                "section_length": run.length["section"],
+            }, run)
+            content = message.content
+        except Exception as e:
+            # One failed section should not discard the others
+            print(f"[Synthesis] Section '{plan.title}' could not be generated: {e!r}")
+            metrics.incr("synthesis_part_failures", part="section")
+            content = "This section could not be generated."
+
+        section = Section(title=plan.title, content=content)
+        # Sections finish out of order; the index keeps their place in the outline
+        run.stream.record_first_section()
+        await run.stream.on_item("section", index, section.model_dump())
+        run.stream.emitted["sections"] += 1
+        return section
+
+    async def _run_limited(self, chain, inputs: Dict[str, Any], run: SynthesisRun):
+        async with llm_limiter():
+            return await chain.ainvoke(inputs, config={"callbacks": [run.usage]})
+
+    async def patch_report(
+        self,
+        query: str,
+        report: Dict[str, Any],
+        evidence: Dict[str, Any],
+        updates: List[Tuple[Optional[int], SectionPlan]],
+        model: str | None = None,
+        length: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Rewrites the given sections (index) or appends new ones (None) concurrently,
+        leaving the rest of the report untouched; used for follow-up questions.
+        Citations are rebuilt from the markers used in the patched report.
+        """
+        model = model or SYNTHESIS_MODEL
+        run = SynthesisRun(
+            blocks=self._build_evidence_blocks(evidence),
+            stream=ReportStreamHandler(_ignore_item, "patch"),
+            usage=TokenUsageHandler(),
+            llm=self._llm(model),
+            length=REPORT_LENGTHS.get(length or "long", REPORT_LENGTHS["long"]),
+        )
+        sections = [dict(sec) for sec in report.get("sections", [])]
+        targets = []
+        for index, plan in updates:
+            if index is None:
+                sections.append({"title": plan.title, "content": ""})
+                index = len(sections) - 1
+            targets.append((index, plan))
+
+        section_titles = "\n".join(f"- {sec['title']}" for sec in sections)
+        written = await asyncio.gather(*(
+            self._write_section(query, index, plan, section_titles, run) for index, plan in targets
+        ))
+        for (index, _), section in zip(targets, written):
+            sections[index] = section.model_dump()
+
+        patched = {
+            **report,
+            "sections": sections,
+            "citations": [
+                c.model_dump() for c in self._collect_citations(
+                    [report.get("summary", "")] + [sec["content"] for sec in sections],
+                    run.blocks["sources"],
+                )
+            ],
+        }
+        latency = time.perf_counter() - run.stream.started
+        metrics.observe("synthesis_patch_seconds", latency)
+        return {
+            "report": patched,
+            "updated_sections": [index for index, _ in targets],
+            "latency_seconds": latency,
+            "tokens": run.usage.total_tokens,
+        }
+
+    def fallback_report(self, evidence: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extractive report built from the evidence without an LLM call; used when
+        the job deadline leaves no time for synthesis.
+        """
+        sources = self._build_evidence_blocks(evidence)["sources"]
+        return {
+            "summary": (
+                "The time budget for this research job ran out before a full report could be written. "
+                "The most relevant evidence found is quoted below with its sources."
+            ),
+            "sections": [
+                {"title": src["title"], "content": f"{src['quote']} [{src_id}]"}
+                for src_id, src in sources.items() if src["quote"]
+            ],
+            "tables": [],
+            "citations": [
+                {"id": int(src_id), "source": src["title"], "url": src["url"], "quote": src["quote"]}
+                for src_id, src in sources.items() if src_id.isdigit()
+            ],
+        }
+
+    def _collect_citations(self, texts: List[str], sources: Dict[str, Dict[str, str]]) -> List[Citation]:
+        """Builds the citations list from the [n] markers actually used in the text."""
+        used = sorted({int(m) for text in texts for m in CITATION_MARKER.findall(text) if m in sources})
+        return [
+            Citation(id=i, source=sources[str(i)]["title"], url=sources[str(i)]["url"], quote=sources[str(i)]["quote"])
+            for i in used
+        ]
 
-        if report.get("citations"):
+    # -----------------------------
 
-            out.append("\nReferences\n==========")
+    # FORMATTER FOR EXPORT
 
-            for c in report["citations"]:
+    # -----------------------------
 
-                out.append(f"[{c['id']}] {c['source']} — {c['url']}")
+    def format_report(self, report: Dict[str, Any]) -> str:
 
-        return "\n".join(out)
+        # Rendered once per content hash; see rendered_report for per-section offsets
+        return render_report(report).text
 
     # -----------------------------
 
@@ -274,16 +749,24 @@ INSTRUCTIONS:
 
     # -----------------------------
 
-    async def export(self, final_answer, job_id=None) -> Dict[str, str]:
+    async def export(self, final_answer, job_id=None, formats=("docx", "pdf")) -> Dict[str, str]:
 
         filename = f"report_{job_id}" if job_id else "report_preview"
 
-        if isinstance(final_answer, dict):
+        if isinstance(final_answer, RenderedReport):
+
+            final_answer = final_answer.text
+
+        elif isinstance(final_answer, dict):
 
             final_answer = self.format_report(final_answer)
 
-        docx = await asyncio.to_thread(self.generator.generate_docx, final_answer, filename)
+        renderers = {"docx": self.generator.generate_docx, "pdf": self.generator.generate_pdf}
+
+        paths = {}
+
+        for fmt in formats:
 
-        pdf = await asyncio.to_thread(self.generator.generate_pdf, final_answer, filename)
+            paths[fmt] = await asyncio.to_thread(renderers[fmt], final_answer, filename)
 
-        return {"docx": docx, "pdf": pdf}
+        return paths
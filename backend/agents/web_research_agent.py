@@ -3,12 +3,29 @@ from __future__ import annotations
 import asyncio
 from typing import Dict, Any, List
 
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
+
 from .base import BaseAgent, AgentCard
+from ..llm_factory import get_chat_model
+from ..search_cache import cached_search
+from ..page_fetcher import enrich_results
 
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from mcp_servers.research.server import web_search  # type: ignore
+from mcp_servers.research.providers import get_provider  # type: ignore
+
+
+def _embed(texts: List[str]) -> List[List[float]]:
+    # Same local model as document retrieval; imported lazily with the vector store
+    from ..rag import embeddings
+    return embeddings.embed_documents(texts)
+
+
+class SubQueries(BaseModel):
+    queries: List[str] = Field(description="Distinct web search queries, most important first.")
 
 
 class WebResearchAgent(BaseAgent):
@@ -19,25 +36,76 @@ class WebResearchAgent(BaseAgent):
             AgentCard(
                 name="web_research_agent",
                 description="Executes grounded web searches and returns structured findings.",
-                capabilities=["search"],
+                capabilities=["search", "expand_query", "search_many", "fetch_pages"],
                 rate_limit_per_minute=10,
             )
         )
 
-    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        # 1. Run web search (returns List[Dict])
-        raw_results = await asyncio.to_thread(web_search, query, max_results=max_results)
+    async def search(self, query: str, max_results: int = 5, fetch_pages: int = 0) -> List[Dict[str, Any]]:
+        """
+        Web results as {"id", "title", "url", "quote"}. With fetch_pages, the top
+        pages are downloaded and their quote is the most relevant page passage
+        instead of the search snippet.
+        """
+        # 1. Run web search (returns List[Dict]), served from the result cache when fresh enough
+        raw_results, _ = await cached_search(web_search, query, max_results, namespace=get_provider().name)
 
         # 2. Format clean structure (No parsing needed as web_search returns structured data)
         structured = [
             {
                 "id": str(i+1),
                 "title": item.get("title"),
-                "url": item.get("url"),
+                "url": item.get("url") or item.get("href"),
                 "quote": item.get("body") or item.get("snippet") or item.get("description"),
             }
             for i, item in enumerate(raw_results)
         ]
 
-        return structured
+        # 3. Optionally read the top pages for fuller quotes than the snippet
+        return await self.fetch_pages(query, structured, fetch_pages)
 
+    async def fetch_pages(self, query: str, results: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+        """Replaces the snippets of the first top_n results with the best passages of their pages."""
+        if top_n <= 0:
+            return results
+        try:
+            return await enrich_results(query, results, top_n, embed=_embed)
+        except Exception as e:
+            print(f"Page fetching failed, keeping search snippets: {e}")
+            return results
+
+
+    async def expand_query(self, query: str, n: int) -> List[str]:
+        """Splits a research question into up to n focused search queries (the original first)."""
+        if n <= 1 or not os.getenv("OPENAI_API_KEY"):
+            return [query]
+        prompt = ChatPromptTemplate.from_template(
+            "Write {n} distinct web search queries that together cover the research question below. "
+            "Each query should target a different aspect.\n\nQUESTION: {query}"
+        )
+        llm = get_chat_model("gpt-4o-mini", temperature=0, agent=self.card.name)
+        try:
+            result = await (prompt | llm.with_structured_output(SubQueries)).ainvoke({"query": query, "n": n - 1})
+            extra = [q for q in result.queries if q.strip() and q.strip() != query]
+        except Exception as e:
+            print(f"Sub-query expansion failed: {e}")
+            extra = []
+        return [query] + extra[: n - 1]
+
+    async def search_many(self, queries: List[str], max_results: int = 5, fetch_pages: int = 0) -> List[Dict[str, Any]]:
+        """Runs the searches concurrently and merges results, dropping duplicate URLs; pages are fetched after the merge."""
+        batches = await asyncio.gather(
+            *(self.search(q, max_results=max_results) for q in queries), return_exceptions=True
+        )
+        merged: List[Dict[str, Any]] = []
+        seen = set()
+        for batch in batches:
+            if isinstance(batch, Exception):
+                print(f"Sub-query search failed: {batch}")
+                continue
+            for item in batch:
+                if item.get("url") in seen:
+                    continue
+                seen.add(item.get("url"))
+                merged.append({**item, "id": str(len(merged) + 1)})
+        return await self.fetch_pages(queries[0] if queries else "", merged, fetch_pages)
@@ -0,0 +1,193 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from langgraph.types import Command
+from sqlalchemy import update, func
+from sqlmodel import Session, select
+
+from .database import engine
+from .metrics import metrics
+from .models import ApprovalStatus, Job, PendingApproval
+
+load_dotenv()
+
+# Threads resumed at once by a bulk approval; each resume runs the rest of its graph
+APPROVAL_RESUME_CONCURRENCY = int(os.getenv("APPROVAL_RESUME_CONCURRENCY", "8"))
+# Most threads a single bulk request may resume
+APPROVAL_BULK_MAX = int(os.getenv("APPROVAL_BULK_MAX", "500"))
+
+_OPEN = (ApprovalStatus.pending, ApprovalStatus.resuming)
+
+
+def record_pending(thread_id: str, job_id: Optional[int], payload: Dict[str, Any], kind: str = "compliance") -> None:
+    """
+    Indexes a thread about to interrupt. The node runs again on resume, so an
+    open entry only gets its payload refreshed; a resolved one is reopened.
+    """
+    with Session(engine) as session:
+        entry = session.exec(select(PendingApproval).where(PendingApproval.thread_id == thread_id)).first()
+        if entry is None:
+            entry = PendingApproval(thread_id=thread_id)
+        if entry.status not in _OPEN or entry.id is None:
+            entry.status = ApprovalStatus.pending
+            entry.requested_at = datetime.utcnow()
+            entry.action = entry.error = entry.resolved_at = None
+            metrics.incr("approvals_requested", kind=kind)
+        entry.job_id, entry.kind, entry.payload = job_id, kind, payload
+        session.add(entry)
+        session.commit()
+
+
+def resolve(thread_id: str, action: Optional[str]) -> None:
+    """Marks a thread's approval as decided (called once the interrupt returns)."""
+    status = ApprovalStatus.approved if action == "approve" else ApprovalStatus.rejected
+    with Session(engine) as session:
+        session.execute(
+            update(PendingApproval)
+            .where(PendingApproval.thread_id == thread_id)
+            .values(status=status, action=action, error=None, resolved_at=datetime.utcnow())
+        )
+        session.commit()
+
+
+def expire_job(job_id: int, reason: str = "Job cancelled.") -> int:
+    """
+    Expires the job's pending approvals so no reviewer or bulk call resumes a
+    job that no longer runs (e.g. after POST /jobs/{id}/cancel). Returns how many.
+    """
+    with Session(engine) as session:
+        expired = session.execute(
+            update(PendingApproval)
+            .where(PendingApproval.job_id == job_id)
+            .where(PendingApproval.status == ApprovalStatus.pending)
+            .values(status=ApprovalStatus.expired, error=reason, resolved_at=datetime.utcnow())
+        ).rowcount
+        session.commit()
+    return expired
+
+
+def _claim(thread_id: str) -> bool:
+    """pending -> resuming, atomically, so two reviewers never resume the same thread."""
+    with Session(engine) as session:
+        claimed = session.execute(
+            update(PendingApproval)
+            .where(PendingApproval.thread_id == thread_id)
+            .where(PendingApproval.status == ApprovalStatus.pending)
+            .values(status=ApprovalStatus.resuming)
+        ).rowcount
+        session.commit()
+    return bool(claimed)
+
+
+def _release(thread_id: str, status: ApprovalStatus, error: Optional[str] = None, action: Optional[str] = None) -> None:
+    with Session(engine) as session:
+        session.execute(
+            update(PendingApproval)
+            .where(PendingApproval.thread_id == thread_id)
+            .where(PendingApproval.status == ApprovalStatus.resuming)
+            .values(status=status, action=action, error=error, resolved_at=None if status == ApprovalStatus.pending else datetime.utcnow())
+        )
+        session.commit()
+
+
+def _visible(statement, user_id: Optional[int]):
+    """Restricts a query to approvals of the user's jobs; None means every approval (admins)."""
+    if user_id is None:
+        return statement
+    return statement.join(Job, Job.id == PendingApproval.job_id).where(Job.user_id == user_id)
+
+
+def list_approvals(
+    user_id: Optional[int], status: ApprovalStatus = ApprovalStatus.pending, offset: int = 0, limit: int = 50
+) -> Dict[str, Any]:
+    """A page of approvals, oldest request first, with the total count for the filter."""
+    with Session(engine) as session:
+        total = session.exec(
+            _visible(select(func.count()).select_from(PendingApproval), user_id).where(PendingApproval.status == status)
+        ).one()
+        items = session.exec(
+            _visible(select(PendingApproval), user_id)
+            .where(PendingApproval.status == status)
+            .order_by(PendingApproval.requested_at, PendingApproval.id)
+            .offset(offset)
+            .limit(limit)
+        ).all()
+    return {"total": total, "offset": offset, "limit": limit, "items": items}
+
+
+def pending_threads(user_id: Optional[int], limit: int = APPROVAL_BULK_MAX) -> List[str]:
+    """The oldest pending threads the user may act on."""
+    return [entry.thread_id for entry in list_approvals(user_id, ApprovalStatus.pending, 0, limit)["items"]]
+
+
+def visible_threads(thread_ids: List[str], user_id: Optional[int]) -> List[str]:
+    """The given threads that the user may act on, in the given order."""
+    with Session(engine) as session:
+        allowed = set(session.exec(
+            _visible(select(PendingApproval.thread_id), user_id).where(PendingApproval.thread_id.in_(thread_ids))
+        ).all())
+    return [t for t in thread_ids if t in allowed]
+
+
+async def resume(graph, thread_id: str, action: str) -> Dict[str, Any]:
+    """
+    Resumes one interrupted thread with a reviewer's decision. The pending ->
+    resuming claim makes it safe to call from several routes and reviewers: a
+    thread is resumed at most once ("not_pending" otherwise).
+    """
+    if not await asyncio.to_thread(_claim, thread_id):
+        return {"thread_id": thread_id, "status": "not_pending"}
+    return await _resume_claimed(graph, thread_id, action)
+
+
+def claim_many(thread_ids: List[str]) -> List[str]:
+    """Claims each pending thread (pending -> resuming), in order; returns the ones claimed."""
+    return [thread_id for thread_id in dict.fromkeys(thread_ids) if _claim(thread_id)]
+
+
+async def _resume_claimed(graph, thread_id: str, action: str) -> Dict[str, Any]:
+    config = {"configurable": {"thread_id": thread_id}}
+    try:
+        snapshot = await graph.aget_state(config)
+        if not snapshot.next:
+            # Checkpoint gone (e.g. in-memory saver after a restart) or already past the interrupt
+            await asyncio.to_thread(_release, thread_id, ApprovalStatus.expired, "No interrupted run for this thread.")
+            return {"thread_id": thread_id, "status": "expired"}
+        await graph.ainvoke(Command(resume={"action": action}), config=config)
+    except Exception as e:
+        # Back in the queue so it can be retried
+        await asyncio.to_thread(_release, thread_id, ApprovalStatus.pending, str(e))
+        metrics.incr("approvals_resume_failures")
+        return {"thread_id": thread_id, "status": "failed", "error": str(e)}
+    # The compliance node resolves its entry once the interrupt returns; this covers nodes that do not
+    status = ApprovalStatus.approved if action == "approve" else ApprovalStatus.rejected
+    await asyncio.to_thread(_release, thread_id, status, None, action)
+    return {"thread_id": thread_id, "status": "resumed"}
+
+
+async def resume_many(
+    graph, thread_ids: List[str], action: str, concurrency: int = APPROVAL_RESUME_CONCURRENCY, claimed: bool = False
+) -> Dict[str, Any]:
+    """
+    Resumes interrupted threads with the same decision, at most `concurrency` at
+    a time. With claimed, the threads were already taken with claim_many().
+    """
+    started = time.perf_counter()
+    limiter = asyncio.Semaphore(max(concurrency, 1))
+    run = _resume_claimed if claimed else resume
+
+    async def bounded(thread_id: str) -> Dict[str, Any]:
+        async with limiter:
+            return await run(graph, thread_id, action)
+
+    results = await asyncio.gather(*(bounded(t) for t in dict.fromkeys(thread_ids)))
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    for status, count in counts.items():
+        metrics.incr("approvals_bulk_threads", count, action=action, status=status)
+    metrics.observe("approvals_bulk_seconds", time.perf_counter() - started, action=action)
+    return {"action": action, "counts": counts, "results": results}
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+from dotenv import load_dotenv
+
+from .metrics import metrics
+
+load_dotenv()
+
+# Content-addressed store for large graph-state values (reports, web results, RAG
+# context). State carries a small reference; checkpoints stay the same size no
+# matter how long the report gets.
+BLOB_DIR = os.getenv("BLOB_DIR", "blobs")
+# Serialized values up to this size stay inline in the state
+BLOB_INLINE_MAX_BYTES = int(os.getenv("BLOB_INLINE_MAX_BYTES", "2048"))
+# Decoded blobs kept in memory for repeated reads by later nodes
+BLOB_CACHE_ENTRIES = int(os.getenv("BLOB_CACHE_ENTRIES", "256"))
+
+REF_KEY = "$blob"
+
+_cache: "OrderedDict[str, Any]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _path(digest: str) -> str:
+    return os.path.join(BLOB_DIR, digest[:2], f"{digest}.json")
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and REF_KEY in value
+
+
+def _remember(digest: str, value: Any) -> None:
+    with _lock:
+        _cache[digest] = value
+        _cache.move_to_end(digest)
+        while len(_cache) > BLOB_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+
+def put(value: Any) -> Dict[str, Any]:
+    """Stores a JSON-serializable value once (by sha256) and returns its reference."""
+    return _store(value, _encode(value))
+
+
+def _store(value: Any, data: bytes) -> Dict[str, Any]:
+    digest = hashlib.sha256(data).hexdigest()
+    path = _path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        metrics.incr("blob_writes")
+        metrics.incr("blob_bytes_written", len(data))
+    _remember(digest, value)
+    return {REF_KEY: digest, "size": len(data)}
+
+
+def get(ref: Dict[str, Any]) -> Any:
+    digest = ref[REF_KEY]
+    with _lock:
+        if digest in _cache:
+            _cache.move_to_end(digest)
+            return _cache[digest]
+    with open(_path(digest), "rb") as f:
+        value = json.loads(f.read())
+    metrics.incr("blob_reads")
+    _remember(digest, value)
+    return value
+
+
+def offload(value: Any) -> Any:
+    """Reference for large values, the value itself for small ones."""
+    if value is None or is_ref(value):
+        return value
+    data = _encode(value)
+    return _store(value, data) if len(data) > BLOB_INLINE_MAX_BYTES else value
+
+
+def load(value: Any) -> Any:
+    """Resolves a reference written by offload(); other values pass through. Treat the result as read-only."""
+    return get(value) if is_ref(value) else value
@@ -0,0 +1,67 @@
+import os
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from .metrics import metrics
+
+load_dotenv()
+
+# Synthesis models tried in order, cheapest first, e.g. "gpt-4o-mini,gpt-4o".
+# Empty means no cascade: the synthesis agent's default model is used once.
+SYNTHESIS_CASCADE = [m.strip() for m in os.getenv("SYNTHESIS_CASCADE", "").split(",") if m.strip()]
+# Escalate to the next tier when citation verification scores below this
+CASCADE_MIN_SCORE = float(os.getenv("CASCADE_MIN_SCORE", "0.7"))
+
+
+def cascade_models() -> List[Optional[str]]:
+    return list(SYNTHESIS_CASCADE) or [None]
+
+
+def next_tier(cascade: Dict[str, Any]) -> int:
+    """Tier the synthesis node should run: 0 on first draft, +1 after an escalation."""
+    if not cascade:
+        return 0
+    return cascade["tier"] + 1 if cascade.get("escalate") else cascade["tier"]
+
+
+def can_escalate(cascade: Dict[str, Any]) -> bool:
+    return bool(cascade) and cascade["tier"] < len(cascade["models"]) - 1
+
+
+def should_escalate(cascade: Dict[str, Any], score: Optional[float]) -> bool:
+    return can_escalate(cascade) and score is not None and score < CASCADE_MIN_SCORE
+
+
+def cascade_summary(cascade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Per-job record of which tier produced the final report, with the latency and
+    tokens saved versus the strongest tier (estimated from its running averages).
+    """
+    if not cascade or not cascade.get("attempts"):
+        return None
+
+    attempts = cascade["attempts"]
+    final = attempts[-1]
+    strongest = cascade["models"][-1] or final["model"]
+    spent_seconds = sum(a["latency_seconds"] for a in attempts)
+    spent_tokens = sum(a["tokens"] for a in attempts)
+
+    saved_seconds = saved_tokens = None
+    if final["model"] != strongest:
+        avg_seconds = metrics.average("synthesis_model_seconds", model=strongest)
+        avg_tokens = metrics.average("synthesis_model_tokens", model=strongest)
+        if avg_seconds is not None:
+            saved_seconds = avg_seconds - spent_seconds
+        if avg_tokens is not None:
+            saved_tokens = avg_tokens - spent_tokens
+
+    metrics.incr("cascade_final_tier", tier=final["tier"])
+    return {
+        "final_model": final["model"],
+        "final_tier": final["tier"],
+        "attempts": attempts,
+        "synthesis_seconds": spent_seconds,
+        "synthesis_tokens": spent_tokens,
+        "estimated_seconds_saved": saved_seconds,
+        "estimated_tokens_saved": saved_tokens,
+    }
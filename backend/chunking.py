@@ -0,0 +1,93 @@
+import os
+import uuid
+from typing import List, Dict, Tuple, Any
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "flat": overlapping 1000-char chunks, each embedded and returned as-is.
+# "hierarchical": small child chunks are embedded for matching, while the larger
+# parent section they belong to is stored once and returned as context.
+CHUNKING_MODE = os.getenv("CHUNKING_MODE", "flat")
+
+PARENT_CHUNK_SIZE = int(os.getenv("PARENT_CHUNK_SIZE", "2000"))
+CHILD_CHUNK_SIZE = int(os.getenv("CHILD_CHUNK_SIZE", "500"))
+CHILD_CHUNK_OVERLAP = int(os.getenv("CHILD_CHUNK_OVERLAP", "0"))
+# Sections summarized individually at ingest time (map step)
+SUMMARY_SECTION_SIZE = int(os.getenv("SUMMARY_SECTION_SIZE", "8000"))
+
+flat_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=1000,
+    chunk_overlap=200,
+)
+
+parent_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=PARENT_CHUNK_SIZE,
+    chunk_overlap=0,
+)
+
+child_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=CHILD_CHUNK_SIZE,
+    chunk_overlap=CHILD_CHUNK_OVERLAP,
+)
+
+summary_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=SUMMARY_SECTION_SIZE,
+    chunk_overlap=0,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for context budgets."""
+    return len(text) // 4
+
+
+def split_flat(text: str, metadata: Dict[str, Any]) -> List[Document]:
+    return flat_splitter.split_documents([Document(page_content=text, metadata=metadata)])
+
+
+def split_hierarchical(text: str, metadata: Dict[str, Any]) -> Tuple[List[Document], List[Document]]:
+    """
+    Splits text into non-overlapping parent sections and, within each parent,
+    small child chunks tagged with the parent's id.
+    Returns (parents, children); only the children need to be embedded.
+    """
+    parents = parent_splitter.split_documents([Document(page_content=text, metadata=metadata)])
+    children = []
+    for parent in parents:
+        parent.metadata["parent_id"] = uuid.uuid4().hex
+        # split_documents copies the parent's metadata (incl. parent_id) onto each child
+        children.extend(child_splitter.split_documents([parent]))
+    return parents, children
+
+
+def parent_ids_in_order(children: List[Document]) -> List[str]:
+    """Distinct parent ids of the matched children, best match first."""
+    seen = []
+    for doc in children:
+        parent_id = doc.metadata.get("parent_id")
+        if parent_id and parent_id not in seen:
+            seen.append(parent_id)
+    return seen
+
+
+def expand_to_parents(children: List[Document], parents_by_id: Dict[str, Document], limit: int) -> List[Document]:
+    """
+    Replaces matched child chunks with their parent sections, deduplicated by
+    parent id and keeping the rank of each parent's best child. Chunks stored
+    without a parent (flat mode) are passed through unchanged.
+    """
+    expanded = []
+    seen = set()
+    for doc in children:
+        parent_id = doc.metadata.get("parent_id")
+        if not parent_id:
+            expanded.append(doc)
+        elif parent_id not in seen:
+            seen.add(parent_id)
+            expanded.append(parents_by_id.get(parent_id, doc))
+        if len(expanded) >= limit:
+            break
+    return expanded
@@ -0,0 +1,80 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Optional
+from dotenv import load_dotenv
+
+from .metrics import metrics
+
+load_dotenv()
+
+
+def _entity_set(value: str) -> FrozenSet[str]:
+    return frozenset(e.strip().upper() for e in value.split(",") if e.strip())
+
+
+@dataclass(frozen=True)
+class CompliancePolicy:
+    """When a scanned report can skip human review."""
+
+    # Approve automatically when the scan allows it; False sends every report to review
+    auto_approve: bool = True
+    # Entity types that never need review on their own (they are still redacted)
+    allowed_entities: FrozenSet[str] = frozenset()
+    # Entity types that always need review, even when otherwise allowed
+    review_entities: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class PolicyDecision:
+    approved: bool
+    reason: str
+
+
+def load_policy() -> CompliancePolicy:
+    return CompliancePolicy(
+        auto_approve=os.getenv("COMPLIANCE_AUTO_APPROVE", "true").lower() == "true",
+        allowed_entities=_entity_set(os.getenv("COMPLIANCE_ALLOWED_ENTITIES", "")),
+        review_entities=_entity_set(os.getenv("COMPLIANCE_REVIEW_ENTITIES", "")),
+    )
+
+
+def evaluate(entities: Dict[str, int], policy: Optional[CompliancePolicy] = None) -> PolicyDecision:
+    """Auto-approves reports with no PII, or only allowed entity types."""
+    policy = policy or load_policy()
+    found = {entity for entity, count in entities.items() if count}
+    if not policy.auto_approve:
+        return PolicyDecision(False, "Policy requires review of every report.")
+    if found & policy.review_entities:
+        return PolicyDecision(False, f"Found entities that always need review: {', '.join(sorted(found & policy.review_entities))}.")
+    if not found:
+        return PolicyDecision(True, "No PII found.")
+    if found <= policy.allowed_entities:
+        return PolicyDecision(True, f"Only allowed entities found: {', '.join(sorted(found))}.")
+    return PolicyDecision(False, f"Found entities that need review: {', '.join(sorted(found - policy.allowed_entities))}.")
+
+
+# When each thread's pending review was first requested. The compliance node
+# re-runs on resume, so the first request time is kept here, not recomputed.
+_review_requested: Dict[str, float] = {}
+
+
+def review_requested(thread_id: Optional[str]) -> str:
+    """Marks a review as pending (once per thread) and returns when it was first requested."""
+    started = _review_requested.setdefault(thread_id or "", time.time())
+    return datetime.utcfromtimestamp(started).isoformat()
+
+
+def review_finished(thread_id: Optional[str], action: Optional[str]) -> None:
+    started = _review_requested.pop(thread_id or "", None)
+    if started is not None:
+        metrics.observe("compliance_approval_wait_seconds", time.time() - started, action=action or "unknown")
+    metrics.incr("compliance_reviews", action=action or "unknown")
+
+
+def pending_reviews() -> int:
+    return len(_review_requested)
+
+
+metrics.register_gauge("compliance_pending_reviews", pending_reviews)
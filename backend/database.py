@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import text
 import os
 from dotenv import load_dotenv
 
@@ -9,8 +10,31 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./multiagent_db.sqlite")
 
 engine = create_engine(DATABASE_URL, echo=True)
 
+# Additive changes create_all does not apply to existing Postgres databases
+POSTGRES_UPGRADES = [
+    "ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'cancelled'",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS profile VARCHAR NOT NULL DEFAULT 'standard'",
+]
+
+# SQLite has no ADD COLUMN IF NOT EXISTS: (table, column, definition), added when
+# PRAGMA table_info does not list the column yet
+SQLITE_COLUMN_UPGRADES = [
+    ("jobs", "profile", "VARCHAR NOT NULL DEFAULT 'standard'"),
+]
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in POSTGRES_UPGRADES:
+                conn.execute(text(statement))
+    elif engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            for table, column, definition in SQLITE_COLUMN_UPGRADES:
+                existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+                # No columns: the table does not exist yet (create_all only makes imported models)
+                if existing and column not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
 
 def get_session():
     with Session(engine) as session:
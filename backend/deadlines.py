@@ -0,0 +1,100 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from dotenv import load_dotenv
+
+from .metrics import metrics
+
+load_dotenv()
+
+# Overrides the profile's latency budget for every job when set (seconds)
+JOB_DEADLINE_SECONDS = float(os.getenv("JOB_DEADLINE_SECONDS", "0"))
+# Every node gets at least this much, even once the job deadline has passed,
+# so a late job still finishes with degraded results instead of nothing
+DEADLINE_MIN_NODE_SECONDS = float(os.getenv("DEADLINE_MIN_NODE_SECONDS", "2"))
+
+# Relative share of the remaining budget per node, in pipeline order
+NODE_SHARES: Dict[str, float] = {
+    "research": 0.25,
+    "synthesis": 0.45,
+    "citation": 0.15,
+    "compliance": 0.05,
+    "report": 0.10,
+}
+PIPELINE = list(NODE_SHARES)
+
+# Absolute (time.time()) deadline of the node currently running; read by BaseAgent.call
+_node_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("node_deadline", default=None)
+
+
+def new_deadline(budget_seconds: Optional[float]) -> Optional[float]:
+    """
+    Job deadline as a wall-clock timestamp, so it survives checkpointing.
+    None when neither the profile nor JOB_DEADLINE_SECONDS sets a budget.
+    """
+    budget = JOB_DEADLINE_SECONDS or budget_seconds
+    return time.time() + budget if budget else None
+
+
+def remaining(state: Dict[str, Any]) -> Optional[float]:
+    deadline = state.get("deadline")
+    return None if deadline is None else deadline - time.time()
+
+
+def node_budget(state: Dict[str, Any], node: str) -> Optional[float]:
+    """
+    This node's share of what is left: its weight relative to itself and every
+    node still ahead of it in the pipeline. None when the job has no deadline.
+    """
+    left = remaining(state)
+    if left is None:
+        return None
+    ahead = PIPELINE[PIPELINE.index(node):] if node in NODE_SHARES else [node]
+    total = sum(NODE_SHARES.get(n, 0) for n in ahead) or 1
+    return max(left * NODE_SHARES.get(node, 0) / total, DEADLINE_MIN_NODE_SECONDS)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the running node's deadline, or None outside a budgeted node."""
+    deadline = _node_deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+@contextmanager
+def node_deadline(state: Dict[str, Any], node: str) -> Iterator[Optional[float]]:
+    """
+    Runs a graph node under its budget: agent calls made inside it time out at the
+    node deadline. Records node latency and counts budget overruns.
+    """
+    budget = node_budget(state, node)
+    token = _node_deadline.set(time.time() + budget if budget is not None else None)
+    started = time.perf_counter()
+    try:
+        yield budget
+    finally:
+        _node_deadline.reset(token)
+        elapsed = time.perf_counter() - started
+        metrics.observe("node_seconds", elapsed, node=node)
+        if budget is not None and elapsed > budget:
+            metrics.incr("node_budget_overruns", node=node)
+
+
+def degraded(node: str, what: str) -> None:
+    """Counts a degraded result, e.g. web search skipped after a timeout."""
+    print(f"--- {node}: time budget exhausted, {what} ---")
+    metrics.incr("node_degraded", node=node, fallback=what)
+
+
+def resume_deadline(state: Dict[str, Any], after: str, budget_seconds: Optional[float]) -> Optional[float]:
+    """
+    Deadline after a human-in-the-loop pause: time spent waiting for approval is
+    not charged to the job, so nodes after `after` get back their planned share.
+    """
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    ahead = PIPELINE[PIPELINE.index(after) + 1:]
+    share = sum(NODE_SHARES[n] for n in ahead) / sum(NODE_SHARES.values())
+    return max(deadline, time.time() + (JOB_DEADLINE_SECONDS or budget_seconds or 0) * share)
@@ -0,0 +1,117 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
+
+from .llm_factory import get_chat_model
+
+load_dotenv()
+
+# Follow-ups on a job with a finished report patch it instead of re-running research
+DELTA_RESEARCH_ENABLED = os.getenv("DELTA_RESEARCH_ENABLED", "true").lower() == "true"
+DELTA_MAX_QUERIES = 3
+DELTA_MAX_UPDATES = 3
+
+
+class SectionUpdate(BaseModel):
+    section: Optional[int] = Field(
+        default=None,
+        description="Index of the existing section to rewrite. Leave empty to add a new section.",
+    )
+    title: str
+    focus: str = Field(description="What the rewritten or new section must cover, in one or two sentences.")
+
+
+class DeltaPlan(BaseModel):
+    web_queries: List[str] = Field(
+        default_factory=list,
+        description="New web searches needed to answer the follow-up. Empty if the existing sources suffice.",
+    )
+    search_documents: bool = Field(
+        default=False,
+        description="Whether the uploaded documents should be searched again for the follow-up.",
+    )
+    updates: List[SectionUpdate] = Field(
+        default_factory=list,
+        description="Sections to rewrite or add. Empty if the report already answers the follow-up.",
+    )
+
+
+plan_prompt = ChatPromptTemplate.from_template(
+    """You maintain an existing research report. A follow-up question was asked about it.
+Decide the smallest amount of new work needed to answer it.
+
+ORIGINAL QUESTION:
+{original_query}
+
+FOLLOW-UP QUESTION:
+{followup}
+
+REPORT SUMMARY:
+{summary}
+
+REPORT SECTIONS (index: title):
+{sections}
+
+SOURCES ALREADY COLLECTED:
+{sources}
+
+INSTRUCTIONS:
+- Only request web searches for information the existing sources clearly do not cover (at most {max_queries}).
+- Only search the uploaded documents again if the follow-up asks about their content in a way the report does not cover.
+- Rewrite only the sections the follow-up changes, or add a new section (at most {max_updates} in total).
+- If the report already answers the follow-up, return no searches and no updates.
+"""
+)
+
+
+async def plan_followup(
+    followup: str,
+    original_query: str,
+    report: Dict[str, Any],
+    web_results: List[Dict[str, Any]],
+    callbacks: Optional[list] = None,
+) -> DeltaPlan:
+    llm = get_chat_model("gpt-4o-mini", temperature=0, agent="delta_research")
+    plan: DeltaPlan = await (plan_prompt | llm.with_structured_output(DeltaPlan)).ainvoke({
+        "original_query": original_query,
+        "followup": followup,
+        "summary": report.get("summary", ""),
+        "sections": "\n".join(f"{i}: {s['title']}" for i, s in enumerate(report.get("sections", []))),
+        "sources": "\n".join(f"[{s.get('id')}] {s.get('title')}" for s in web_results if isinstance(s, dict)),
+        "max_queries": DELTA_MAX_QUERIES,
+        "max_updates": DELTA_MAX_UPDATES,
+    }, config={"callbacks": callbacks or []})
+    section_count = len(report.get("sections", []))
+    plan.web_queries = [q for q in plan.web_queries if q.strip()][:DELTA_MAX_QUERIES]
+    plan.updates = [
+        u for u in plan.updates if u.section is None or 0 <= u.section < section_count
+    ][:DELTA_MAX_UPDATES]
+    return plan
+
+
+def merge_web_results(existing: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Appends new results that are not already known (by URL), numbering them after
+    the existing ones so earlier [n] citations stay valid. Returns (merged, new ids).
+    """
+    merged = [r for r in existing if isinstance(r, dict) and "error" not in r]
+    seen = {r.get("url") for r in merged}
+    next_id = max((int(r["id"]) for r in merged if str(r.get("id", "")).isdigit()), default=0) + 1
+    added = []
+    for item in new:
+        if "error" in item or item.get("url") in seen:
+            continue
+        seen.add(item.get("url"))
+        item = {**item, "id": str(next_id)}
+        next_id += 1
+        merged.append(item)
+        added.append(item["id"])
+    return merged, added
+
+
+def merge_context(existing: str, new: str) -> str:
+    if not new or new in (existing or ""):
+        return existing or ""
+    return f"{existing}\n\n{new}" if existing else new
@@ -2,8 +2,8 @@ from typing import TypedDict, Annotated, List, Dict, Any, Optional, Sequence
 from langgraph.graph import StateGraph, END
 from langgraph.types import interrupt, Command
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
 import operator
-from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
 import os
 from dotenv import load_dotenv
@@ -21,9 +21,21 @@ from .agents.citation_agent import CitationAgent
 from .agents.citation_agent import CitationAgent
 from .agents.compliance_agent import ComplianceAgent
 from .database import engine
+from .llm_factory import get_chat_model
+from .cascade import cascade_models, next_tier, can_escalate, should_escalate, cascade_summary
+from .profiles import get_profile
+from . import report_cache
+from .blob_store import offload, load
+from .rendered_report import draft_artifacts, load_rendered
+from .section_verification import section_verdicts
+from .page_fetcher import source_text
+from . import compliance_policy, approvals, search_cache
+from .metrics import metrics
+from .deadlines import node_deadline, remaining, degraded, time_left, resume_deadline
 from sqlmodel import Session
 from .models import Report
-from sqlalchemy import update
+from sqlalchemy import update, func
+from sqlmodel import select
 
 
 
@@ -38,6 +50,8 @@ class AgentState(TypedDict):
     artifacts: Dict[str, Any]
     research_data: Dict[str, Any] # Store research results
     final_report: Dict[str, str] # Store paths to generated reports
+    profile: Optional[str] # Execution profile name (backend/profiles.py)
+    deadline: Optional[float] # Job deadline (epoch seconds); nodes split what is left (backend/deadlines.py)
 
 # --- Nodes ---
 
@@ -48,6 +62,22 @@ class Router(BaseModel):
     """Worker to route to next. If no workers needed, route to FINISH."""
     next: Literal["research", "synthesis", "citation", "compliance", "report", "FINISH"]
 
+# Linear pipeline: research -> synthesis -> citation -> compliance -> report -> end
+LINEAR_ROUTE = {
+    "research": "synthesis",
+    "synthesis": "citation",
+    "citation": "compliance",
+    "compliance": "report",
+    "report": "end",
+}
+
+# Upper bound on one routing LLM call; routing falls back to LINEAR_ROUTE after it
+ROUTER_TIMEOUT_SECONDS = 5
+# Fraction of the synthesis budget a full draft may use; the rest is the degraded fallback's
+SYNTHESIS_PRIMARY_SHARE = 0.8
+# Below this many seconds left, the degraded synthesis path skips the LLM entirely
+DEGRADED_SYNTHESIS_MIN_SECONDS = 3
+
 async def supervisor_node(state: AgentState):
     """
     Supervisor node that routes to the next worker based on the conversation state.
@@ -63,6 +93,10 @@ async def supervisor_node(state: AgentState):
     if next_step == "report":
         return {"next_step": "end"}
 
+    # Model cascade: a low verification score sends the draft back to a stronger model
+    if state.get("artifacts", {}).get("cascade", {}).get("escalate"):
+        return {"next_step": "synthesis"}
+
     # For other steps, use LLM to decide (or keep simple linear flow if preferred, 
     # but user asked for LLM decision. However, strictly linear dependencies 
     # (Research -> Synthesis -> Compliance -> Report) are often better enforced 
@@ -72,23 +106,15 @@ async def supervisor_node(state: AgentState):
     # Actually, for this specific "Research Agent", the flow is quite linear.
     # But let's implement the Router pattern to allow for loops (e.g. Synthesis -> Research -> Synthesis).
     
+    # Profiles that trade flexibility for latency skip the routing LLM call
+    if get_profile(state.get("profile")).router == "deterministic":
+        return {"next_step": LINEAR_ROUTE.get(next_step, "end")}
+
     # Check for API key
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("WARNING: OPENAI_API_KEY not found. Using deterministic routing.")
-        # Linear fallback: research -> synthesis -> citation -> compliance -> report -> end
-        if next_step == "research":
-            return {"next_step": "synthesis"}
-        elif next_step == "synthesis":
-            return {"next_step": "citation"}
-        elif next_step == "citation":
-            return {"next_step": "compliance"}
-        elif next_step == "compliance":
-            return {"next_step": "report"}
-        elif next_step == "report":
-            return {"next_step": "end"}
-        else:
-            return {"next_step": "end"}
+        return {"next_step": LINEAR_ROUTE.get(next_step, "end")}
 
     system_prompt = (
         "You are a supervisor tasked with managing a conversation between the"
@@ -102,14 +128,24 @@ async def supervisor_node(state: AgentState):
         "6. If everything is complete, choose 'FINISH'."
     )
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    left = remaining(state)
+    if left is not None and left <= 0:
+        degraded("supervisor", "deterministic_route")
+        return {"next_step": LINEAR_ROUTE.get(next_step, "end")}
+
+    llm = get_chat_model("gpt-4o-mini", temperature=0, agent="supervisor")
     structured_llm = llm.with_structured_output(Router)
     
     # Create a prompt with history
     # We simplify history for the router to avoid token limits
-    response = await structured_llm.ainvoke(
-        [{"role": "system", "content": system_prompt}] + messages[-5:]
-    )
+    try:
+        response = await asyncio.wait_for(
+            structured_llm.ainvoke([{"role": "system", "content": system_prompt}] + messages[-5:]),
+            timeout=min(ROUTER_TIMEOUT_SECONDS, left) if left is not None else ROUTER_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        degraded("supervisor", "deterministic_route")
+        return {"next_step": LINEAR_ROUTE.get(next_step, "end")}
     
     next_node = response.next
     if next_node == "FINISH":
@@ -117,6 +153,14 @@ async def supervisor_node(state: AgentState):
         
     return {"next_step": next_node}
 
+def _stream_writer():
+    """LangGraph custom-stream writer for the running node, or a no-op outside a graph run."""
+    try:
+        from langgraph.config import get_stream_writer
+        return get_stream_writer()
+    except Exception:
+        return lambda payload: None
+
 ingestion_agent = IngestionRetrievalAgent()
 web_agent = WebResearchAgent()
 synthesis_agent = SynthesisReportAgent()
@@ -130,32 +174,53 @@ async def research_node(state: AgentState):
     """
     print("--- Node: Research ---")
     job_id = state.get("job_id")
+    profile = get_profile(state.get("profile"))
     
     query = state["messages"][0].content
-    
-    # 1. RAG
+    skipped = []
+
     # 1. RAG
-    print(f"--- RAG Retrieval for: {query} (Job ID: {job_id}) ---")
-    try:
-        context = await ingestion_agent.call("retrieve", query, job_id=job_id)
-        rag_count = len(context) if context else 0
-        print(f"--- RAG Result: Retrieved {rag_count} chars ---")
-    except Exception as e:
-        print(f"--- RAG Error: {e} ---")
-        context = ""
-        rag_count = 0
-    
+    async def rag():
+        print(f"--- RAG Retrieval for: {query} (Job ID: {job_id}) ---")
+        try:
+            context = await ingestion_agent.call("retrieve", query, top_k=profile.rag_results, job_id=job_id)
+            print(f"--- RAG Result: Retrieved {len(context) if context else 0} chars ---")
+            return context
+        except asyncio.TimeoutError:
+            degraded("research", "rag_skipped")
+            skipped.append("rag")
+        except Exception as e:
+            print(f"--- RAG Error: {e} ---")
+        return ""
+
     # 2. Web Search
-    print(f"--- Web Search for: {query} ---")
-    try:
-        web_results = await web_agent.call("search", query, max_results=5)
-    except Exception as e:
-        web_results = [{"error": str(e)}]
+    async def web():
+        print(f"--- Web Search for: {query} (profile: {profile.name}) ---")
+        try:
+            if profile.sub_queries > 1:
+                queries = await web_agent.call("expand_query", query, profile.sub_queries)
+                return await web_agent.call("search_many", queries, max_results=profile.web_results, fetch_pages=profile.fetch_pages)
+            return await web_agent.call("search", query, max_results=profile.web_results, fetch_pages=profile.fetch_pages)
+        except asyncio.TimeoutError:
+            degraded("research", "web_search_skipped")
+            skipped.append("web_search")
+            return []
+        except Exception as e:
+            return [{"error": str(e)}]
+
+    # Both run under the node's share of the job deadline
+    with node_deadline(state, "research"), search_cache.track() as web_cache:
+        context, web_results = await asyncio.gather(rag(), web())
+    rag_count = len(context) if context else 0
         
     return {
+        # Large values are stored out of band; state keeps a reference (backend/blob_store.py)
         "research_data": {
-            "context": context,
-            "web_results": web_results
+            "context": offload(context),
+            "web_results": offload(web_results),
+            "skipped": skipped,
+            # How each web search was served: fresh/stale from the cache, miss, or off
+            "web_cache": dict(web_cache),
         },
         "messages": [AIMessage(content=f"Research complete. Retrieved {rag_count} chars from RAG and found {len(web_results)} web sources.")]
     }
@@ -166,34 +231,103 @@ async def synthesis_node(state: AgentState):
     """
     print("--- Node: Synthesis ---")
     job_id = state.get("job_id")
+    profile = get_profile(state.get("profile"))
     
     query = state["messages"][0].content
     data = state["research_data"]
     
-    response_payload = await synthesis_agent.call(
-        "generate_report",
-        query,
-        {
-            "web_results": data.get("web_results", ""),
-            "context": data.get("context", ""),
-            "sections": [],
-            "citations": [],
-        },
-    )
+    # Forward each finished section/table/citation to graph stream consumers
+    # (stream_mode="custom") so progress and previews can start early
+    writer = _stream_writer()
+
+    async def on_item(kind: str, index: int, item: Dict[str, Any]):
+        writer({"event": "report_item", "job_id": job_id, "kind": kind, "index": index, "item": item})
+
+    evidence = {
+        "web_results": load(data.get("web_results", "")),
+        "context": load(data.get("context", "")),
+        "sections": [],
+        "citations": [],
+    }
+
+    # Model cascade: draft with the cheapest tier first; a failed parse escalates
+    # immediately, a low citation score escalates via the supervisor
+    cascade = state.get("artifacts", {}).get("cascade") or {}
+    models = cascade.get("models") or profile.synthesis_models or cascade_models()
+    tier = next_tier(cascade)
+    attempts = list(cascade.get("attempts", []))
+
+    with node_deadline(state, "synthesis"):
+        draft = None
+        while True:
+            # Keep part of the node budget in reserve for the degraded path
+            left = time_left()
+            try:
+                draft = await synthesis_agent.call(
+                    "generate_draft",
+                    query,
+                    evidence,
+                    mode=profile.synthesis_mode,
+                    on_item=on_item,
+                    model=models[tier],
+                    length=profile.report_length,
+                    timeout=left * SYNTHESIS_PRIMARY_SHARE if left is not None else None,
+                )
+            except asyncio.TimeoutError:
+                draft = None
+                break
+            attempts.append({
+                "tier": tier,
+                "model": draft["model"],
+                "latency_seconds": draft["latency_seconds"],
+                "tokens": draft["tokens"],
+                "failed": draft["failed"],
+            })
+            cascade = {"models": models, "tier": tier, "attempts": attempts, "escalate": False}
+            if not (draft["failed"] and can_escalate(cascade)):
+                break
+            print(f"--- Synthesis with {draft['model']} failed to parse, escalating ---")
+            tier += 1
+
+        if draft is None:
+            # Timed out: a short answer from the fastest model if time remains,
+            # otherwise an extractive report straight from the evidence
+            draft = await _degraded_draft(query, evidence, on_item)
+            cascade = {"models": models, "tier": tier, "attempts": attempts, "escalate": False, "degraded": True}
+
+    response_payload = draft["report"]
     
     # Manual merge of artifacts
     current_artifacts = state.get("artifacts", {}).copy()
-    # Store the FULL structured report, not just the summary
-    current_artifacts.update({"draft_answer": response_payload})
-    
-    # Format the full report for the chat output
-    full_report_text = synthesis_agent.format_report(response_payload)
+    # Store the FULL structured report, not just the summary, with its rendered text (as blob references)
+    current_artifacts.update({**draft_artifacts(response_payload), "cascade": cascade})
     
+    # The message history is checkpointed at every hop: keep a short note, not the report
     return {
-        "messages": [AIMessage(content=full_report_text)],
+        "messages": [AIMessage(content=(
+            f"Draft report ready: {len(response_payload.get('sections', []))} sections, "
+            f"{len(response_payload.get('citations', []))} citations."
+        ))],
         "artifacts": current_artifacts
     }
 
+
+async def _degraded_draft(query: str, evidence: Dict[str, Any], on_item) -> Dict[str, Any]:
+    left = time_left()
+    if left is not None and left >= DEGRADED_SYNTHESIS_MIN_SECONDS:
+        degraded("synthesis", "brief_fast_model")
+        try:
+            draft = await synthesis_agent.call(
+                "generate_draft", query, evidence, mode="single", on_item=on_item,
+                model=get_profile("fast").synthesis_models[0], length="brief",
+            )
+            if not draft["failed"]:
+                return draft
+        except asyncio.TimeoutError:
+            pass
+    degraded("synthesis", "extractive_report")
+    return {"report": synthesis_agent.fallback_report(evidence), "failed": True}
+
 async def citation_node(state: AgentState):
     """
     Verifies citations in the draft answer.
@@ -201,13 +335,9 @@ async def citation_node(state: AgentState):
     print("--- Node: Citation ---")
     job_id = state.get("job_id")
     
-    draft = state["artifacts"].get("draft_answer", "")
-    
-    # If draft is a dict (structured report), format it to string for verification
-    if isinstance(draft, dict):
-        draft_text = synthesis_agent.format_report(draft)
-    else:
-        draft_text = draft
+    # Structured reports carry their rendered text from synthesis
+    rendered = load_rendered(state["artifacts"])
+    draft_text = rendered.text if rendered else load(state["artifacts"].get("draft_answer", ""))
     data = state["research_data"]
     
     # Combine web results and context into a single list of sources for verification
@@ -216,7 +346,7 @@ async def citation_node(state: AgentState):
     # or we can construct a simple list here.
     
     # Assuming web_results is a list of dicts as per recent fix
-    sources = data.get("web_results", [])
+    sources = load(data.get("web_results", []))
     if isinstance(sources, list):
         # Ensure it matches what verify_citations_internal expects (id, title, text)
         # WebResearchAgent returns: title, date, quote, url
@@ -225,50 +355,98 @@ async def citation_node(state: AgentState):
             formatted_sources.append({
                 "id": str(i+1),
                 "title": s.get("title", "Unknown"),
-                "text": s.get("quote", ""),
+                # Same evidence synthesis saw: all fetched passages, not only the best one
+                "text": source_text(s),
                 "url": s.get("url", "")
             })
         sources = formatted_sources
     else:
         sources = []
 
-    verification_result = await citation_agent.call("verify", draft_text, sources)
-    
+    use_llm = get_profile(state.get("profile")).llm_citation_check
+    with node_deadline(state, "citation"):
+        try:
+            verification_result = await citation_agent.call("verify", draft_text, sources, use_llm=use_llm)
+        except asyncio.TimeoutError:
+            degraded("citation", "verification_skipped")
+            verification_result = {
+                "score": None,
+                "is_valid": None,
+                "supported_claims": 0,
+                "total_claims": 0,
+                "issues": [],
+                "skipped": True,
+                "summary": "Verification skipped: time budget exhausted.",
+            }
+    
+    if "claims" in verification_result:
+        # Per-section verdicts let edited versions re-check only what changed
+        verification_result = {**verification_result, "sections": section_verdicts(draft_text, verification_result)}
+
     # Manual merge of artifacts
     current_artifacts = state.get("artifacts", {}).copy()
     current_artifacts.update({"verification_result": verification_result})
 
+    cascade = current_artifacts.get("cascade")
+    if cascade:
+        score = verification_result.get("score")
+        attempts = [*cascade["attempts"][:-1], {**cascade["attempts"][-1], "score": score}]
+        cascade = {**cascade, "attempts": attempts}
+        if should_escalate(cascade, score):
+            print(f"--- Verification score {score} below threshold, escalating synthesis ---")
+            cascade["escalate"] = True
+        current_artifacts["cascade"] = cascade
+
     return {
         "messages": [AIMessage(content=f"Citation verification complete. Score: {verification_result.get('score', 0)}")],
         "artifacts": current_artifacts
     }
 
-async def compliance_node(state: AgentState):
+async def compliance_node(state: AgentState, config: RunnableConfig):
     """
     Checks for PII and compliance.
     """
     print("--- Node: Compliance ---")
     job_id = state.get("job_id")
     
-    draft = state["artifacts"].get("draft_answer", "")
+    rendered = load_rendered(state["artifacts"])
     
-    # If draft is a dict (structured report), format it to string for redaction
-    if isinstance(draft, dict):
-        draft_text = synthesis_agent.format_report(draft)
+    # 1. Scan and redact before asking anyone: clean reports need no human review.
+    # Redaction is never skipped or cut short by the job deadline. The node re-runs
+    # on resume; the agent serves the repeated scan from its cache.
+    if rendered:
+        # Block by block, so the redacted text keeps its per-section offsets
+        compliance_result = await compliance_agent.call("redact_report", rendered)
     else:
-        draft_text = draft
-    
-    # Redact PII
-    # We force approval for demonstration of HITL
-    
-    # Check for PII first (mock check or real)
-    # For this milestone, we interrupt to ask for confirmation
-    
-    # 1. Interrupt Graph
-    # The value returned by interrupt() will be the payload provided when resuming
-    approval_data = interrupt({"msg": "Approve redaction?"})
+        draft_text = load(state["artifacts"].get("draft_answer", ""))
+        compliance_result = await compliance_agent.call("redact", draft_text, require_approval=False)
+    findings = {
+        "entities": compliance_result["entities"],
+        "total": sum(compliance_result["entities"].values()),
+        "sections": compliance_result.get("redacted_blocks", []),
+    }
+
+    # 2. Policy decides whether a human has to approve
+    decision = compliance_policy.evaluate(findings["entities"])
+    if decision.approved:
+        metrics.incr("compliance_auto_approved")
+        approval_data = {"action": "approve", "auto": True}
+    else:
+        # The value returned by interrupt() will be the payload provided when resuming
+        thread_id = config.get("configurable", {}).get("thread_id")
+        request = {
+            "msg": "Approve redaction?",
+            "findings": findings,
+            "policy": decision.reason,
+            "requested_at": compliance_policy.review_requested(thread_id),
+        }
+        # Indexed so reviewers can list and bulk-resume waiting threads (/approvals)
+        await asyncio.to_thread(approvals.record_pending, thread_id, job_id, request)
+        approval_data = interrupt(request)
+        compliance_policy.review_finished(thread_id, approval_data.get("action"))
+        await asyncio.to_thread(approvals.resolve, thread_id, approval_data.get("action"))
     
-    print(f"--- Resume with data: {approval_data} ---")
+    print(f"--- Compliance decision: {approval_data} ({decision.reason}) ---")
     
     if approval_data.get("action") != "approve":
          return {
@@ -276,18 +454,31 @@ async def compliance_node(state: AgentState):
             "artifacts": {"final_answer": "[BLOCKED BY COMPLIANCE]"}
         }
 
-    # 2. Proceed with enforcement
-    compliance_result = await compliance_agent.call("redact", draft_text, require_approval=False)
-    redacted = compliance_result["redacted_text"]
-    
+    # 3. Proceed with enforcement
     # Manual merge of artifacts
     current_artifacts = state.get("artifacts", {}).copy()
-    current_artifacts.update({"final_answer": redacted})
+    current_artifacts["compliance_assessment"] = {
+        **findings,
+        "auto_approved": decision.approved,
+        "policy": decision.reason,
+    }
+    if rendered:
+        current_artifacts.update({
+            "final_answer": offload(compliance_result["redacted_text"]),
+            "final_rendered": offload(compliance_result["rendered"].to_dict()),
+            "redacted_blocks": compliance_result["redacted_blocks"],
+        })
+    else:
+        current_artifacts.update({"final_answer": offload(compliance_result["redacted_text"])})
     
-    return {
+    update = {
         "messages": [AIMessage(content="Compliance check complete. Approved.")],
-        "artifacts": current_artifacts
+        "artifacts": current_artifacts,
     }
+    if not decision.approved:
+        # Only a real pause for review earns the remaining nodes their time back
+        update["deadline"] = resume_deadline(state, "compliance", get_profile(state.get("profile")).latency_budget_seconds)
+    return update
 
 async def report_node(state: AgentState):
     print("\n" + "="*60)
@@ -298,19 +489,21 @@ async def report_node(state: AgentState):
     # We manage session locally as it's not passed in state
     
     artifacts = state.get("artifacts", {})
-    final_answer = artifacts.get("final_answer")
+    final_answer = load(artifacts.get("final_answer"))
 
     if not final_answer:
         # fallback to draft
-        draft = artifacts.get("draft_answer")
-        if isinstance(draft, dict):
-            final_answer = synthesis_agent.format_report(draft)
+        draft = load(artifacts.get("draft_answer"))
+        rendered = load_rendered(artifacts)
+        if rendered:
+            final_answer = rendered.text
         elif isinstance(draft, str):
             final_answer = draft
         else:
             final_answer = "No content available for report."
 
-    print(f"\n[REPORT] Generating PDF and DOCX...")
+    profile = get_profile(state.get("profile"))
+    print(f"\n[REPORT] Generating {', '.join(profile.formats) or 'no files'} (profile: {profile.name})...")
     print(f"  - Content length: {len(final_answer)} chars")
     print(f"  - Job ID: {job_id}")
 
@@ -330,13 +523,16 @@ async def report_node(state: AgentState):
         if not report_id:
             try:
                 print("  - Creating new 'generating' report record...")
+                # Follow-ups patch the report, so each run adds the job's next version
+                latest_version = db_session.exec(select(func.max(Report.version)).where(Report.job_id == job_id)).one()
                 initial_report = Report(
                     job_id=job_id, 
                     user_id=job.user_id,
                     title=f"Report: {job.name}",
                     type="comprehensive_report",
                     content={"summary": "Generating..."}, 
-                    status=ReportStatus.generating
+                    status=ReportStatus.generating,
+                    version=(latest_version or 0) + 1,
                 )
                 db_session.add(initial_report)
                 db_session.commit()
@@ -347,7 +543,16 @@ async def report_node(state: AgentState):
                 print(f"  ✗ Failed to create initial report record: {e}")
 
         try:
-            report_paths = await synthesis_agent.export(final_answer, job_id=job_id)
+            with node_deadline(state, "report"):
+                try:
+                    report_paths = await asyncio.wait_for(
+                        synthesis_agent.export(final_answer, job_id=job_id, formats=profile.formats),
+                        timeout=time_left(),
+                    )
+                except asyncio.TimeoutError:
+                    # The report content is still saved; only the file downloads are missing
+                    degraded("report", "files_skipped")
+                    report_paths = {}
             print(f"  → Generated: {report_paths}")
             
             # Prepare structured content
@@ -363,7 +568,7 @@ async def report_node(state: AgentState):
             # Ensure citations are present in content
             # We prioritize existing citations in the answer, but fallback/merge with research data
             if "citations" not in structured_content or not structured_content["citations"]:
-                 structured_content["citations"] = state.get("research_data", {}).get("web_results", [])
+                 structured_content["citations"] = load(state.get("research_data", {}).get("web_results", []))
 
             # ============================================
             # UPDATE DATABASE AFTER SUCCESSFUL GENERATION
@@ -381,7 +586,12 @@ async def report_node(state: AgentState):
                             **artifacts.get("report_metadata", {}),
                             "report_paths": report_paths,
                             "compliance_assessment": artifacts.get("compliance_assessment"),
-                            "verification_score": artifacts.get("verification_result", {}).get("score")
+                            "verification_score": artifacts.get("verification_result", {}).get("score"),
+                            "verification_sections": artifacts.get("verification_result", {}).get("sections"),
+                            "cascade": cascade_summary(artifacts.get("cascade")),
+                            "profile": profile.name,
+                            "delta": artifacts.get("delta"),
+                            "web_cache": state.get("research_data", {}).get("web_cache"),
                         }
                     )
                     
@@ -389,6 +599,14 @@ async def report_node(state: AgentState):
                     db_session.commit()
                     
                     print(f"  ✓ Database updated: Report {report_id} marked as completed")
+
+                    if _cacheable(state):
+                        try:
+                            await asyncio.to_thread(
+                                report_cache.store, state["messages"][0].content, job_id, state.get("profile"), report_id
+                            )
+                        except Exception as cache_error:
+                            print(f"  ⚠ Report cache store failed: {cache_error}")
                     
                 except Exception as db_error:
                     print(f"  ✗ DATABASE UPDATE ERROR: {db_error}")
@@ -428,6 +646,20 @@ async def report_node(state: AgentState):
         "artifacts": new_artifacts,
     }
 
+def _cacheable(state: AgentState) -> bool:
+    """Only full-quality, approved reports are offered to later near-identical queries."""
+    artifacts = state.get("artifacts", {})
+    draft = load(artifacts.get("draft_answer"))
+    return (
+        artifacts.get("final_answer") != "[BLOCKED BY COMPLIANCE]"
+        and not artifacts.get("delta")
+        and not state.get("research_data", {}).get("skipped")
+        and not artifacts.get("verification_result", {}).get("skipped")
+        and not artifacts.get("cascade", {}).get("degraded")
+        and not any(a.get("failed") for a in artifacts.get("cascade", {}).get("attempts", [])[-1:])
+        and isinstance(draft, dict)
+    )
+
 # --- Graph Construction ---
 
 workflow = StateGraph(AgentState)
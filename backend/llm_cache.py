@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Sequence, Callable, List
+
+from dotenv import load_dotenv
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from .metrics import metrics
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+# Agents that opt in to response caching (names match AgentCard.name / call sites)
+LLM_CACHE_AGENTS = [
+    a.strip() for a in os.getenv(
+        "LLM_CACHE_AGENTS",
+        "synthesis_report_agent,citation_agent,supervisor,chat_agent,summaries",
+    ).split(",") if a.strip()
+]
+# Semantic matching is off unless a threshold is set (e.g. 0.97). It only applies
+# to short prompts: long templated prompts embed almost identically regardless
+# of the evidence they carry, so near-duplicates there are not safe to reuse.
+LLM_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0") or 0)
+LLM_CACHE_SEMANTIC_MAX_CHARS = int(os.getenv("LLM_CACHE_SEMANTIC_MAX_CHARS", "2000"))
+
+
+def _default_embed(text: str) -> List[float]:
+    # Imported lazily: the embedding model is only loaded when semantic matching is on
+    from .rag import embeddings
+    return embeddings.embed_query(text)
+
+
+def _generation_tokens(generations: Sequence[Generation]) -> int:
+    total = 0
+    for gen in generations:
+        message = getattr(gen, "message", None)
+        usage = getattr(message, "usage_metadata", None) or {}
+        total += usage.get("total_tokens", 0)
+    return total
+
+
+class LLMResponseStore:
+    """
+    SQLite-backed response store shared by every agent.
+    Exact key: sha256 of the LangChain llm_string (model + params + bound tools)
+    and the serialized prompt. Optional semantic match on short prompts with the
+    same llm_string. Entries expire after a TTL and the least recently used rows
+    are evicted beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        semantic_threshold: float = LLM_CACHE_SEMANTIC_THRESHOLD,
+        embed_fn: Callable[[str], List[float]] = _default_embed,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.embed_fn = embed_fn
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                llm_string TEXT NOT NULL,
+                response TEXT NOT NULL,
+                embedding TEXT,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_llm ON llm_cache (llm_string)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _semantic_enabled(self, prompt: str) -> bool:
+        return self.semantic_threshold > 0 and len(prompt) <= LLM_CACHE_SEMANTIC_MAX_CHARS
+
+    def lookup(self, prompt: str, llm_string: str) -> tuple[Optional[list], str]:
+        """Returns (generations, match_type) where match_type is exact/semantic/miss."""
+        now = time.time()
+        cutoff = now - self.ttl_seconds
+        key = self.make_key(prompt, llm_string)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        match = "exact" if row else "miss"
+        if row and row[2] < cutoff:
+            self._delete(row[0])
+            row, match = None, "miss"
+
+        if row is None and self._semantic_enabled(prompt):
+            row = self._semantic_lookup(prompt, llm_string, cutoff)
+            match = "semantic" if row else "miss"
+
+        if row is None:
+            return None, match
+
+        with self._lock:
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, row[0]))
+            self._conn.commit()
+        return loads(row[1]), match
+
+    def _semantic_lookup(self, prompt: str, llm_string: str, cutoff: float):
+        from .vectors import cosine_similarities
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, response, created_at, embedding FROM llm_cache "
+                "WHERE llm_string = ? AND embedding IS NOT NULL AND created_at >= ?",
+                (llm_string, cutoff),
+            ).fetchall()
+        if not rows:
+            return None
+
+        scores = cosine_similarities(self.embed_fn(prompt), [json.loads(r[3]) for r in rows])
+        best = int(scores.argmax())
+        if scores[best] >= self.semantic_threshold:
+            return rows[best][:3]
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        now = time.time()
+        embedding = json.dumps(self.embed_fn(prompt)) if self._semantic_enabled(prompt) else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, llm_string, response, embedding, tokens, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.make_key(prompt, llm_string),
+                    llm_string,
+                    dumps(list(return_val)),
+                    embedding,
+                    _generation_tokens(return_val),
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+        self._evict()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+            count = self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class AgentLLMCache(BaseCache):
+    """
+    Per-agent view over the shared store, passed as ChatOpenAI(cache=...).
+    Keeps hit/miss/saved-token metrics labelled by agent.
+    """
+
+    def __init__(self, store: LLMResponseStore, agent: str) -> None:
+        self.store = store
+        self.agent = agent
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        generations, match = self.store.lookup(prompt, llm_string)
+        if generations is None:
+            metrics.incr("llm_cache_misses", agent=self.agent)
+            return None
+        metrics.incr("llm_cache_hits", agent=self.agent, match=match)
+        metrics.incr("llm_cache_tokens_saved", _generation_tokens(generations), agent=self.agent)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        self.store.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+_store: Optional[LLMResponseStore] = None
+_store_lock = threading.Lock()
+
+
+def get_llm_cache(agent: str) -> BaseCache | bool:
+    """
+    Cache to pass to ChatOpenAI for the given agent, or False when the agent
+    has not opted in (False disables caching even if a global cache is set).
+    """
+    global _store
+    if not LLM_CACHE_ENABLED or agent not in LLM_CACHE_AGENTS:
+        return False
+    with _store_lock:
+        if _store is None:
+            _store = LLMResponseStore()
+    return AgentLLMCache(_store, agent)
@@ -0,0 +1,219 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from .llm_cache import get_llm_cache
+from .metrics import metrics
+
+load_dotenv()
+
+# Shared keep-alive pool used by every ChatOpenAI client in the process
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# Max LLM calls in flight across all agents (fan-out such as sectioned synthesis)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# HTTP/2 multiplexes concurrent calls over one connection; needs the optional h2 package
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "auto").lower()
+
+_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+_async_transport: Optional["_ReopeningAsyncTransport"] = None
+_sync_transport: Optional["_ReopeningTransport"] = None
+_models: Dict[tuple, ChatOpenAI] = {}
+_limiter: Optional[asyncio.Semaphore] = None
+
+
+def _http2_enabled() -> bool:
+    if LLM_HTTP2 == "auto":
+        return importlib.util.find_spec("h2") is not None
+    return LLM_HTTP2 == "true"
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+
+
+async def _on_request(request: httpx.Request) -> None:
+    request.extensions["started_at"] = time.perf_counter()
+    metrics.incr("llm_http_requests")
+
+
+async def _on_response(response: httpx.Response) -> None:
+    started_at = response.request.extensions.get("started_at")
+    if started_at is not None:
+        metrics.observe("llm_http_latency_seconds", time.perf_counter() - started_at)
+    if response.status_code >= 400:
+        metrics.incr("llm_http_errors", status=response.status_code)
+
+
+class _ReopeningAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    The connection pool behind the shared async client. aclose() drops the pool
+    and the next request builds a new one, so the client (bound into every
+    cached ChatOpenAI) never becomes unusable.
+    """
+
+    def __init__(self, http2: bool) -> None:
+        self.http2 = http2
+        self.pool: Optional[httpx.AsyncHTTPTransport] = None
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        if self.pool is None:
+            self.pool = httpx.AsyncHTTPTransport(http2=self.http2, limits=_limits())
+        return self.pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            await pool.aclose()
+
+
+class _ReopeningTransport(httpx.BaseTransport):
+    """Sync counterpart of _ReopeningAsyncTransport; may be used from several threads."""
+
+    def __init__(self, http2: bool) -> None:
+        self.http2 = http2
+        self.pool: Optional[httpx.HTTPTransport] = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> httpx.HTTPTransport:
+        with self._lock:
+            if self.pool is None:
+                self.pool = httpx.HTTPTransport(http2=self.http2, limits=_limits())
+            return self.pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._current().handle_request(request)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.close()
+
+
+def get_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """The process-wide sync/async HTTP clients behind every ChatOpenAI instance."""
+    global _async_client, _sync_client, _async_transport, _sync_transport
+    with _lock:
+        if _async_client is None:
+            http2 = _http2_enabled()
+            _async_transport = _ReopeningAsyncTransport(http2)
+            _sync_transport = _ReopeningTransport(http2)
+            _async_client = httpx.AsyncClient(
+                transport=_async_transport,
+                timeout=_timeout(),
+                event_hooks={"request": [_on_request], "response": [_on_response]},
+            )
+            _sync_client = httpx.Client(transport=_sync_transport, timeout=_timeout())
+    return _sync_client, _async_client
+
+
+def get_chat_model(model: str, temperature: float = 0, agent: Optional[str] = None, **kwargs: Any) -> ChatOpenAI:
+    """
+    Returns a shared ChatOpenAI for (model, temperature, agent, kwargs).
+    All instances share one keep-alive connection pool, so there is no per-call
+    client construction or TLS handshake. `agent` selects the response cache opt-in.
+    """
+    key = (model, temperature, agent, tuple(sorted(kwargs.items())))
+    with _lock:
+        cached = _models.get(key)
+    if cached is not None:
+        return cached
+
+    sync_client, async_client = get_http_clients()
+    llm = ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=sync_client,
+        http_async_client=async_client,
+        max_retries=LLM_MAX_RETRIES,
+        timeout=_timeout(),
+        cache=get_llm_cache(agent) if agent else False,
+        **kwargs,
+    )
+    with _lock:
+        _models.setdefault(key, llm)
+        return _models[key]
+
+
+class TokenUsageHandler(AsyncCallbackHandler):
+    """Sums token usage over every LLM call it is attached to."""
+
+    def __init__(self) -> None:
+        self.total_tokens = 0
+
+    async def on_llm_end(self, response, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+                self.total_tokens += usage.get("total_tokens", 0)
+
+
+def llm_limiter() -> asyncio.Semaphore:
+    """Process-wide semaphore bounding concurrent LLM calls fanned out by agents."""
+    global _limiter
+    if _limiter is None:
+        _limiter = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _limiter
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool utilization of the shared async client."""
+    if _async_transport is None or _async_transport.pool is None:
+        return {"initialized": False}
+    # httpx does not expose pool state publicly; read httpcore's pool defensively
+    pool = getattr(_async_transport.pool, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+    return {
+        "initialized": True,
+        "http2": _http2_enabled(),
+        "max_connections": LLM_POOL_MAX_CONNECTIONS,
+        "max_keepalive": LLM_POOL_MAX_KEEPALIVE,
+        "connections": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "queued_requests": len(getattr(pool, "_requests", []) or []),
+        "models": len(_models),
+    }
+
+
+metrics.register_gauge("llm_http_pool", pool_stats)
+
+
+async def aclose() -> None:
+    """
+    Closes the shared pool's connections; called from the app lifespan on
+    shutdown. Not terminal: the clients, and every ChatOpenAI holding them
+    (including ones kept on agents or at module level), reopen a pool on their
+    next request.
+    """
+    if _async_transport is not None:
+        await _async_transport.aclose()
+    if _sync_transport is not None:
+        _sync_transport.close()
@@ -4,6 +4,7 @@ import shutil
 import os
 import asyncio
 from .rag import add_document
+from .summaries import summarize_document, summaries_enabled
 from .database import engine
 from datetime import datetime
 # Direct imports from MCP servers
@@ -15,22 +16,38 @@ from .database import create_db_and_tables, get_session
 from .models import Job, User, JobStatus
 
 from sqlmodel import Session, select
+from sqlalchemy import func
 from sqlalchemy.orm import selectinload
 from mcp_servers.research.server import web_search
 from mcp_servers.compliance.server import redact_pii
 from mcp_servers.citation_validation.server import verify_citations_internal, parse_web_search_results
 from .rag import add_document, query_documents
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import Depends, status, Body
 from langgraph.types import Command
 
 from .logging_config import configure_logging
+from .maintenance import vector_maintenance_loop, VECTOR_MAINTENANCE_INTERVAL_SECONDS, purge_job_vectors
+from . import llm_factory
+from .profiles import PROFILES, DEFAULT_PROFILE
+from .task_registry import task_registry
+from . import redaction
+from . import page_fetcher
+from . import approvals
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
     create_db_and_tables()
+    maintenance_task = None
+    if VECTOR_MAINTENANCE_INTERVAL_SECONDS > 0:
+        maintenance_task = asyncio.create_task(vector_maintenance_loop())
     yield
+    if maintenance_task:
+        maintenance_task.cancel()
+    await llm_factory.aclose()
+    await page_fetcher.aclose()
+    redaction.shutdown()
 
 app = FastAPI(title="Research Agent Platform API", lifespan=lifespan)
 
@@ -222,7 +239,8 @@ class RagAddRequest(BaseModel):
 
 @app.post("/test/rag/add")
 async def test_rag_add(request: RagAddRequest):
-    count = add_document(request.text, request.source)
+    text = await redaction.redact_for_ingest(request.text, request.source)
+    count = await asyncio.to_thread(add_document, text, request.source)
     return {"chunks_added": count}
 
 class RagQueryRequest(BaseModel):
@@ -234,11 +252,21 @@ async def test_rag_query(request: RagQueryRequest):
     return {"context": context}
 
 
+class JobCreate(BaseModel):
+    topic: Optional[str] = None
+    # Execution profile: "fast", "standard" or "thorough" (see backend/profiles.py)
+    profile: str = DEFAULT_PROFILE
+
 @app.post("/jobs")
 async def create_job(
+    job_data: Optional[JobCreate] = Body(default=None),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
+    job_data = job_data or JobCreate()
+    if job_data.profile not in PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown profile '{job_data.profile}'. Choose one of: {', '.join(PROFILES)}")
+
     # Check Quota
     statement = select(func.count(Job.id)).where(Job.user_id == current_user.id).where(Job.status.in_([JobStatus.pending, JobStatus.running]))
     active_jobs_count = session.exec(statement).one()
@@ -247,14 +275,12 @@ async def create_job(
         raise HTTPException(status_code=400, detail=f"Job quota exceeded. Limit: {current_user.quota_limit}, Active: {active_jobs_count}")
 
     # Create a new job in DB
-    job = Job(type="research", user_id=current_user.id, name="New Research Job")
+    job = Job(type="research", user_id=current_user.id, name=job_data.topic or "New Research Job", profile=job_data.profile)
     session.add(job)
     session.commit()
     session.refresh(job)
-    
 
-        
-    return {"job_id": job.id, "status": job.status}
+    return {"job_id": job.id, "status": job.status, "profile": job.profile}
 
 @app.get("/jobs", response_model=List[Job])
 async def get_jobs(
@@ -281,6 +307,36 @@ async def get_job(
         raise HTTPException(status_code=403, detail="Not authorized to view this job")
     return job
 
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Stops the job's running graph (in-flight LLM and HTTP calls are aborted) and
+    marks it cancelled, which frees its quota slot immediately.
+    """
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized to cancel this job")
+    if job.status in (JobStatus.completed, JobStatus.failed, JobStatus.cancelled):
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status.value}")
+
+    savings = await task_registry.cancel(job_id)
+    # A job paused at the compliance review has no running task; its approval must not be resumable
+    await asyncio.to_thread(approvals.expire_job, job_id)
+
+    job.status = JobStatus.cancelled
+    job.updated_at = datetime.utcnow()
+    job.tasks = [*(job.tasks or []), {"step": "cancel", "status": "completed", "was_running": savings is not None, **(savings or {})}]
+    session.add(job)
+    session.commit()
+
+    return {"job_id": job_id, "status": job.status, "was_running": savings is not None, "savings": savings}
+
 @app.post("/ingest")
 async def ingest_document(
     file: UploadFile = File(...), 
@@ -334,12 +390,25 @@ async def ingest_document(
         session.commit()
 
         # Index in Vector DB with job_id
+        text_content = await redaction.redact_for_ingest(text_content, file.filename)
         num_chunks = await asyncio.to_thread(add_document, text_content, source=file.filename, job_id=str(job.id))
         
+        job.tasks.append({"step": "index_document", "status": "completed", "chunks": num_chunks})
+
+        # Summarize large documents once so queries can use summary-first context
+        if summaries_enabled(text_content):
+            job.progress = 0.8
+            session.add(job)
+            session.commit()
+            try:
+                summary_result = await summarize_document(text_content, file.filename, job_id=str(job.id))
+                job.tasks.append({"step": "summarize", "status": "completed", **summary_result})
+            except Exception as summary_error:
+                job.tasks.append({"step": "summarize", "status": "failed", "error": str(summary_error)})
+
         # Update Job: Completed
         job.status = JobStatus.completed
         job.progress = 1.0
-        job.tasks.append({"step": "index_document", "status": "completed", "chunks": num_chunks})
         session.add(job)
         session.commit()
             
@@ -355,13 +424,20 @@ async def ingest_document(
         job.tasks.append({"step": "ingestion", "status": "failed", "error": str(e)})
         session.add(job)
         session.commit()
+        # Drop any chunks that were written before the failure
+        try:
+            await asyncio.to_thread(purge_job_vectors, job.id, "failed")
+        except Exception as purge_error:
+            print(f"[Maintenance] Could not purge vectors for job {job.id}: {purge_error}")
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
 # --- Include Routers ---
 from .routes.research import router as research_router
 from .routes.admin import router as admin_router
 from .routes.reports import router as reports_router
+from .routes.approvals import router as approvals_router
 
 app.include_router(research_router)
 app.include_router(admin_router)
 app.include_router(reports_router)
+app.include_router(approvals_router)
@@ -0,0 +1,115 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlmodel import Session, select
+from dotenv import load_dotenv
+
+from .database import engine
+from .models import Job, JobStatus, Report
+from .rag import delete_job_documents, compact_vector_store
+
+load_dotenv()
+
+# Ingestion-only jobs (uploaded but never researched) keep their vectors this long
+INGESTION_JOB_TTL_HOURS = float(os.getenv("INGESTION_JOB_TTL_HOURS", "72"))
+# How often the background sweep runs; 0 disables the loop
+VECTOR_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("VECTOR_MAINTENANCE_INTERVAL_SECONDS", "3600"))
+# Rebuild ANN indexes only after a bulk delete of at least this many rows
+VECTOR_REINDEX_MIN_ROWS = int(os.getenv("VECTOR_REINDEX_MIN_ROWS", "1000"))
+
+PURGE_STEP = "purge_vectors"
+
+
+def _already_purged(job: Job) -> bool:
+    return any(t.get("step") == PURGE_STEP for t in (job.tasks or []))
+
+
+def _mark_purged(session: Session, job: Job, reason: str, result: dict) -> None:
+    # Reassign so SQLAlchemy notices the JSON column changed
+    job.tasks = (job.tasks or []) + [{
+        "step": PURGE_STEP,
+        "status": "completed",
+        "reason": reason,
+        "rows": result.get("rows", 0),
+        "at": datetime.utcnow().isoformat(),
+    }]
+    job.updated_at = datetime.utcnow()
+    session.add(job)
+
+
+def purge_job_vectors(job_id: int, reason: str = "manual") -> dict:
+    """Deletes a single job's chunks and records the purge on the job."""
+    result = delete_job_documents(str(job_id))
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        if job:
+            _mark_purged(session, job, reason, result)
+            session.commit()
+    return result
+
+
+def find_expired_jobs(session: Session, ttl_hours: float) -> List[Job]:
+    """
+    Ingestion jobs whose vectors can be dropped:
+    - failed ones (partial ingestions are never queried), and
+    - ones older than the TTL that never produced a report.
+    Research and chat jobs keep their vectors; they are only purged explicitly.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+    finished = [JobStatus.completed, JobStatus.failed]
+
+    reported = select(Report.job_id).where(Report.job_id.is_not(None))
+    statement = (
+        select(Job)
+        .where(Job.type == "ingestion")
+        .where(Job.status.in_(finished))
+        .where(
+            (Job.status == JobStatus.failed)
+            | ((Job.updated_at < cutoff) & (Job.id.not_in(reported)))
+        )
+    )
+    return [job for job in session.exec(statement).all() if not _already_purged(job)]
+
+
+def run_vector_maintenance(ttl_hours: float = INGESTION_JOB_TTL_HOURS) -> dict:
+    """
+    One maintenance pass: delete expired jobs' chunks in bulk, then vacuum and
+    (after large deletes) rebuild ANN indexes. Returns reclaimed rows and bytes.
+    """
+    started = datetime.utcnow()
+    with Session(engine) as session:
+        jobs = find_expired_jobs(session, ttl_hours)
+        job_ids = [str(job.id) for job in jobs]
+        deleted = delete_job_documents(job_ids) if job_ids else {"rows": 0, "bytes": 0}
+
+        for job in jobs:
+            reason = "failed" if job.status == JobStatus.failed else "ttl_expired"
+            _mark_purged(session, job, reason, {"rows": None})
+        session.commit()
+
+    compaction = {}
+    if deleted["rows"]:
+        compaction = compact_vector_store(reindex=deleted["rows"] >= VECTOR_REINDEX_MIN_ROWS)
+
+    report = {
+        "jobs_purged": len(job_ids),
+        "rows_deleted": deleted["rows"],
+        "row_bytes_deleted": deleted["bytes"],
+        "bytes_reclaimed": compaction.get("bytes_reclaimed", 0),
+        "reindexed": compaction.get("reindexed", []),
+        "duration_seconds": (datetime.utcnow() - started).total_seconds(),
+    }
+    print(f"[Maintenance] Vector store pass: {report}")
+    return report
+
+
+async def vector_maintenance_loop(interval_seconds: float = VECTOR_MAINTENANCE_INTERVAL_SECONDS):
+    """Background task started from the app lifespan."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_vector_maintenance)
+        except Exception as e:
+            print(f"[Maintenance] Vector store pass failed: {e}")
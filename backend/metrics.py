@@ -0,0 +1,63 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Any
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry: counters, timing summaries and
+    gauges computed on read. Exposed through GET /admin/metrics.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Records a duration (seconds) or size sample."""
+        key = _key(name, labels)
+        with self._lock:
+            t = self._timings.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0})
+            t["count"] += 1
+            t["total"] += value
+            t["max"] = max(t["max"], value)
+
+    def average(self, name: str, **labels) -> float | None:
+        t = self._timings.get(_key(name, labels))
+        if not t or not t["count"]:
+            return None
+        return t["total"] / t["count"]
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        self._gauges[name] = fn
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                k: {**v, "avg": v["total"] / v["count"] if v["count"] else 0.0}
+                for k, v in self._timings.items()
+            }
+        gauges = {}
+        for name, fn in self._gauges.items():
+            try:
+                gauges[name] = fn()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        return {"counters": counters, "timings": timings, "gauges": gauges}
+
+
+metrics = Metrics()
@@ -8,6 +8,7 @@ class JobStatus(str, Enum):
     running = "running"
     completed = "completed"
     failed = "failed"
+    cancelled = "cancelled"
 
 class UserRole(str, Enum):
     USER = "USER"
@@ -49,6 +50,8 @@ class Job(SQLModel, table=True):
     user: Optional[User] = Relationship(back_populates="jobs")
     progress: float = Field(default=0.0)
     tasks: Optional[List[Dict[str, Any]]] = Field(default=None, sa_column=Column(JSON))
+    # Execution profile name (backend/profiles.py): "fast", "standard" or "thorough"
+    profile: str = Field(default="standard")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = Field(default=None)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -94,3 +97,56 @@ class Report(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     generated_at: Optional[datetime] = None
+
+class ParentChunk(SQLModel, table=True):
+    """Parent section for hierarchical chunking; its child chunks live in the vector store."""
+    __tablename__ = "parent_chunks"
+    id: str = Field(primary_key=True)
+    job_id: Optional[str] = Field(default=None, index=True)
+    source: str
+    content: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class JobDocument(SQLModel, table=True):
+    """Content hash of every document ingested for a job; together they form its corpus fingerprint."""
+    __tablename__ = "job_documents"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: Optional[str] = Field(default=None, index=True)
+    source: str
+    content_hash: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class ReportCacheEntry(SQLModel, table=True):
+    """A completed report, findable by query embedding within the same corpus fingerprint."""
+    __tablename__ = "report_cache"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    query: str
+    normalized_query: str
+    embedding: List[float] = Field(sa_column=Column(JSON))
+    corpus_fingerprint: str = Field(index=True)
+    profile: str = Field(default="standard")
+    report_id: int = Field(foreign_key="reports.id")
+    hits: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+class ApprovalStatus(str, Enum):
+    pending = "pending"
+    resuming = "resuming"
+    approved = "approved"
+    rejected = "rejected"
+    expired = "expired"
+
+class PendingApproval(SQLModel, table=True):
+    """A graph thread paused at a human-approval interrupt, so reviewers can find it without scanning checkpoints."""
+    __tablename__ = "pending_approvals"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    thread_id: str = Field(unique=True, index=True)
+    job_id: Optional[int] = Field(default=None, index=True)
+    kind: str = Field(default="compliance")
+    status: ApprovalStatus = Field(default=ApprovalStatus.pending, index=True)
+    # The interrupt payload (findings, policy reason)
+    payload: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    action: Optional[str] = None
+    error: Optional[str] = None
+    requested_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    resolved_at: Optional[datetime] = None
@@ -0,0 +1,262 @@
+import asyncio
+import ipaddress
+import os
+import re
+import socket
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from dotenv import load_dotenv
+
+from mcp_servers.research.providers import html_text, tokens
+
+from .metrics import metrics
+from .vectors import cosine_similarities
+
+load_dotenv()
+
+PAGE_FETCH_ENABLED = os.getenv("PAGE_FETCH_ENABLED", "true").lower() == "true"
+PAGE_FETCH_TIMEOUT = float(os.getenv("PAGE_FETCH_TIMEOUT", "8"))
+PAGE_FETCH_CONNECT_TIMEOUT = float(os.getenv("PAGE_FETCH_CONNECT_TIMEOUT", "3"))
+# Bytes read per page; longer pages are cut here (the main text is near the top)
+PAGE_FETCH_MAX_BYTES = int(os.getenv("PAGE_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+PAGE_FETCH_MAX_CONCURRENCY = int(os.getenv("PAGE_FETCH_MAX_CONCURRENCY", "8"))
+# Concurrent requests to one host, so a result list from one site is not a burst
+PAGE_FETCH_PER_HOST = int(os.getenv("PAGE_FETCH_PER_HOST", "2"))
+# Quotes kept per page, and the approximate length of each passage
+PAGE_FETCH_QUOTES = int(os.getenv("PAGE_FETCH_QUOTES", "3"))
+PAGE_FETCH_PASSAGE_CHARS = int(os.getenv("PAGE_FETCH_PASSAGE_CHARS", "600"))
+# Passages per page considered for quotes (term-overlap pre-ranked), bounding the
+# embedding batch to about PAGE_FETCH_MAX_PASSAGES x pages
+PAGE_FETCH_MAX_PASSAGES = int(os.getenv("PAGE_FETCH_MAX_PASSAGES", "8"))
+PAGE_FETCH_MAX_REDIRECTS = int(os.getenv("PAGE_FETCH_MAX_REDIRECTS", "5"))
+# Allow pages on loopback addresses (local test servers only); private and
+# link-local addresses are always refused
+PAGE_FETCH_ALLOW_LOOPBACK = os.getenv("PAGE_FETCH_ALLOW_LOOPBACK", "false").lower() == "true"
+PAGE_FETCH_USER_AGENT = os.getenv("PAGE_FETCH_USER_AGENT", "Mozilla/5.0 (compatible; ResearchAgent/1.0)")
+
+# Paragraphs shorter than this are menus, captions or bylines, not content
+MIN_PASSAGE_CHARS = 80
+_TEXT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_PARAGRAPHS = re.compile(r"\n\s*\n")
+
+Embed = Callable[[List[str]], List[List[float]]]
+
+_client: Optional[httpx.AsyncClient] = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+_limiter: Optional[asyncio.Semaphore] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Process-wide keep-alive client for page fetches."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            # Redirects are followed by fetch_page, which checks the address of every hop
+            follow_redirects=False,
+            timeout=httpx.Timeout(PAGE_FETCH_TIMEOUT, connect=PAGE_FETCH_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=PAGE_FETCH_MAX_CONCURRENCY * 2, max_keepalive_connections=PAGE_FETCH_MAX_CONCURRENCY),
+            headers={"User-Agent": PAGE_FETCH_USER_AGENT, "Accept": "text/html,text/plain;q=0.9"},
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Closes the shared client; called from the app lifespan on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _host_limit(host: str) -> asyncio.Semaphore:
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(PAGE_FETCH_PER_HOST)
+    return _host_limits[host]
+
+
+def _global_limit() -> asyncio.Semaphore:
+    global _limiter
+    if _limiter is None:
+        _limiter = asyncio.Semaphore(PAGE_FETCH_MAX_CONCURRENCY)
+    return _limiter
+
+
+def _address_allowed(address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if address.is_loopback:
+        return PAGE_FETCH_ALLOW_LOOPBACK
+    return address.is_global and not address.is_multicast
+
+
+async def _public_url(url: str) -> bool:
+    """
+    Whether every address the URL's host resolves to is public: search results
+    and their redirects must not reach loopback, private or link-local services
+    (e.g. the cloud metadata endpoint).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        return False
+    addresses = {ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos}
+    return bool(addresses) and all(_address_allowed(a) for a in addresses)
+
+
+async def fetch_page(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+    """
+    Main text of an HTML or plain-text page, or None when it cannot be fetched
+    in time, is not text, or leads to a non-public address. Redirects are
+    followed here, checking every hop. At most PAGE_FETCH_MAX_BYTES are read.
+    """
+    client = client or get_client()
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        async with _global_limit():
+            for _ in range(PAGE_FETCH_MAX_REDIRECTS + 1):
+                if not await _public_url(url):
+                    outcome = "blocked"
+                    return None
+                async with _host_limit(urlsplit(url).hostname), client.stream("GET", url, follow_redirects=False) as response:
+                    if response.is_redirect:
+                        url = urljoin(str(response.url), response.headers.get("location", ""))
+                        continue
+                    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                    if response.status_code >= 400:
+                        outcome = "http_error"
+                        return None
+                    if content_type and content_type not in _TEXT_TYPES:
+                        outcome = "unsupported"
+                        return None
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) >= PAGE_FETCH_MAX_BYTES:
+                            outcome = "truncated"
+                            del body[PAGE_FETCH_MAX_BYTES:]
+                            break
+                    metrics.incr("page_fetch_bytes", len(body))
+                    raw = body.decode(response.encoding or "utf-8", errors="replace")
+                    break
+            else:
+                outcome = "too_many_redirects"
+                return None
+        if content_type == "text/plain":
+            return raw
+        # Pure-Python parsing of up to PAGE_FETCH_MAX_BYTES; keep it off the event loop
+        return (await asyncio.to_thread(html_text, raw))[1]
+    except httpx.TimeoutException:
+        outcome = "timeout"
+        return None
+    except httpx.HTTPError:
+        outcome = "error"
+        return None
+    finally:
+        metrics.incr("page_fetches", outcome=outcome)
+        metrics.observe("page_fetch_seconds", time.perf_counter() - started)
+
+
+def source_text(result: Dict[str, Any]) -> str:
+    """
+    The evidence text of a web result: every fetched passage when its page was
+    read, otherwise the search snippet. Synthesis and citation verification
+    both use this, so claims are checked against what the writer saw.
+    """
+    if result.get("quotes"):
+        return " … ".join(result["quotes"])
+    return result.get("quote", "") or result.get("snippet", "") or result.get("body", "")
+
+
+def passages(text: str, size: int = PAGE_FETCH_PASSAGE_CHARS) -> List[str]:
+    """Consecutive paragraphs merged into passages of about `size` characters; boilerplate-length ones dropped."""
+    merged, current = [], ""
+    for paragraph in _PARAGRAPHS.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) > size:
+            merged.append(current)
+            current = ""
+        current = f"{current} {paragraph}".strip()
+    if current:
+        merged.append(current)
+    return [p[: size * 2] for p in merged if len(p) >= MIN_PASSAGE_CHARS]
+
+
+def _lexical_scores(query: str, candidates: Sequence[str]) -> List[float]:
+    wanted = set(tokens(query))
+    return [len(wanted & set(tokens(c))) / (len(wanted) or 1) for c in candidates]
+
+
+def candidate_passages(query: str, text: str, limit: Optional[int] = None) -> List[str]:
+    """A page's passages; long pages keep only the `limit` with the most query terms, in page order."""
+    limit = limit or PAGE_FETCH_MAX_PASSAGES
+    found = passages(text)
+    if len(found) <= limit:
+        return found
+    scores = _lexical_scores(query, found)
+    keep = sorted(sorted(range(len(found)), key=lambda i: (-scores[i], i))[:limit])
+    return [found[i] for i in keep]
+
+
+def best_quotes(query: str, candidates: List[str], embed: Optional[Embed] = None, k: int = PAGE_FETCH_QUOTES) -> List[str]:
+    """The k passages closest to the query (embedding cosine, or term overlap without an embedder), best first."""
+    if not candidates:
+        return []
+    if embed is not None:
+        vectors = embed([query] + candidates)
+        scores = list(cosine_similarities(vectors[0], vectors[1:]))
+    else:
+        scores = _lexical_scores(query, candidates)
+    ranked = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+    return [candidates[i] for i in ranked[:k]]
+
+
+async def enrich_results(
+    query: str,
+    results: List[Dict[str, Any]],
+    top_n: int,
+    embed: Optional[Embed] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetches the first top_n result pages concurrently and replaces each one's
+    search snippet with the page passages most relevant to the query ("quote"
+    is the best, "quotes" all of them). Results whose page cannot be fetched
+    keep their snippet.
+    """
+    if not PAGE_FETCH_ENABLED or top_n <= 0:
+        return results
+    started = time.perf_counter()
+    targets = [i for i, r in enumerate(results) if r.get("url") and not r.get("error")][:top_n]
+    pages = await asyncio.gather(*(fetch_page(results[i]["url"], client) for i in targets))
+
+    chunked = await asyncio.to_thread(
+        lambda: {i: candidate_passages(query, page) for i, page in zip(targets, pages) if page}
+    )
+    all_passages = [p for ps in chunked.values() for p in ps]
+    vectors: Dict[str, List[float]] = {}
+    if embed is not None and all_passages:
+        # One embedding batch for every page
+        embedded = await asyncio.to_thread(embed, [query] + all_passages)
+        vectors = dict(zip([query] + all_passages, embedded))
+
+    def cached(texts: List[str]) -> List[List[float]]:
+        return [vectors[t] for t in texts]
+
+    enriched = list(results)
+    for i, candidates in chunked.items():
+        quotes = best_quotes(query, candidates, cached if vectors else None)
+        if quotes:
+            enriched[i] = {**results[i], "snippet": results[i].get("quote"), "quote": quotes[0], "quotes": quotes, "fetched": True}
+    metrics.incr("page_fetch_enriched", len(chunked))
+    metrics.observe("page_enrich_seconds", time.perf_counter() - started)
+    return enriched
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional
+
+
+@dataclass(frozen=True)
+class ExecutionProfile:
+    """
+    Per-job execution tier. Selected at POST /jobs or /research/chat and carried
+    in the graph state; every node reads its knobs from here.
+
+    Latency budgets (end to end, excluding time waiting for compliance approval):
+    - fast:      ~15 s.  Interactive questions. gpt-4o-mini brief answer, 3 web
+                 results, deterministic routing, local citation check, no files.
+    - standard:  no deadline. Today's pipeline. Cascade/env-configured synthesis model,
+                 5 web results, LLM routing and LLM citation verification, PDF + DOCX.
+    - thorough:  ~300 s. Deep reports. 3 sub-queries x 8 web results, sectioned
+                 gpt-4o long-form report, LLM citation verification, PDF + DOCX.
+
+    Standard runs without a deadline: its measured synthesis and verification
+    latencies do not fit a fixed budget, and node shares that tight would push
+    it to brief/extractive fallbacks. Set JOB_DEADLINE_SECONDS to impose one.
+
+    Measure with benchmarks/bench_profiles.py.
+    """
+
+    name: str
+    description: str
+    # None = no deadline (unless JOB_DEADLINE_SECONDS is set)
+    latency_budget_seconds: Optional[float]
+    # None = use the env-configured cascade / synthesis model
+    synthesis_models: Optional[List[str]] = None
+    # None = use SYNTHESIS_MODE
+    synthesis_mode: Optional[str] = None
+    # "brief" | "standard" | "long"
+    report_length: str = "long"
+    # "llm" routes via the supervisor model; "deterministic" follows the fixed pipeline
+    router: str = "llm"
+    sub_queries: int = 1
+    web_results: int = 5
+    # Top web results whose pages are downloaded for fuller quotes (0 = snippets only)
+    fetch_pages: int = 3
+    rag_results: int = 5
+    llm_citation_check: bool = True
+    formats: List[str] = field(default_factory=lambda: ["docx", "pdf"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+DEFAULT_PROFILE = "standard"
+
+PROFILES: Dict[str, ExecutionProfile] = {
+    "fast": ExecutionProfile(
+        name="fast",
+        description="Quick interactive answer in seconds.",
+        latency_budget_seconds=15,
+        synthesis_models=["gpt-4o-mini"],
+        synthesis_mode="single",
+        report_length="brief",
+        router="deterministic",
+        sub_queries=1,
+        web_results=3,
+        fetch_pages=0,
+        rag_results=3,
+        llm_citation_check=False,
+        formats=[],
+    ),
+    "standard": ExecutionProfile(
+        name="standard",
+        description="Full research report with verification.",
+        latency_budget_seconds=None,
+    ),
+    "thorough": ExecutionProfile(
+        name="thorough",
+        description="Deep multi-query research with a long-form sectioned report.",
+        latency_budget_seconds=300,
+        synthesis_models=["gpt-4o"],
+        synthesis_mode="sectioned",
+        report_length="long",
+        sub_queries=3,
+        web_results=8,
+        fetch_pages=5,
+        rag_results=8,
+    ),
+}
+
+
+def get_profile(name: Optional[str]) -> ExecutionProfile:
+    """Profile by name; unknown or missing names fall back to the default tier."""
+    return PROFILES.get(name or DEFAULT_PROFILE, PROFILES[DEFAULT_PROFILE])
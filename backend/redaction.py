@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from mcp_servers.compliance.detector import Span, redact
+
+from .metrics import metrics
+
+load_dotenv()
+
+# Redact uploaded documents before they are chunked, summarized or embedded
+REDACT_ON_INGEST = os.getenv("REDACT_ON_INGEST", "false").lower() == "true"
+# Texts at least this long are split and redacted across the process pool
+REDACT_PARALLEL_MIN_CHARS = int(os.getenv("REDACT_PARALLEL_MIN_CHARS", "1000000"))
+REDACT_CHUNK_CHARS = int(os.getenv("REDACT_CHUNK_CHARS", "262144"))
+REDACT_WORKERS = int(os.getenv("REDACT_WORKERS", str(os.cpu_count() or 1)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned workers: forking a process with a running event loop, thread
+        # pools and open DB/HTTP connections copies their locks and sockets
+        _pool = ProcessPoolExecutor(max_workers=REDACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def split_chunks(text: str, size: int = REDACT_CHUNK_CHARS) -> List[Tuple[int, str]]:
+    """
+    (offset, chunk) pieces of about `size` characters, each ending right after a
+    newline. No entity spans a line break, so every chunk can be scanned on its
+    own. A single line longer than `size` stays whole.
+    """
+    chunks, start = [], 0
+    while start < len(text):
+        cut = text.find("\n", min(start + size, len(text)) - 1) + 1 or len(text)
+        chunks.append((start, text[start:cut]))
+        start = cut
+    return chunks
+
+
+def _stitch(parts: List[Tuple[int, Tuple[str, List[Span]]]]) -> Tuple[str, List[Span]]:
+    spans = [Span(s.start + offset, s.end + offset, s.type) for offset, (_, chunk_spans) in parts for s in chunk_spans]
+    return "".join(redacted for _, (redacted, _) in parts), spans
+
+
+def _record(text: str, spans: List[Span], started: float, chunks: int) -> None:
+    metrics.observe("redaction_seconds", time.perf_counter() - started, chunks=chunks > 1)
+    metrics.incr("redaction_chars", len(text))
+    for entity, count in Counter(s.type for s in spans).items():
+        metrics.incr("pii_entities", count, type=entity)
+
+
+async def redact_text(text: str) -> Tuple[str, List[Span]]:
+    """
+    Redacted text and the replaced spans (offsets in the original). Large texts
+    are scanned chunk by chunk across worker processes, so throughput scales
+    with cores instead of being bound to one thread.
+    """
+    global _pool
+    started = time.perf_counter()
+    chunks = split_chunks(text) if len(text) >= REDACT_PARALLEL_MIN_CHARS else [(0, text)]
+    if len(chunks) == 1:
+        result = await asyncio.to_thread(redact, text)
+    else:
+        loop = asyncio.get_running_loop()
+        try:
+            pool = _get_pool()
+            results = await asyncio.gather(*(loop.run_in_executor(pool, redact, chunk) for _, chunk in chunks))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); the pool is unusable, redact in-process
+            _pool = None
+            results = await asyncio.gather(*(asyncio.to_thread(redact, chunk) for _, chunk in chunks))
+        result = _stitch(list(zip((offset for offset, _ in chunks), results)))
+    _record(text, result[1], started, len(chunks))
+    return result
+
+
+def entity_counts(spans: List[Span]) -> Dict[str, int]:
+    return dict(Counter(s.type for s in spans))
+
+
+async def redact_for_ingest(text: str, source: str) -> str:
+    """The document text to index: redacted when REDACT_ON_INGEST is on, unchanged otherwise."""
+    if not REDACT_ON_INGEST:
+        return text
+    redacted, spans = await redact_text(text)
+    if spans:
+        print(f"[RAG] Redacted {len(spans)} PII entities from {source}: {entity_counts(spans)}")
+    metrics.incr("ingest_redactions")
+    return redacted
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
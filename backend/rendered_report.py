@@ -0,0 +1,167 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+from .blob_store import offload, load
+
+# Rendered reports kept per process, keyed by content hash
+RENDER_CACHE_ENTRIES = 128
+
+_cache: "OrderedDict[str, RenderedReport]" = OrderedDict()
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Block:
+    """
+    One addressable part of the rendered text: "summary", "section:<i>",
+    "table:<i>" or "references". Blocks are joined by a single newline.
+    [body_start, body_end) is the block's prose (summary or section content).
+    """
+
+    key: str
+    title: str
+    start: int
+    end: int
+    body_start: int
+    body_end: int
+
+
+def content_hash(report: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(report, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def _report_blocks(report: Dict[str, Any]) -> List[tuple]:
+    """(key, title, block text, body offset within block, body length) in document order."""
+    summary = report["summary"]
+    blocks = [("summary", "Summary", f"Summary\n=======\n\n{summary}\n\n", len("Summary\n=======\n\n"), len(summary))]
+
+    for i, sec in enumerate(report["sections"]):
+        heading = f"\n{sec['title']}\n{'-' * len(sec['title'])}\n"
+        blocks.append((f"section:{i}", sec["title"], f"{heading}{sec['content']}\n", len(heading), len(sec["content"])))
+
+    for i, t in enumerate(report.get("tables") or []):
+        lines = [f"\nTable: {t['title']}", " | ".join(t["headers"])] + [" | ".join(row) for row in t["rows"]]
+        text = "\n".join(lines)
+        blocks.append((f"table:{i}", t["title"], text, 0, len(text)))
+
+    if report.get("citations"):
+        lines = ["\nReferences\n=========="] + [f"[{c['id']}] {c['source']} — {c['url']}" for c in report["citations"]]
+        text = "\n".join(lines)
+        blocks.append(("references", "References", text, 0, len(text)))
+
+    return blocks
+
+
+class RenderedReport:
+    """
+    Canonical plain-text rendering of a structured report, computed once per
+    content hash, with the offsets of every block so later stages can verify,
+    redact or render individual sections without re-rendering the document.
+    """
+
+    def __init__(self, text: str, blocks: List[Block], digest: str) -> None:
+        self.text = text
+        self.blocks = blocks
+        self.content_hash = digest
+        self._by_key = {b.key: b for b in blocks}
+
+    @classmethod
+    def from_parts(cls, parts: List[tuple], digest: str) -> "RenderedReport":
+        blocks, offset = [], 0
+        for key, title, text, body_offset, body_len in parts:
+            blocks.append(Block(key, title, offset, offset + len(text), offset + body_offset, offset + body_offset + body_len))
+            offset += len(text) + 1
+        return cls("\n".join(p[2] for p in parts), blocks, digest)
+
+    # --- access ---
+
+    def block(self, key: str) -> Block:
+        return self._by_key[key]
+
+    def block_text(self, key: str) -> str:
+        b = self._by_key[key]
+        return self.text[b.start:b.end]
+
+    def body(self, key: str) -> str:
+        b = self._by_key[key]
+        return self.text[b.body_start:b.body_end]
+
+    def block_at(self, offset: int) -> Optional[Block]:
+        """Block containing a character offset of the rendered text (e.g. a claim's position)."""
+        for b in self.blocks:
+            if b.start <= offset < b.end:
+                return b
+        return None
+
+    def section_keys(self) -> List[str]:
+        return [b.key for b in self.blocks if b.key == "summary" or b.key.startswith("section:")]
+
+    # --- per-block transforms ---
+
+    def map_blocks(self, fn: Callable[[str, str], str]) -> "RenderedReport":
+        """
+        Applies fn(key, block_text) to every block and returns the re-stitched
+        rendering. Unchanged blocks are reused; only offsets after a change move.
+        Body offsets of a changed block cover the whole new block.
+        """
+        parts, changed = [], False
+        for b in self.blocks:
+            old = self.text[b.start:b.end]
+            new = fn(b.key, old)
+            if new == old:
+                parts.append((b.key, b.title, old, b.body_start - b.start, b.body_end - b.body_start))
+            else:
+                changed = True
+                parts.append((b.key, b.title, new, 0, len(new)))
+        if not changed:
+            return self
+        rendered = RenderedReport.from_parts(parts, "")
+        rendered.content_hash = hashlib.sha256(rendered.text.encode("utf-8")).hexdigest()
+        return rendered
+
+    # --- serialization (graph state) ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"content_hash": self.content_hash, "text": self.text, "blocks": [asdict(b) for b in self.blocks]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RenderedReport":
+        return cls(data["text"], [Block(**b) for b in data["blocks"]], data["content_hash"])
+
+
+def render_report(report: Dict[str, Any]) -> RenderedReport:
+    """Cached rendering; any change to the report dict changes its hash and re-renders."""
+    digest = content_hash(report)
+    with _lock:
+        cached = _cache.get(digest)
+        if cached is not None:
+            _cache.move_to_end(digest)
+            return cached
+    rendered = RenderedReport.from_parts(_report_blocks(report), digest)
+    with _lock:
+        _cache[digest] = rendered
+        while len(_cache) > RENDER_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return rendered
+
+
+# --- graph state helpers ---
+
+def draft_artifacts(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Artifacts for a new draft: the report and its rendering, stored together."""
+    return {"draft_answer": offload(report), "draft_rendered": offload(render_report(report).to_dict())}
+
+
+def load_rendered(artifacts: Dict[str, Any], key: str = "draft_rendered") -> Optional[RenderedReport]:
+    """The rendering carried in state, or a (cached) render of the draft for older checkpoints."""
+    data = load(artifacts.get(key))
+    if data:
+        return RenderedReport.from_dict(data)
+    draft = load(artifacts.get("draft_answer"))
+    if key == "draft_rendered" and isinstance(draft, dict):
+        return render_report(draft)
+    return None
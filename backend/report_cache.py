@@ -0,0 +1,160 @@
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from sqlmodel import Session, select
+
+from .database import engine
+from .metrics import metrics
+from .models import Report, ReportStatus, ReportCacheEntry, Job
+from .profiles import PROFILES, get_profile
+from .rag import embeddings, corpus_fingerprint
+from .vectors import cosine_similarities
+
+load_dotenv()
+
+REPORT_CACHE_ENABLED = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+# Minimum cosine similarity between normalized query embeddings for a hit
+REPORT_CACHE_SIMILARITY = float(os.getenv("REPORT_CACHE_SIMILARITY", "0.92"))
+# Reports older than this are treated as stale and never served
+REPORT_CACHE_TTL_HOURS = float(os.getenv("REPORT_CACHE_TTL_HOURS", "24"))
+# Most recent entries per corpus compared against a new query
+REPORT_CACHE_MAX_CANDIDATES = 500
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and whitespace do not change the question."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def _eligible_profiles(profile: Optional[str]) -> list[str]:
+    """A report produced by the requested tier or a more thorough one can be reused."""
+    order = list(PROFILES)
+    return order[order.index(get_profile(profile).name):]
+
+
+def lookup(query: str, job_id: Optional[int], profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Finds a fresh completed report for a near-identical query over the same corpus.
+    Returns {"report", "similarity", "age_seconds", "entry_id"} or None.
+    """
+    if not REPORT_CACHE_ENABLED:
+        return None
+
+    started = time.perf_counter()
+    normalized = normalize_query(query)
+    fingerprint = corpus_fingerprint(job_id)
+    cutoff = datetime.utcnow() - timedelta(hours=REPORT_CACHE_TTL_HOURS)
+
+    with Session(engine) as session:
+        entries = session.exec(
+            select(ReportCacheEntry)
+            .where(ReportCacheEntry.corpus_fingerprint == fingerprint)
+            .where(ReportCacheEntry.created_at >= cutoff)
+            .where(ReportCacheEntry.profile.in_(_eligible_profiles(profile)))
+            .order_by(ReportCacheEntry.created_at.desc())
+            .limit(REPORT_CACHE_MAX_CANDIDATES)
+        ).all()
+
+        best, similarity = None, 0.0
+        exact = [e for e in entries if e.normalized_query == normalized]
+        if exact:
+            best, similarity = exact[0], 1.0
+        elif entries:
+            scores = cosine_similarities(embeddings.embed_query(normalized), [e.embedding for e in entries])
+            index = int(scores.argmax())
+            best, similarity = entries[index], float(scores[index])
+
+        report = session.get(Report, best.report_id) if best else None
+        if not report or similarity < REPORT_CACHE_SIMILARITY or report.status != ReportStatus.completed:
+            metrics.incr("report_cache_misses")
+            return None
+
+        best.hits += 1
+        session.add(best)
+        session.commit()
+        session.refresh(report)
+        session.expunge(report)
+
+    metrics.incr("report_cache_hits")
+    metrics.observe("report_cache_lookup_seconds", time.perf_counter() - started)
+    return {
+        "report": report,
+        "similarity": similarity,
+        "age_seconds": (datetime.utcnow() - best.created_at).total_seconds(),
+        "entry_id": best.id,
+    }
+
+
+def store(query: str, job_id: Optional[int], profile: Optional[str], report_id: int) -> None:
+    """Makes a completed report available to later near-identical queries."""
+    if not REPORT_CACHE_ENABLED:
+        return
+    normalized = normalize_query(query)
+    entry = ReportCacheEntry(
+        query=query,
+        normalized_query=normalized,
+        embedding=embeddings.embed_query(normalized),
+        corpus_fingerprint=corpus_fingerprint(job_id),
+        profile=get_profile(profile).name,
+        report_id=report_id,
+    )
+    with Session(engine) as session:
+        session.add(entry)
+        session.commit()
+
+
+def copy_report_files(paths: Dict[str, str], job_id: int) -> Dict[str, str]:
+    """
+    The cached report's files copied to report_{job_id}.<format> next to the
+    originals, so downloads by the attaching job's id find them. Formats whose
+    file is gone are left out.
+    """
+    copies = {}
+    for fmt, path in (paths or {}).items():
+        if not path or not os.path.exists(path):
+            continue
+        target = os.path.join(os.path.dirname(path), f"report_{job_id}.{fmt}")
+        if os.path.abspath(target) != os.path.abspath(path):
+            shutil.copyfile(path, target)
+        copies[fmt] = target
+    return copies
+
+
+def attach_to_job(hit: Dict[str, Any], job_id: int) -> Optional[Report]:
+    """
+    Copies a cached report, and its exported files, onto the requesting job so
+    it shows up in its report list and downloads under its id.
+    """
+    source: Report = hit["report"]
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        if not job:
+            return None
+        report_paths = copy_report_files((source.report_metadata or {}).get("report_paths", {}), job_id)
+        report = Report(
+            job_id=job_id,
+            user_id=job.user_id,
+            title=f"Report: {job.name}",
+            type=source.type,
+            status=ReportStatus.completed,
+            content=source.content,
+            file_url=report_paths.get("pdf", report_paths.get("docx", "")),
+            generated_at=datetime.utcnow(),
+            report_metadata={
+                **(source.report_metadata or {}),
+                "report_paths": report_paths,
+                "cached_from_report_id": source.id,
+                "cache_similarity": hit["similarity"],
+            },
+        )
+        session.add(report)
+        session.commit()
+        session.refresh(report)
+        return report
@@ -4,6 +4,9 @@ from typing import List, Dict, Any
 from ..database import get_session
 from ..models import User, Job, JobStatus, UserRole, ToolState
 from ..auth import get_current_user
+from ..maintenance import purge_job_vectors, run_vector_maintenance
+from ..metrics import metrics
+import asyncio
 from mcp_servers.ingestion.server import read_pdf, read_docx
 from mcp_servers.research.server import web_search
 from mcp_servers.compliance.server import redact_pii
@@ -125,3 +128,47 @@ async def get_tools_status(
         })
         
     return result
+
+@router.delete("/jobs/{job_id}/vectors")
+async def delete_job_vectors(
+    job_id: int,
+    session: Session = Depends(get_session),
+    admin: User = Depends(get_current_admin_user)
+):
+    """
+    Delete all vector store chunks ingested for a job.
+    """
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    try:
+        result = await asyncio.to_thread(purge_job_vectors, job_id, "admin")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Vector deletion failed: {str(e)}")
+    return {"job_id": job_id, "rows_deleted": result["rows"], "bytes_deleted": result["bytes"]}
+
+@router.post("/vector-store/maintenance")
+async def vector_store_maintenance(
+    ttl_hours: float | None = None,
+    admin: User = Depends(get_current_admin_user)
+):
+    """
+    Run a vector store maintenance pass now: expire old ingestion-only jobs,
+    drop vectors of failed jobs and compact the collection.
+    """
+    try:
+        if ttl_hours is None:
+            return await asyncio.to_thread(run_vector_maintenance)
+        return await asyncio.to_thread(run_vector_maintenance, ttl_hours)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Maintenance failed: {str(e)}")
+
+@router.get("/metrics")
+async def get_metrics(
+    admin: User = Depends(get_current_admin_user)
+):
+    """
+    In-process performance metrics (cache hit rates, timings, pool usage).
+    """
+    return metrics.snapshot()
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+import asyncio
+
+from ..auth import get_current_user
+from ..models import ApprovalStatus, User
+from ..graph import graph
+from .. import approvals
+
+router = APIRouter(prefix="/approvals", tags=["Approvals"])
+
+
+class BulkDecision(BaseModel):
+    action: Literal["approve", "reject"]
+    # Threads to decide; omit to decide every pending approval you can see (oldest first)
+    thread_ids: Optional[List[str]] = None
+
+
+def _scope(user: User) -> Optional[int]:
+    """Admins review every job; other users only their own."""
+    return None if user.role == "ADMIN" else user.id
+
+
+@router.get("")
+async def list_approvals(
+    status: ApprovalStatus = ApprovalStatus.pending,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Threads waiting at (or past) a human-approval interrupt, oldest first, with
+    the findings that triggered the review.
+    """
+    return await asyncio.to_thread(approvals.list_approvals, _scope(current_user), status, offset, limit)
+
+
+@router.post("/bulk", status_code=202)
+async def bulk_decide(
+    decision: BulkDecision,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Approves or rejects many interrupted threads in one call. The threads are
+    claimed right away and returned as "accepted"; each resume runs the rest of
+    its graph, so they continue in the background (APPROVAL_RESUME_CONCURRENCY at
+    a time). Outcomes land on the approvals: GET /approvals?status=approved,
+    rejected or expired; failed resumes go back to pending for a retry.
+    """
+    scope = _scope(current_user)
+    if decision.thread_ids is None:
+        thread_ids = await asyncio.to_thread(approvals.pending_threads, scope)
+    else:
+        if len(decision.thread_ids) > approvals.APPROVAL_BULK_MAX:
+            raise HTTPException(status_code=400, detail=f"At most {approvals.APPROVAL_BULK_MAX} threads per request")
+        thread_ids = await asyncio.to_thread(approvals.visible_threads, decision.thread_ids, scope)
+        if len(thread_ids) < len(set(decision.thread_ids)):
+            raise HTTPException(status_code=404, detail="Some approvals were not found")
+
+    claimed = await asyncio.to_thread(approvals.claim_many, thread_ids)
+    background_tasks.add_task(approvals.resume_many, graph, claimed, decision.action, claimed=True)
+    accepted = set(claimed)
+    return {
+        "action": decision.action,
+        "accepted": claimed,
+        "not_pending": [t for t in dict.fromkeys(thread_ids) if t not in accepted],
+    }
@@ -5,6 +5,9 @@ from ..database import get_session
 from ..models import Report, User, Job, ReportStatus
 from ..auth import get_current_user
 from ..agent import ResearchAgent
+from ..rendered_report import render_report
+from ..profiles import get_profile
+from ..section_verification import reverify, report_text, report_sources
 import os
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
@@ -131,7 +134,33 @@ async def update_report(
     if "content" in report_update:
         # Create a new report version instead of overwriting
         new_version = report.version + 1
-        
+
+        # Re-check only the sections the edit changed; the rest keep their verdicts
+        metadata = dict(report.report_metadata or {})
+        content = report_update["content"]
+        citation_agent = agent_runner.orchestrator.citation_agent
+        use_llm = get_profile(report.job.profile).llm_citation_check
+
+        async def verify(text, sources):
+            return await citation_agent.verify(text, sources, use_llm=use_llm)
+
+        try:
+            verification = await reverify(
+                report_text(content, lambda c: render_report(c).text),
+                report_sources(content) or report_sources(report.content),
+                metadata.get("verification_sections"),
+                verify,
+            )
+            metadata.update({
+                "verification_score": verification["score"],
+                "verification_sections": verification["sections"],
+                "verification_issues": verification["issues"],
+                "reverified_sections": verification["reverified_sections"],
+            })
+        except Exception as e:
+            print(f"Re-verification of edited report failed: {e}")
+            metadata.update({"verification_score": None, "verification_sections": None})
+
         new_report = Report(
             job_id=report.job_id,
             user_id=report.user_id,
@@ -141,7 +170,7 @@ async def update_report(
             version=new_version,
             status=ReportStatus.completed, # Assuming edited report is 'completed' (or maybe 'pending' if it needs regen?)
             # file_url is reset as content changed, needs regeneration
-            report_metadata=report.report_metadata # Copy metadata? Or reset? Maybe keep verification scores but mark as stale?
+            report_metadata=metadata
         )
         
         db.add(new_report)
@@ -183,9 +212,9 @@ async def chat_report(
         # Format report content for context
         context = ""
         if isinstance(report.content, dict):
-            # Use the synthesis agent's formatter if available, or simple string conversion
+            # Stored text if the report has it, else the cached canonical rendering
             try:
-                context = agent_runner.orchestrator.synthesis_agent.format_report(report.content)
+                context = report.content.get("full_text") or render_report(report.content).text
             except:
                 context = str(report.content)
         else:
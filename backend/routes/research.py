@@ -1,15 +1,21 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlmodel import Session, select
-from ..database import get_session
+from ..database import engine, get_session
 from ..models import Job, JobStatus, User
 from ..agent import ResearchAgent
 from ..agents.ingestion_agent import IngestionRetrievalAgent
 from ..agents.synthesis_agent import SynthesisReportAgent
+from ..maintenance import purge_job_vectors
+from .. import approvals
+from ..profiles import PROFILES
+from ..blob_store import load
+from ..rendered_report import load_rendered
+import asyncio
+import json
 import shutil
 import os
 import uuid
-from langgraph.types import Command
 from datetime import datetime
 
 router = APIRouter(prefix="/research", tags=["Research"])
@@ -73,6 +79,11 @@ async def upload_document(
         job.status = JobStatus.failed
         db.add(job)
         db.commit()
+        # Drop any chunks that were written before the failure
+        try:
+            await asyncio.to_thread(purge_job_vectors, job.id, "failed")
+        except Exception as purge_error:
+            print(f"[Maintenance] Could not purge vectors for job {job.id}: {purge_error}")
         raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
 
     return {
@@ -82,16 +93,35 @@ async def upload_document(
         "chunks": chunks
     }
 
+def _resolve_profile(job: Job, profile: str | None) -> str:
+    """Request override, else the profile chosen when the job was created."""
+    if profile and profile not in PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown profile '{profile}'. Choose one of: {', '.join(PROFILES)}")
+    return profile or job.profile
+
+@router.get("/profiles")
+async def list_profiles():
+    """Execution profiles with their settings and latency budgets."""
+    return [p.to_dict() for p in PROFILES.values()]
+
 @router.post("/chat")
 async def chat_qa(
     job_id: int = Form(...),
     query: str = Form(...),
+    profile: str | None = Form(None),
+    use_cache: bool = Form(True),
+    delta: bool = Form(True),
     db: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Run the agent for a specific Job ID and Query.
     Ensures the job belongs to the authenticated user.
+    `profile` ("fast", "standard", "thorough") overrides the job's execution profile.
+    A near-identical earlier question over the same documents returns the cached
+    report ("cached" in the result); send use_cache=false to force a fresh run.
+    Follow-ups on a job with a finished report reuse its evidence and patch only
+    the affected sections ("delta" in the result); send delta=false for a full run.
     """
     job = db.get(Job, job_id)
     if not job:
@@ -99,6 +129,8 @@ async def chat_qa(
         
     if job.user_id != current_user.id and current_user.role != "ADMIN":
         raise HTTPException(status_code=403, detail="Not authorized to access this job")
+
+    profile = _resolve_profile(job, profile)
         
     job.status = JobStatus.running
     db.add(job)
@@ -106,8 +138,11 @@ async def chat_qa(
     
     try:
         # Run agent with job_id as thread_id and pass job_id explicitly
-        # Run agent with job_id as thread_id and pass job_id explicitly
-        result = await agent_runner.run(query, thread_id=str(job_id), job_id=job_id)
+        result = await agent_runner.run(query, thread_id=str(job_id), job_id=job_id, profile=profile, use_cache=use_cache, delta=delta)
+
+        # POST /jobs/{id}/cancel already marked the job cancelled
+        if result.get("cancelled"):
+            return {"job_id": job_id, "query": query, "profile": profile, "cancelled": True, "answer": result["answer"]}
         
         # Update job with result (optional, or just return it)
         # We could store the chat history or result in job.tasks
@@ -119,6 +154,9 @@ async def chat_qa(
         return {
             "job_id": job_id,
             "query": query,
+            "profile": profile,
+            "cached": result.get("cached"),
+            "delta": result.get("delta"),
             "answer": result.get("answer", "No answer generated"),
             "full_result": result
         }
@@ -129,6 +167,58 @@ async def chat_qa(
         db.commit()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def chat_qa_stream(
+    job_id: int = Form(...),
+    query: str = Form(...),
+    profile: str | None = Form(None),
+    use_cache: bool = Form(True),
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Like /research/chat, but streams newline-delimited JSON events: each report
+    section, table and citation as soon as it is finished, then a final "done"
+    event ("error" if the run fails, "cancelled" if the job is cancelled).
+    """
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not authorized to access this job")
+
+    profile = _resolve_profile(job, profile)
+
+    job.status = JobStatus.running
+    db.add(job)
+    db.commit()
+
+    def finish(status: JobStatus) -> None:
+        # The request's session is closed once streaming starts; use a fresh one
+        with Session(engine) as session:
+            current = session.get(Job, job_id)
+            # POST /jobs/{id}/cancel already marked the job cancelled
+            if current and current.status != JobStatus.cancelled:
+                current.status = status
+                session.add(current)
+                session.commit()
+
+    async def events():
+        status = JobStatus.failed
+        try:
+            async for event in agent_runner.orchestrator.stream_research_flow(query, job_id=job_id, profile=profile, use_cache=use_cache):
+                if event.get("event") == "done":
+                    status = JobStatus.completed
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            # The response has started; report the failure in-band instead of cutting the stream
+            yield json.dumps({"event": "error", "job_id": job_id, "detail": str(e)}) + "\n"
+        finally:
+            finish(status)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @router.post("/generate_report")
 async def generate_report_route(
     job_id: int = Form(...),
@@ -152,10 +242,12 @@ async def generate_report_route(
         if not state or not state.values:
              raise HTTPException(status_code=400, detail="No research data found for this job. Run chat first.")
              
-        final_answer = state.values.get("artifacts", {}).get("final_answer")
+        artifacts = state.values.get("artifacts", {})
+        final_answer = load(artifacts.get("final_answer"))
         if not final_answer:
-             # Fallback to draft answer
-             final_answer = state.values.get("artifacts", {}).get("draft_answer")
+             # Fallback to the draft, rendered once at synthesis
+             rendered = load_rendered(artifacts)
+             final_answer = rendered.text if rendered else load(artifacts.get("draft_answer"))
              
         if not final_answer:
             raise HTTPException(status_code=400, detail="No answer available to generate report.")
@@ -167,7 +259,7 @@ async def generate_report_route(
         from ..models import Report
         report = Report(
             job_id=job_id,
-            content=str(final_answer) if isinstance(final_answer, str) else synthesis_agent.format_report(final_answer),
+            content=str(final_answer),
             file_path=paths["pdf"] # Storing PDF path as primary
         )
         db.add(report)
@@ -198,17 +290,17 @@ async def download_report(job_id: int, file_type: str):
 @router.post("/resume")
 async def resume_interrupt(thread_id: str, action: str):
     """
-    Resume graph execution after an interrupt.
+    Resume graph execution after an interrupt. Goes through the approvals index
+    claim, so a thread is never resumed twice (e.g. here and via /approvals/bulk).
     """
-    resume_command = Command(resume={"action": action})
-    try:
-        result = await agent_runner.graph.ainvoke(
-            resume_command,
-            config={"configurable": {"thread_id": thread_id}},
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    outcome = await approvals.resume(agent_runner.graph, thread_id, action)
+    if outcome["status"] == "not_pending":
+        raise HTTPException(status_code=409, detail="No pending approval for this thread.")
+    if outcome["status"] == "expired":
+        raise HTTPException(status_code=404, detail="No interrupted run for this thread.")
+    if outcome["status"] == "failed":
+        raise HTTPException(status_code=400, detail=outcome["error"])
+    return outcome
 @router.get("/trace/{job_id}")
 async def get_orchestration_trace(job_id: str):
     """
@@ -0,0 +1,240 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .metrics import metrics
+
+load_dotenv()
+
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "search_cache.sqlite")
+# Results younger than this are served without contacting the search provider
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+# Past the TTL, results this much older are still served while a background
+# search refreshes them (stale-while-revalidate); 0 disables
+SEARCH_CACHE_STALE_SECONDS = float(os.getenv("SEARCH_CACHE_STALE_SECONDS", "86400"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+Fetch = Callable[[str, int], List[Dict[str, Any]]]
+
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and whitespace do not change a search."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def _failed(results: List[Dict[str, Any]]) -> bool:
+    """web_search reports provider errors as a single {"error": ...} item; those are never cached."""
+    return any("error" in item for item in results)
+
+
+class SearchResultStore:
+    """
+    SQLite store of web search results keyed by provider and normalized query. A lookup is
+    served from an entry fetched with at least as many results as requested.
+    Entries past TTL + stale window are deleted; the least recently used rows
+    are evicted beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str = SEARCH_CACHE_PATH,
+        ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+        stale_seconds: float = SEARCH_CACHE_STALE_SECONDS,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, namespace: str = "") -> str:
+        return hashlib.sha256(f"{namespace}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def lookup(self, query: str, max_results: int, namespace: str = "") -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        """Returns (results, status) where status is fresh/stale/miss."""
+        now = time.time()
+        key = self.make_key(query, namespace)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, max_results, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < max_results:
+            return None, "miss"
+
+        age = now - row[2]
+        if age > self.ttl_seconds + self.stale_seconds:
+            self._delete(key)
+            return None, "miss"
+
+        with self._lock:
+            self._conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])[:max_results], "fresh" if age <= self.ttl_seconds else "stale"
+
+    def update(self, query: str, max_results: int, results: List[Dict[str, Any]], namespace: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, max_results, results, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(query, namespace), query, max_results, json.dumps(results), now, now),
+            )
+            self._conn.commit()
+        self._evict()
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds - self.stale_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (cutoff,))
+            count = self._conn.execute("SELECT count(*) FROM search_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+
+_store: Optional[SearchResultStore] = None
+_store_lock = threading.Lock()
+# Upstream searches in flight by key: concurrent misses and refreshes share one call
+_inflight: Dict[str, asyncio.Task] = {}
+# Lookups by status since start, for the hit-rate gauge
+_totals: Counter = Counter()
+# Cache statuses of the searches made inside track()
+_tracked: contextvars.ContextVar[Optional[Counter]] = contextvars.ContextVar("search_cache_tracked", default=None)
+
+
+def get_store() -> SearchResultStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SearchResultStore()
+    return _store
+
+
+@contextmanager
+def track() -> Iterator[Counter]:
+    """Counts the cache status (fresh/stale/miss/off) of every search made inside the block."""
+    counts: Counter = Counter()
+    token = _tracked.set(counts)
+    try:
+        yield counts
+    finally:
+        _tracked.reset(token)
+
+
+def _record(status: str) -> None:
+    metrics.incr("web_search_cache", status=status)
+    _totals[status] += 1
+    counts = _tracked.get()
+    if counts is not None:
+        counts[status] += 1
+
+
+async def _fetch(store: SearchResultStore, fetch: Fetch, query: str, max_results: int, namespace: str) -> List[Dict[str, Any]]:
+    started = time.perf_counter()
+    results = await asyncio.to_thread(fetch, query, max_results)
+    metrics.observe("web_search_upstream_seconds", time.perf_counter() - started)
+    if _failed(results):
+        metrics.incr("web_search_upstream_errors")
+    else:
+        await asyncio.to_thread(store.update, query, max_results, results, namespace)
+    return results
+
+
+def _shared_fetch(store: SearchResultStore, fetch: Fetch, query: str, max_results: int, namespace: str) -> asyncio.Task:
+    key = f"{store.make_key(query, namespace)}:{max_results}"
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch(store, fetch, query, max_results, namespace))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+
+def _saved(status: str) -> None:
+    """Counts the upstream time a cache hit avoided, at the average upstream latency so far."""
+    average = metrics.average("web_search_upstream_seconds")
+    if average:
+        metrics.incr("web_search_seconds_saved", average, status=status)
+
+
+async def cached_search(
+    fetch: Fetch, query: str, max_results: int = 5, namespace: str = ""
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Results of fetch(query, max_results) and how they were served: "fresh" from
+    the cache, "stale" from the cache while a background search refreshes it,
+    "miss" from the provider, or "off" with the cache disabled. Entries are kept
+    apart per namespace (the search provider), so switching providers never
+    serves another provider's results.
+    """
+    if not SEARCH_CACHE_ENABLED:
+        _record("off")
+        return await asyncio.to_thread(fetch, query, max_results), "off"
+
+    store = get_store()
+    results, status = await asyncio.to_thread(store.lookup, query, max_results, namespace)
+    if status == "stale":
+        _shared_fetch(store, fetch, query, max_results, namespace)
+    if results is None:
+        # shield: a cancelled caller does not abort a search others may be waiting on
+        results = await asyncio.shield(_shared_fetch(store, fetch, query, max_results, namespace))
+    else:
+        _saved(status)
+    _record(status)
+    return results, status
+
+
+def hit_rate() -> Optional[float]:
+    hits = _totals["fresh"] + _totals["stale"]
+    total = hits + _totals["miss"]
+    return hits / total if total else None
+
+
+metrics.register_gauge("web_search_cache_hit_rate", hit_rate)
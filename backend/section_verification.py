@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .metrics import metrics
+
+# A heading line underlined with - or = of the same length, as written by the report renderer
+_HEADING = re.compile(r"^(?P<title>[^\n]+)\n(?P<rule>-+|=+)$", re.M)
+REFERENCES_TITLE = "References"
+
+Verify = Callable[[str, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+def split_sections(text: str) -> List[Tuple[str, int, str]]:
+    """(title, offset, text) for each section of a rendered report; the references list is left out."""
+    starts = [m for m in _HEADING.finditer(text) if len(m.group("rule")) == len(m.group("title"))]
+    bounds = [(m.group("title"), m.start()) for m in starts]
+    if not bounds or bounds[0][1] > 0:
+        bounds.insert(0, ("", 0))
+    sections = []
+    for i, (title, start) in enumerate(bounds):
+        end = bounds[i + 1][1] if i + 1 < len(bounds) else len(text)
+        if title != REFERENCES_TITLE and text[start:end].strip():
+            sections.append((title, start, text[start:end]))
+    return sections
+
+
+def section_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def section_verdicts(text: str, result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-section verdicts of a verification result, keyed by section content hash,
+    using each claim's offset in the verified text.
+    """
+    sections = split_sections(text)
+    verdicts = {
+        section_hash(body): {"title": title, "supported_claims": 0, "total_claims": 0, "issues": []}
+        for title, _, body in sections
+    }
+    for claim in result.get("claims", []):
+        for title, start, body in sections:
+            if start <= claim["offset"] < start + len(body):
+                verdict = verdicts[section_hash(body)]
+                verdict["total_claims"] += 1
+                if claim["status"] == "supported":
+                    verdict["supported_claims"] += 1
+                else:
+                    verdict["issues"].append(f"{claim['reason'] or claim['status']} Claim: \"{claim['claim'][:120]}\"")
+                break
+    return verdicts
+
+
+def report_text(content: Any, render: Callable[[Dict[str, Any]], str]) -> str:
+    """Plain text of stored report content: structured reports are rendered, text reports used as is."""
+    if isinstance(content, dict):
+        if content.get("full_text"):
+            return content["full_text"]
+        if "sections" in content:
+            return render(content)
+    return str(content or "")
+
+
+def report_sources(content: Any) -> List[Dict[str, Any]]:
+    """Sources stored with a report (structured citations or raw web results) in the verifier's shape."""
+    citations = content.get("citations") if isinstance(content, dict) else None
+    return [
+        {
+            "id": str(c.get("id", i + 1)),
+            "title": c.get("title") or c.get("source", ""),
+            # Raw web results of fetched pages carry all their passages, as the citation node verifies them
+            "text": " … ".join(c["quotes"]) if c.get("quotes") else c.get("quote") or c.get("text", ""),
+            "url": c.get("url", ""),
+        }
+        for i, c in enumerate(citations or []) if isinstance(c, dict)
+    ]
+
+
+async def reverify(
+    text: str,
+    sources: List[Dict[str, Any]],
+    previous: Optional[Dict[str, Dict[str, Any]]],
+    verify: Verify,
+) -> Dict[str, Any]:
+    """
+    Verification of an edited report: sections whose hash matches a previous
+    verdict reuse it, only changed sections are verified (concurrently).
+    """
+    started = time.perf_counter()
+    previous = previous or {}
+    sections = split_sections(text)
+    changed = {section_hash(body): (title, body) for title, _, body in sections if section_hash(body) not in previous}
+
+    async def verify_section(title: str, body: str) -> Dict[str, Any]:
+        result = await verify(body, sources)
+        if "claims" in result:
+            return section_verdicts(body, result)[section_hash(body)]
+        # Verifier without per-claim detail (local marker check): its totals cover the section
+        return {
+            "title": title,
+            "supported_claims": result.get("supported_claims", 0),
+            "total_claims": result.get("total_claims", 0),
+            "issues": result.get("issues", []),
+        }
+
+    fresh = await asyncio.gather(*(verify_section(title, body) for title, body in changed.values()))
+    verdicts = dict(zip(changed, fresh))
+    for _, _, body in sections:
+        digest = section_hash(body)
+        if digest in previous:
+            verdicts[digest] = previous[digest]
+
+    supported = sum(v["supported_claims"] for v in verdicts.values())
+    total = sum(v["total_claims"] for v in verdicts.values())
+    metrics.incr("reverify_sections_reused", len(sections) - len(changed))
+    metrics.incr("reverify_sections_checked", len(changed))
+    metrics.observe("reverify_seconds", time.perf_counter() - started)
+    return {
+        "score": supported / total if total else 1.0,
+        "is_valid": supported == total,
+        "supported_claims": supported,
+        "total_claims": total,
+        "issues": [issue for v in verdicts.values() for issue in v["issues"]],
+        "summary": f"Incremental verification: {len(changed)} of {len(sections)} sections re-checked.",
+        "sections": verdicts,
+        "reverified_sections": [title for title, _ in changed.values()],
+    }
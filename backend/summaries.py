@@ -0,0 +1,75 @@
+import asyncio
+import os
+from typing import Dict, Any, List
+from dotenv import load_dotenv
+from langchain_core.prompts import ChatPromptTemplate
+
+from .chunking import summary_splitter
+from .rag import add_summaries
+from .llm_factory import get_chat_model
+
+load_dotenv()
+
+# Only uploads at least this large get ingest-time summaries
+INGEST_SUMMARY_MIN_CHARS = int(os.getenv("INGEST_SUMMARY_MIN_CHARS", "20000"))
+# Max concurrent section-summary calls per document
+INGEST_SUMMARY_CONCURRENCY = int(os.getenv("INGEST_SUMMARY_CONCURRENCY", "4"))
+# Reduce step merges this many summaries per call
+SUMMARY_REDUCE_FAN_IN = 20
+
+section_prompt = ChatPromptTemplate.from_template(
+    """Summarize the following section of the document "{source}" in at most 150 words.
+Keep concrete facts, figures, names and dates. Do not add information that is not in the text.
+
+SECTION:
+{text}
+"""
+)
+
+reduce_prompt = ChatPromptTemplate.from_template(
+    """Combine the following section summaries of the document "{source}" into a single
+summary of at most 300 words covering its purpose, key findings and figures.
+
+SECTION SUMMARIES:
+{text}
+"""
+)
+
+
+def summaries_enabled(text: str) -> bool:
+    return bool(os.getenv("OPENAI_API_KEY")) and len(text) >= INGEST_SUMMARY_MIN_CHARS
+
+
+async def summarize_document(text: str, source: str, job_id: str | None = None) -> Dict[str, Any]:
+    """
+    Map-reduce summarization run once at ingest time:
+    map: each ~8k-char section is summarized with bounded concurrency;
+    reduce: section summaries are merged (in groups if needed) into one document summary.
+    Both levels are stored in the summary collection for summary-first retrieval.
+    """
+    llm = get_chat_model("gpt-4o-mini", temperature=0, agent="summaries")
+    sections = summary_splitter.split_text(text)
+    semaphore = asyncio.Semaphore(INGEST_SUMMARY_CONCURRENCY)
+
+    print(f"[Summaries] Summarizing {source}: {len(sections)} sections")
+
+    async def summarize(prompt: ChatPromptTemplate, chunk: str) -> str:
+        async with semaphore:
+            response = await (prompt | llm).ainvoke({"source": source, "text": chunk})
+            return response.content
+
+    section_summaries: List[str] = list(
+        await asyncio.gather(*(summarize(section_prompt, section) for section in sections))
+    )
+
+    summaries = section_summaries
+    while len(summaries) > 1:
+        groups = [
+            "\n\n".join(summaries[i:i + SUMMARY_REDUCE_FAN_IN])
+            for i in range(0, len(summaries), SUMMARY_REDUCE_FAN_IN)
+        ]
+        summaries = list(await asyncio.gather(*(summarize(reduce_prompt, group) for group in groups)))
+    document_summary = summaries[0] if summaries else ""
+
+    stored = await asyncio.to_thread(add_summaries, section_summaries, document_summary, source, job_id)
+    return {"sections": len(section_summaries), "summaries_added": stored}
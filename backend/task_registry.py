@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .llm_factory import TokenUsageHandler
+from .metrics import metrics
+
+# How long cancel() waits for the task to unwind (close HTTP streams, release limiters)
+CANCEL_WAIT_SECONDS = 5
+
+
+@dataclass
+class RunningJob:
+    job_id: int
+    task: asyncio.Task
+    profile: str
+    usage: TokenUsageHandler = field(default_factory=TokenUsageHandler)
+    started: float = field(default_factory=time.perf_counter)
+    cancelled: bool = False
+
+
+class TaskRegistry:
+    """
+    Graph runs in flight, keyed by job id. Cancelling a job cancels its asyncio
+    task, which aborts in-flight LLM/HTTP awaits. Blocking work already handed to
+    a thread (e.g. a DuckDuckGo call) finishes in the background but its result
+    is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: Dict[int, RunningJob] = {}
+        self._totals = {"cancelled": 0, "tokens_saved": 0.0, "seconds_saved": 0.0}
+
+    def register(
+        self, job_id: int, task: asyncio.Task, profile: str, usage: Optional[TokenUsageHandler] = None
+    ) -> RunningJob:
+        """`usage` should be attached to the run's callbacks so its token spend is known."""
+        run = RunningJob(job_id=job_id, task=task, profile=profile, usage=usage or TokenUsageHandler())
+        with self._lock:
+            self._running[job_id] = run
+        return run
+
+    def finish(self, run: RunningJob) -> None:
+        """Unregisters a run; completed runs feed the per-profile averages used to estimate savings."""
+        with self._lock:
+            if self._running.get(run.job_id) is run:
+                del self._running[run.job_id]
+        task = run.task
+        if not run.cancelled and task.done() and not task.cancelled() and task.exception() is None:
+            metrics.observe("job_seconds", time.perf_counter() - run.started, profile=run.profile)
+            metrics.observe("job_tokens", run.usage.total_tokens, profile=run.profile)
+
+    def get(self, job_id: int) -> Optional[RunningJob]:
+        with self._lock:
+            return self._running.get(job_id)
+
+    def is_cancelled(self, job_id: int) -> bool:
+        run = self.get(job_id)
+        return bool(run and run.cancelled)
+
+    async def cancel(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Cancels the job's run and returns what it spent and the estimated tokens
+        and seconds saved versus an average completed run of the same profile.
+        None when no run for this job is in flight in this process.
+        """
+        run = self.get(job_id)
+        if run is None or run.task.done():
+            return None
+
+        run.cancelled = True
+        run.task.cancel()
+        try:
+            await asyncio.wait_for(asyncio.shield(run.task), timeout=CANCEL_WAIT_SECONDS)
+        except (asyncio.CancelledError, asyncio.TimeoutError, Exception):
+            pass
+
+        elapsed = time.perf_counter() - run.started
+        spent_tokens = run.usage.total_tokens
+        avg_seconds = metrics.average("job_seconds", profile=run.profile)
+        avg_tokens = metrics.average("job_tokens", profile=run.profile)
+        saved_seconds = max(avg_seconds - elapsed, 0.0) if avg_seconds is not None else None
+        saved_tokens = max(avg_tokens - spent_tokens, 0.0) if avg_tokens is not None else None
+
+        with self._lock:
+            self._totals["cancelled"] += 1
+            self._totals["seconds_saved"] += saved_seconds or 0.0
+            self._totals["tokens_saved"] += saved_tokens or 0.0
+        metrics.incr("jobs_cancelled", profile=run.profile)
+
+        return {
+            "elapsed_seconds": elapsed,
+            "tokens_spent": spent_tokens,
+            "estimated_seconds_saved": saved_seconds,
+            "estimated_tokens_saved": saved_tokens,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"running": sorted(self._running), **self._totals}
+
+
+task_registry = TaskRegistry()
+metrics.register_gauge("task_registry", task_registry.stats)
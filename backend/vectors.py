@@ -0,0 +1,27 @@
+from typing import Sequence
+import numpy as np
+
+
+def cosine_similarities(query: Sequence[float], matrix: Sequence[Sequence[float]]) -> np.ndarray:
+    """Cosine similarity of one vector against every row of a matrix."""
+    q = np.asarray(query, dtype=np.float32)
+    m = np.asarray(matrix, dtype=np.float32)
+    if m.size == 0:
+        return np.zeros(0, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1) * (np.linalg.norm(q) or 1.0)
+    norms[norms == 0] = 1.0
+    return (m @ q) / norms
+
+
+
+def cosine_matrix(a: Sequence[Sequence[float]], b: Sequence[Sequence[float]]) -> np.ndarray:
+    """Pairwise cosine similarity: rows of a against rows of b, shape (len(a), len(b))."""
+    x = np.asarray(a, dtype=np.float32)
+    y = np.asarray(b, dtype=np.float32)
+    if x.size == 0 or y.size == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x_norms = np.linalg.norm(x, axis=1, keepdims=True)
+    y_norms = np.linalg.norm(y, axis=1, keepdims=True)
+    x_norms[x_norms == 0] = 1.0
+    y_norms[y_norms == 0] = 1.0
+    return (x / x_norms) @ (y / y_norms).T
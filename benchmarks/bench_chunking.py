@@ -0,0 +1,105 @@
+"""
+Compares flat vs hierarchical chunking on index size, retrieval latency and
+answer-context size, using an in-memory vector store (no Postgres needed).
+
+Usage:
+    python benchmarks/bench_chunking.py [path/to/doc.pdf|.txt] ["query 1" "query 2" ...]
+"""
+import os
+import sys
+import time
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_huggingface import HuggingFaceEmbeddings
+
+from backend.chunking import split_flat, split_hierarchical, parent_ids_in_order, expand_to_parents
+from mcp_servers.ingestion.server import read_pdf
+
+DEFAULT_DOC = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'test_doc.pdf')
+DEFAULT_QUERIES = [
+    "What are the main findings?",
+    "What methodology was used?",
+    "What are the limitations and risks?",
+]
+N_RESULTS = 5
+CHILD_FETCH_FACTOR = 3
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+
+def load_text(path: str) -> str:
+    if path.endswith(".pdf"):
+        return read_pdf(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def bench(name, embedded_docs, resolve, queries, embeddings):
+    store = InMemoryVectorStore(embeddings)
+    start = time.perf_counter()
+    store.add_documents(embedded_docs)
+    index_seconds = time.perf_counter() - start
+
+    latencies, context_sizes = [], []
+    for q in queries:
+        start = time.perf_counter()
+        docs = resolve(store, q)
+        latencies.append((time.perf_counter() - start) * 1000)
+        context_sizes.append(sum(len(d.page_content) for d in docs))
+
+    embedded_chars = sum(len(d.page_content) for d in embedded_docs)
+    return {
+        "mode": name,
+        "vectors": len(embedded_docs),
+        "embedded_chars": embedded_chars,
+        "vector_bytes": len(embedded_docs) * EMBEDDING_DIM * 4,
+        "index_seconds": round(index_seconds, 2),
+        "retrieval_ms_p50": round(statistics.median(latencies), 2),
+        "context_chars_avg": round(statistics.mean(context_sizes)),
+        "context_tokens_avg": round(statistics.mean(context_sizes) / 4),
+    }
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DOC
+    queries = sys.argv[2:] or DEFAULT_QUERIES
+    text = load_text(path)
+    print(f"Document: {path} ({len(text)} chars), {len(queries)} queries\n")
+
+    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    metadata = {"source": os.path.basename(path), "job_id": "bench"}
+
+    flat_docs = split_flat(text, metadata)
+    flat = bench(
+        "flat",
+        flat_docs,
+        lambda store, q: store.similarity_search(q, k=N_RESULTS),
+        queries,
+        embeddings,
+    )
+
+    parents, children = split_hierarchical(text, metadata)
+    parents_by_id = {p.metadata["parent_id"]: p for p in parents}
+
+    def resolve_hierarchical(store, q):
+        matched = store.similarity_search(q, k=N_RESULTS * CHILD_FETCH_FACTOR)
+        wanted = {pid: parents_by_id[pid] for pid in parent_ids_in_order(matched)}
+        return expand_to_parents(matched, wanted, N_RESULTS)
+
+    hierarchical = bench("hierarchical", children, resolve_hierarchical, queries, embeddings)
+    hierarchical["parent_sections"] = len(parents)
+
+    for row in (flat, hierarchical):
+        print(row)
+
+    print(
+        f"\nVectors: {hierarchical['vectors'] / max(flat['vectors'], 1):.2f}x, "
+        f"embedded chars: {hierarchical['embedded_chars'] / max(flat['embedded_chars'], 1):.2f}x, "
+        f"context size: {hierarchical['context_chars_avg'] / max(flat['context_chars_avg'], 1):.2f}x of flat"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Throughput (MB/s) of the single-pass PII detector against the previous
+two-pass email/phone redaction, on report-like text with sparse PII and on
+entity-dense text, whole-text and streamed in chunks; then the chunked
+process-pool redaction (backend/redaction.py) with 1..N workers.
+
+Usage:
+    python benchmarks/bench_pii.py [--mb 8] [--chunk-kb 64] [--workers 1,2,4]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp_servers.compliance.detector import redact, redact_stream
+
+PARAGRAPH = (
+    "Solid-state batteries replace the liquid electrolyte with a solid one, improving energy "
+    "density by 30-40% [1]. Production costs remain high in 2025 [2]. "
+)
+CONTACT = "Contact jane.doe@example.com or 555-123-4567. "
+DENSE = (
+    "Card 4111 1111 1111 1111, IBAN GB82 WEST 1234 5698 7654 32, SSN 123-45-6789, "
+    "IP 192.168.1.10, phone +44 20 7946 0958, key sk-proj-abcdefghijklmnopqrstuvwx1234. "
+)
+
+
+def legacy_redact(text: str) -> str:
+    """The compliance server's redaction before the detector (emails and US phones only)."""
+    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "[REDACTED_EMAIL]", text)
+    return re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "[REDACTED_PHONE]", text)
+
+
+def make_text(unit: str, megabytes: float) -> str:
+    return unit * max(1, int(megabytes * 1_000_000 / len(unit)))
+
+
+def throughput(fn, text: str, runs: int = 3) -> float:
+    best = min(_timed(fn, text) for _ in range(runs))
+    return len(text) / 1_000_000 / best
+
+
+def _timed(fn, text: str) -> float:
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=8, help="size of each generated text")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="chunk size for the streaming run")
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count() or 1}", help="process pool sizes to compare")
+    args = parser.parse_args()
+
+    chunk = args.chunk_kb * 1024
+
+    def streamed(text):
+        return "".join(redact_stream(text[i:i + chunk] for i in range(0, len(text), chunk)))
+
+    print("text   | legacy MB/s | detector MB/s | streamed MB/s | entities")
+    for name, unit in (("report", PARAGRAPH * 20 + CONTACT), ("dense", PARAGRAPH + DENSE + CONTACT)):
+        text = make_text(unit, args.mb)
+        entities = len(redact(text)[1])
+        print(
+            f"{name:6s} | {throughput(legacy_redact, text):11.1f} | {throughput(lambda t: redact(t), text):13.1f} "
+            f"| {throughput(streamed, text):13.1f} | {entities}"
+        )
+
+    from backend import redaction
+    text = make_text(PARAGRAPH * 20 + CONTACT + "\n", args.mb * 4)
+    print("\nworkers | pooled MB/s")
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        redaction.shutdown()
+        redaction.REDACT_WORKERS = workers
+        redaction.REDACT_PARALLEL_MIN_CHARS = 0
+        asyncio.run(redaction.redact_text(text[:redaction.REDACT_CHUNK_CHARS * workers]))  # start the workers outside the timing
+        rate = throughput(lambda t: asyncio.run(redaction.redact_text(t)), text)
+        print(f"{workers:7d} | {rate:11.1f}")
+    redaction.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+End-to-end latency of each execution profile against its documented budget
+(backend/profiles.py). Runs the research graph ad hoc (no job / DB report) and
+auto-approves the compliance interrupt, so human wait time is excluded.
+
+Needs OPENAI_API_KEY and network access for web search, or SEARCH_PROVIDER=local
+with SEARCH_LOCAL_CORPUS for offline search (mcp_servers/research/providers.py).
+
+Usage:
+    python benchmarks/bench_profiles.py [--runs N] [--profiles fast,standard,thorough] ["query 1" ...]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import HumanMessage
+from langgraph.types import Command
+
+from backend.graph import graph
+from backend.profiles import PROFILES
+
+DEFAULT_QUERIES = [
+    "What is retrieval-augmented generation?",
+    "How do heat pumps compare to gas boilers on running cost?",
+]
+
+
+async def run_once(query: str, profile: str):
+    """Returns (total seconds, {node: seconds}) for one graph run."""
+    config = {"configurable": {"thread_id": f"bench-{uuid.uuid4()}"}}
+    state = {
+        "messages": [HumanMessage(content=query)],
+        "next_step": "start",
+        "artifacts": {},
+        "research_data": {},
+        "final_report": {},
+        "job_id": None,
+        "profile": profile,
+    }
+    node_seconds = defaultdict(float)
+    start = time.perf_counter()
+    payload = state
+    while True:
+        last = time.perf_counter()
+        async for update in graph.astream(payload, config=config, stream_mode="updates"):
+            now = time.perf_counter()
+            for node in update:
+                node_seconds[node] += now - last
+            last = now
+        snapshot = await graph.aget_state(config)
+        if not snapshot.next:
+            break
+        # Paused at the compliance interrupt: approve immediately
+        payload = Command(resume={"action": "approve"})
+    return time.perf_counter() - start, dict(node_seconds)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    parser.add_argument("--runs", type=int, default=1, help="runs per query and profile")
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    args = parser.parse_args()
+
+    rows = []
+    for name in args.profiles.split(","):
+        profile = PROFILES[name]
+        totals, nodes = [], defaultdict(list)
+        for query in args.queries:
+            for _ in range(args.runs):
+                total, per_node = await run_once(query, name)
+                totals.append(total)
+                for node, seconds in per_node.items():
+                    nodes[node].append(seconds)
+        budget = profile.latency_budget_seconds
+        rows.append({
+            "profile": name,
+            "budget_s": budget if budget is not None else "-",
+            "p50_s": round(statistics.median(totals), 1),
+            "p95_s": round(percentile(totals, 0.95), 1),
+            "within_budget": f"{sum(t <= budget for t in totals)}/{len(totals)}" if budget is not None else "-",
+            "slowest_node": max(nodes, key=lambda n: statistics.mean(nodes[n])) if nodes else "-",
+        })
+
+    headers = list(rows[0].keys())
+    print(" | ".join(headers))
+    for row in rows:
+        print(" | ".join(str(row[h]) for h in headers))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
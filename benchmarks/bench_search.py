@@ -0,0 +1,101 @@
+"""
+Offline search benchmark: BM25 index build time and query latency of the local
+corpus provider, then web_search under simulated network conditions (latency,
+jitter, error rate) at a fixed concurrency. Everything is generated and seeded,
+so runs are repeatable with no network.
+
+For an end-to-end graph run without web access, point bench_profiles at a
+corpus: SEARCH_PROVIDER=local SEARCH_LOCAL_CORPUS=<dir> python benchmarks/bench_profiles.py
+
+Usage:
+    python benchmarks/bench_search.py [--docs 2000] [--queries 200] [--latency-ms 300]
+        [--jitter-ms 100] [--error-rate 0.05] [--concurrency 8] [--seed 0] [--corpus DIR]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mcp_servers.research import providers
+from mcp_servers.research.server import web_search
+
+TOPICS = [
+    "battery", "electrolyte", "solar", "inverter", "heat", "pump", "grid", "storage", "hydrogen",
+    "turbine", "efficiency", "cost", "policy", "carbon", "emissions", "lithium", "recycling", "wind",
+]
+FILLER = "the report describes results across several markets and notes open questions".split()
+
+
+def make_corpus(directory: str, docs: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for i in range(docs):
+        words = rng.sample(TOPICS, 4)
+        paragraphs = [
+            " ".join(rng.choice(words + FILLER) for _ in range(60)) + "."
+            for _ in range(5)
+        ]
+        with open(os.path.join(directory, f"doc_{i:05d}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# {' '.join(words).title()}\n\n" + "\n\n".join(paragraphs))
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=2000, help="generated documents (ignored with --corpus)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="existing corpus directory instead of a generated one")
+    args = parser.parse_args()
+
+    directory = args.corpus or tempfile.mkdtemp(prefix="search_corpus_")
+    if not args.corpus:
+        make_corpus(directory, args.docs, args.seed)
+
+    local = providers.LocalCorpusProvider(directory)
+    start = time.perf_counter()
+    index = local.index
+    print(f"indexed {len(index.documents)} documents, {len(index.postings)} terms in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(args.seed)
+    queries = [" ".join(rng.sample(TOPICS, 3)) for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        local.search(query, max_results=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(
+        f"local query ms: p50 {statistics.median(latencies):.2f} | p95 {percentile(latencies, 0.95):.2f} "
+        f"| max {max(latencies):.2f}"
+    )
+
+    providers.set_provider(providers.SimulatedProvider(
+        local, args.latency_ms, args.jitter_ms, args.error_rate, args.seed
+    ))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda q: web_search(q, max_results=5), queries))
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for r in results if r and "error" in r[0])
+    print(
+        f"simulated web_search: {len(queries)} queries at concurrency {args.concurrency} in {elapsed:.2f}s "
+        f"({len(queries) / elapsed:.1f} q/s), {errors} errors"
+    )
+    providers.set_provider(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Checkpoint size and serialization time of the graph state as the report grows,
+with large fields inline versus offloaded to the blob store.
+
+Usage:
+    python benchmarks/bench_state_size.py [--hops 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("BLOB_DIR", tempfile.mkdtemp(prefix="bench_blobs_"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from backend import blob_store
+
+PARAGRAPH = "Solid-state batteries replace the liquid electrolyte with a solid one [1]. " * 8
+
+
+def make_state(sections: int, offload: bool):
+    report = {
+        "summary": PARAGRAPH,
+        "sections": [{"title": f"Section {i}", "content": PARAGRAPH * 4} for i in range(sections)],
+        "tables": [],
+        "citations": [{"id": i, "source": f"Source {i}", "url": f"https://example.com/{i}", "quote": PARAGRAPH} for i in range(1, 21)],
+    }
+    web_results = [{"id": str(i), "title": f"Source {i}", "url": f"https://example.com/{i}", "quote": PARAGRAPH} for i in range(1, 21)]
+    text = "\n".join(s["content"] for s in report["sections"])
+    wrap = blob_store.offload if offload else (lambda v: v)
+    return {
+        "messages": [
+            HumanMessage(content="State of solid-state batteries in 2025?"),
+            AIMessage(content="Draft report ready." if offload else text),
+        ],
+        "next_step": "citation",
+        "artifacts": {"draft_answer": wrap(report), "final_answer": wrap(text)},
+        "research_data": {"context": wrap(PARAGRAPH * 20), "web_results": wrap(web_results)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hops", type=int, default=10, help="checkpoints written per run (supervisor hops)")
+    args = parser.parse_args()
+
+    serde = JsonPlusSerializer()
+    print("sections | mode     | checkpoint_bytes | serialize_ms_per_run")
+    for sections in (4, 16, 64):
+        for offload in (False, True):
+            state = make_state(sections, offload)
+            start = time.perf_counter()
+            for _ in range(args.hops):
+                _, data = serde.dumps_typed(state)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            mode = "offload" if offload else "inline"
+            print(f"{sections:8d} | {mode:8s} | {len(data):16d} | {elapsed_ms:20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,7 +62,8 @@ export class DashboardComponent implements OnInit {
   getStatusClass(status: string): string {
     switch (status) {
       case 'completed': return 'status-completed';
-      case 'failed': return 'status-failed';
+      case 'failed':
+      case 'cancelled': return 'status-failed';
       case 'running': return 'status-running';
       default: return 'status-pending';
     }
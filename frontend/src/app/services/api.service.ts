@@ -7,7 +7,7 @@ import { AuthService } from './auth.service';
 export interface Job {
   id: number;
   type: string;
-  status: 'pending' | 'running' | 'completed' | 'failed';
+  status: 'pending' | 'running' | 'completed' | 'failed' | 'cancelled';
   user_id: number;
   progress: number;
   tasks?: any[];
@@ -35,6 +35,7 @@ export interface Report {
 
 export interface CreateJobRequest {
   topic: string;
+  profile?: 'fast' | 'standard' | 'thorough';
   documents?: File[];
   tool_config?: {
     [key: string]: boolean;
@@ -7,7 +7,7 @@ export interface Job {
     id: number;
     name: string;
     type: string;
-    status: 'pending' | 'running' | 'completed' | 'failed';
+    status: 'pending' | 'running' | 'completed' | 'failed' | 'cancelled';
     created_at: string;
     updated_at: string;
     progress: number;
@@ -0,0 +1,190 @@
+"""
+Local, deterministic citation pre-verification.
+
+Every sentence carrying [n] markers is a claim. Claims citing unknown sources are
+rejected outright; the rest are scored against their cited sources with a
+claims x sources matrix of embedding cosine similarity and lexical overlap.
+Clear cases are decided here; only uncertain claims need an LLM verdict.
+"""
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from backend.vectors import cosine_matrix
+
+# Combined score at or above which a claim is accepted without the LLM
+CITATION_SUPPORT_THRESHOLD = float(os.getenv("CITATION_SUPPORT_THRESHOLD", "0.6"))
+# Combined score below which a claim is rejected without the LLM
+CITATION_REJECT_THRESHOLD = float(os.getenv("CITATION_REJECT_THRESHOLD", "0.2"))
+# Weight of embedding similarity in the combined score (the rest is lexical overlap)
+CITATION_EMBEDDING_WEIGHT = float(os.getenv("CITATION_EMBEDDING_WEIGHT", "0.6"))
+# Claims judged per LLM call
+CITATION_BATCH_CLAIMS = int(os.getenv("CITATION_BATCH_CLAIMS", "8"))
+
+MARKER = re.compile(r"\[(\d+)\]")
+_MARKER_WITH_SPACE = re.compile(r"\s*\[\d+\]")
+REFERENCES_HEADING = "\nReferences\n=========="
+
+_LINE = re.compile(r"[^\n]+")
+# Sentence end, including markers placed after the punctuation ("... growth. [3]")
+_SENTENCE_END = re.compile(r"[.!?]+(?:\s*\[\d+\])*(?=\s|$)")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "the and for are was were with that this from have has had not but its their they them into than then "
+    "been also which while where when what who how can could would should may might will about over under "
+    "between more most such these those there here other some any all each per via".split()
+)
+
+Embed = Callable[[List[str]], List[List[float]]]
+
+
+@dataclass
+class Claim:
+    index: int
+    text: str
+    offset: int
+    citations: List[str]
+    status: str = "uncertain"
+    score: float = 0.0
+    method: str = "local"
+    reason: str = ""
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claim": self.text,
+            "offset": self.offset,
+            "citations": self.citations,
+            "status": self.status,
+            "score": round(self.score, 3),
+            "method": self.method,
+            "reason": self.reason,
+        }
+
+
+def _sentences(text: str):
+    for line in _LINE.finditer(text):
+        chunk, pos = line.group(), 0
+        ends = [m.end() for m in _SENTENCE_END.finditer(chunk)]
+        for end in ends + ([len(chunk)] if not ends or ends[-1] < len(chunk) else []):
+            sentence = chunk[pos:end]
+            stripped = sentence.lstrip()
+            if stripped:
+                yield line.start() + pos + len(sentence) - len(stripped), stripped.rstrip()
+            pos = end
+
+
+def extract_claims(draft: str) -> List[Claim]:
+    """Sentences with [n] markers, in order, with their offset in the draft. The references list is not a claim."""
+    body = draft.split(REFERENCES_HEADING, 1)[0]
+    claims = []
+    for offset, sentence in _sentences(body):
+        ids = list(dict.fromkeys(MARKER.findall(sentence)))
+        if ids:
+            claims.append(Claim(len(claims), _MARKER_WITH_SPACE.sub("", sentence).strip(), offset, ids))
+    return claims
+
+
+def tokens(text: str) -> set:
+    return {t for t in _TOKEN.findall(text.lower()) if len(t) > 2 and t not in _STOPWORDS}
+
+
+def lexical_overlap(claim_texts: Sequence[str], source_texts: Sequence[str]) -> np.ndarray:
+    """Share of each claim's content words found in each source, shape (claims, sources)."""
+    claim_tokens = [tokens(t) for t in claim_texts]
+    source_tokens = [tokens(t) for t in source_texts]
+    vocab = {t: i for i, t in enumerate(set().union(*claim_tokens, *source_tokens))}
+    c = np.zeros((len(claim_texts), len(vocab)), dtype=np.float32)
+    s = np.zeros((len(source_texts), len(vocab)), dtype=np.float32)
+    for row, toks in enumerate(claim_tokens):
+        c[row, [vocab[t] for t in toks]] = 1.0
+    for row, toks in enumerate(source_tokens):
+        s[row, [vocab[t] for t in toks]] = 1.0
+    sizes = c.sum(axis=1, keepdims=True)
+    sizes[sizes == 0] = 1.0
+    return (c @ s.T) / sizes
+
+
+def score_matrix(claim_texts: Sequence[str], source_texts: Sequence[str], embed: Optional[Embed] = None) -> np.ndarray:
+    """Combined claim x source support score in [0, 1]. Lexical only when no embedding function is given."""
+    lexical = lexical_overlap(claim_texts, source_texts)
+    if embed is None or not len(claim_texts) or not len(source_texts):
+        return lexical
+    vectors = embed(list(claim_texts) + list(source_texts))
+    cosine = np.clip(cosine_matrix(vectors[:len(claim_texts)], vectors[len(claim_texts):]), 0.0, 1.0)
+    return CITATION_EMBEDDING_WEIGHT * cosine + (1 - CITATION_EMBEDDING_WEIGHT) * lexical
+
+
+def prevalidate(draft: str, sources: List[Dict[str, Any]], embed: Optional[Embed] = None) -> List[Claim]:
+    """
+    Extracts and scores every claim. Status is "supported", "unsupported",
+    "unknown_source" or "uncertain" (needs an LLM verdict).
+    """
+    claims = extract_claims(draft)
+    columns = {str(s["id"]): i for i, s in enumerate(sources)}
+    scored = [c for c in claims if all(cid in columns for cid in c.citations)]
+    for claim in claims:
+        unknown = [cid for cid in claim.citations if cid not in columns]
+        if unknown:
+            claim.status = "unknown_source"
+            claim.reason = f"Cites {', '.join(f'[{cid}]' for cid in unknown)}, which does not match any provided source."
+
+    if scored:
+        texts = [f"{s.get('title', '')}\n{s.get('text', '')}" for s in sources]
+        matrix = score_matrix([c.text for c in scored], texts, embed)
+        for row, claim in enumerate(scored):
+            claim.scores = {cid: float(matrix[row, columns[cid]]) for cid in claim.citations}
+            claim.score = max(claim.scores.values())
+            if claim.score >= CITATION_SUPPORT_THRESHOLD:
+                claim.status = "supported"
+            elif claim.score < CITATION_REJECT_THRESHOLD:
+                claim.status = "unsupported"
+                claim.reason = "Cited source does not appear to discuss this claim."
+    return claims
+
+
+def batch_claims(claims: List[Claim], size: int = CITATION_BATCH_CLAIMS) -> List[List[Claim]]:
+    """
+    Groups claims by the sources they cite and packs the groups into batches of
+    at most `size` claims, so each LLM call only needs a few sources.
+    """
+    groups: Dict[tuple, List[Claim]] = {}
+    for claim in claims:
+        groups.setdefault(tuple(sorted(claim.citations, key=int)), []).append(claim)
+
+    batches, current = [], []
+    for key in sorted(groups, key=lambda k: [int(i) for i in k]):
+        group = groups[key]
+        for start in range(0, len(group), size):
+            chunk = group[start:start + size]
+            if current and len(current) + len(chunk) > size:
+                batches.append(current)
+                current = []
+            current = current + chunk
+    if current:
+        batches.append(current)
+    return batches
+
+
+def summarize(claims: List[Claim], summary: str) -> Dict[str, Any]:
+    """Verification result in the citation agent's score/issues schema, with per-claim detail."""
+    supported = sum(1 for c in claims if c.status == "supported")
+    total = len(claims)
+    issues = [
+        f"{c.reason or c.status.replace('_', ' ').capitalize() + '.'} Claim: \"{c.text[:120]}\""
+        for c in claims if c.status != "supported"
+    ]
+    return {
+        "score": supported / total if total else 1.0,
+        "is_valid": supported == total,
+        "supported_claims": supported,
+        "total_claims": total,
+        "issues": issues,
+        "summary": summary,
+        "claims": [c.to_dict() for c in claims],
+    }
@@ -1,15 +1,23 @@
 from mcp.server.fastmcp import FastMCP
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+import asyncio
 import re
-import json
-from typing import List, Dict, Any
+import time
+import os
+import sys
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from backend.llm_factory import get_chat_model, llm_limiter
+from backend.metrics import metrics
+from mcp_servers.citation_validation.prevalidator import Claim, Embed, prevalidate, batch_claims, summarize
 
 load_dotenv()
 
 mcp = FastMCP("citation_validation")
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+llm = get_chat_model("gpt-4o-mini", temperature=0, agent="citation_agent")
 
 @mcp.tool()
 def parse_web_search_results(web_results: str) -> List[Dict[str, Any]]:
@@ -48,71 +56,134 @@ def parse_web_search_results(web_results: str) -> List[Dict[str, Any]]:
     return sources
 
 @mcp.tool()
-async def verify_citations_internal(draft_answer: str, sources: List[Dict[str, Any]], strict_mode: bool = False) -> Dict[str, Any]:
+def check_citation_markers(draft_answer: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Verifies citations in the draft answer against the provided sources.
-    Returns a structured dictionary with score, issues, and validity status.
+    Local, LLM-free citation check: every [n] marker in the draft must refer to a
+    provided source. Used by the "fast" execution profile.
     """
-    
-    # Prepare sources text for the prompt
-    sources_text = ""
-    for source in sources:
-        sources_text += f"Source [{source['id']}]: {source['title']}\n{source['text']}\n\n"
-        
-    verification_prompt = ChatPromptTemplate.from_template(
-        """Verify the following answer for accuracy and proper citation usage based on the sources.
-        
-        Draft Answer: {draft_answer}
-        
-        Sources:
-        {sources_text}
-        
-        INSTRUCTIONS:
-        1. Check if every factual claim is supported by the cited source.
-        2. Check if the citations (e.g., [1]) actually exist in the provided sources.
-        3. Check for hallucinations (claims not found in any source).
-        4. Check for temporal accuracy (e.g., "current" status matches the latest info).
-        
-        Return the result in the following JSON format:
-        {{
-            "score": <float between 0.0 and 1.0>,
-            "is_valid": <boolean>,
-            "supported_claims": <int>,
-            "total_claims": <int>,
-            "issues": [
-                "<description of issue 1>",
-                "<description of issue 2>"
-            ],
-            "summary": "<brief summary of verification>"
-        }}
-        """
+    source_ids = {str(source["id"]) for source in sources}
+    markers = re.findall(r'\[(\d+)\]', draft_answer)
+    unknown = sorted({m for m in markers if m not in source_ids}, key=int)
+    supported = sum(1 for m in markers if m in source_ids)
+    total = len(markers)
+
+    return {
+        "score": supported / total if total else 1.0,
+        "is_valid": not unknown,
+        "supported_claims": supported,
+        "total_claims": total,
+        "issues": [f"Citation [{m}] does not match any provided source." for m in unknown],
+        "summary": "Local citation check (marker/source consistency only)."
+    }
+
+class ClaimVerdict(BaseModel):
+    claim: int = Field(description="Number of the claim being judged.")
+    supported: bool
+    reason: str = Field(description="One sentence explaining the verdict.")
+
+
+class ClaimVerdicts(BaseModel):
+    verdicts: List[ClaimVerdict]
+
+
+claims_prompt = ChatPromptTemplate.from_template(
+    """Judge whether each numbered claim is supported by the sources it cites.
+
+CLAIMS:
+{claims_text}
+
+SOURCES:
+{sources_text}
+
+INSTRUCTIONS:
+1. A claim is supported only if its cited source states or clearly implies it.
+2. Flag temporal inaccuracies (e.g., "current" status that contradicts the latest info) as unsupported.
+3. Return one verdict per claim number.
+"""
+)
+
+
+async def judge_claims(claims: List[Claim], sources: List[Dict[str, Any]]) -> None:
+    """Sets the status of uncertain claims from an LLM verdict, sending only the sources they cite."""
+    by_id = {str(s["id"]): s for s in sources}
+    cited = sorted({cid for c in claims for cid in c.citations}, key=int)
+    claims_text = "\n".join(
+        f"{c.index}. {c.text} (cites {', '.join(f'[{cid}]' for cid in c.citations)})" for c in claims
     )
-    
-    chain = verification_prompt | llm
-    response = await chain.ainvoke({
-        "draft_answer": draft_answer,
-        "sources_text": sources_text
+    sources_text = "\n\n".join(f"Source [{cid}]: {by_id[cid].get('title', '')}\n{by_id[cid].get('text', '')}" for cid in cited)
+
+    result: ClaimVerdicts = await (claims_prompt | llm.with_structured_output(ClaimVerdicts)).ainvoke({
+        "claims_text": claims_text,
+        "sources_text": sources_text,
     })
-    
+    verdicts = {v.claim: v for v in result.verdicts}
+    for claim in claims:
+        verdict = verdicts.get(claim.index)
+        if verdict is None:
+            continue
+        claim.status = "supported" if verdict.supported else "unsupported"
+        claim.method = "llm"
+        claim.reason = "" if verdict.supported else verdict.reason
+
+
+async def _judge_batch(batch: List[Claim], sources: List[Dict[str, Any]]) -> None:
+    started = time.perf_counter()
     try:
-        # Clean up the response to ensure it's valid JSON
-        content = response.content.strip()
-        if content.startswith("```json"):
-            content = content[7:-3]
-        elif content.startswith("```"):
-            content = content[3:-3]
-            
-        result = json.loads(content)
-        return result
+        async with llm_limiter():
+            await judge_claims(batch, sources)
     except Exception as e:
-        return {
-            "score": 0.0,
-            "is_valid": False,
-            "supported_claims": 0,
-            "total_claims": 0,
-            "issues": [f"Failed to parse verification result: {str(e)}"],
-            "summary": "Verification failed due to parsing error."
-        }
+        metrics.incr("citation_batch_failures")
+        print(f"Citation batch of {len(batch)} claims failed: {e}")
+        raise
+    finally:
+        metrics.observe("citation_batch_seconds", time.perf_counter() - started)
+
+
+async def verify_citations(
+    draft_answer: str,
+    sources: List[Dict[str, Any]],
+    strict_mode: bool = False,
+    embed: Optional[Embed] = None,
+) -> Dict[str, Any]:
+    """
+    Local pre-verification first; the LLM only judges claims the local scores
+    cannot decide (in strict mode, every claim with known sources). Those claims
+    are batched by cited source and the batches judged concurrently, so latency
+    stays flat as the report grows and a failed batch only affects its claims.
+    """
+    claims = await asyncio.to_thread(prevalidate, draft_answer, sources, embed)
+    pending = [
+        c for c in claims
+        if c.status == "uncertain" or (strict_mode and c.status in ("supported", "unsupported"))
+    ]
+    metrics.incr("citation_claims_local", len(claims) - len(pending))
+    metrics.incr("citation_claims_llm", len(pending))
+
+    batches = batch_claims(pending)
+    metrics.incr("citation_batches", len(batches))
+    results = await asyncio.gather(*(_judge_batch(b, sources) for b in batches), return_exceptions=True)
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    for claim in pending:
+        if claim.method != "llm":
+            claim.status = "unverified"
+            claim.reason = "Could not be verified: the verification model did not return a verdict."
+
+    result = summarize(
+        claims,
+        f"{len(claims)} cited claims: {len(claims) - len(pending)} decided locally, "
+        f"{len(pending)} sent to the LLM in {len(batches)} batches ({failed} failed).",
+    )
+    result["batches"] = {"total": len(batches), "failed": failed}
+    return result
+
+
+@mcp.tool()
+async def verify_citations_internal(draft_answer: str, sources: List[Dict[str, Any]], strict_mode: bool = False) -> Dict[str, Any]:
+    """
+    Verifies citations in the draft answer against the provided sources.
+    Returns a structured dictionary with score, issues, validity status and per-claim detail.
+    """
+    return await verify_citations(draft_answer, sources, strict_mode=strict_mode)
 
 if __name__ == "__main__":
     mcp.run()
@@ -0,0 +1,203 @@
+"""
+Single-pass PII detector.
+
+One compiled alternation covers every entity type; matches that need a checksum
+(credit cards, IBANs) or a digit count (phones) are validated after the regex,
+and a failed validation falls through to the remaining entity types at the same
+position. Detection returns span offsets, so callers can redact, report or map
+findings back to report sections. scan_stream/redact_stream process arbitrarily
+large inputs chunk by chunk without missing entities that straddle a boundary.
+"""
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+    type: str
+
+
+# (group name, entity type, pattern), tried in this order at each position
+_PATTERNS: List[Tuple[str, str, str]] = [
+    ("EMAIL", "EMAIL", r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b"),
+    ("API_KEY", "API_KEY", (
+        r"(?<![\w-])(?:"
+        r"sk-(?:proj-|live_|test_)?[A-Za-z0-9_-]{20,128}"
+        r"|(?:pk|rk|sk)_(?:live|test)_[A-Za-z0-9]{16,128}"
+        r"|AKIA[0-9A-Z]{16}"
+        r"|gh[pousr]_[A-Za-z0-9]{36,128}"
+        r"|xox[abposr]-[A-Za-z0-9-]{10,128}"
+        r"|AIza[0-9A-Za-z_-]{35}"
+        r")(?![\w-])"
+    )),
+    ("IBAN", "IBAN", r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?\b"),
+    ("CREDIT_CARD", "CREDIT_CARD", r"\b(?:\d[ -]?){12,18}\d\b"),
+    ("SSN", "SSN", r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b"),
+    ("IPV4", "IP", r"\b(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\b"),
+    ("IPV6", "IP", r"\b(?:[0-9A-Fa-f]{1,4}:){7}[0-9A-Fa-f]{1,4}\b"),
+    ("PHONE_INTL", "PHONE", r"(?<![\w+])\+\d{1,3}(?:[ .-]?\(?\d{1,4}\)?){2,5}(?!\w)"),
+    ("PHONE_NANP", "PHONE", r"(?<![\w+])(?:\(\d{3}\)|\b\d{3})[ .-]?\d{3}[ .-]?\d{4}\b"),
+]
+
+PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, _, pattern in _PATTERNS))
+_ENTITY_TYPES: Dict[str, str] = {name: entity for name, entity, _ in _PATTERNS}
+_FALLBACKS = {
+    name: [(other, re.compile(pattern)) for other, _, pattern in _PATTERNS[i + 1:]]
+    for i, (name, _, _) in enumerate(_PATTERNS)
+}
+ENTITY_TYPES = sorted(set(_ENTITY_TYPES.values()))
+# Something every entity has in its first token (see _scan). One leading character
+# class lets the engine skip ordinary prose quickly; the lookbehinds tell the cases apart.
+TRIGGER = re.compile(
+    r"[\d@A-Z_-](?:"
+    r"(?<=\d)(?:[\d .()-]{5}|[0-9A-Fa-f]{0,3}:)"  # number-like run, IPv6 group
+    r"|(?<=@)"  # email
+    r"|(?<=[A-Z])(?:[A-Z]\d\d|KIA|Iza)"  # IBAN country and check digits, AWS and Google keys
+    r"|(?<=sk-)|(?<=[spr]k_)|(?<=gh[pousr]_)|(?<=xox[abposr]-)"  # other key prefixes
+    r")"
+)
+
+# Longest possible match is well below this, so a chunk boundary can never split an unseen entity
+STREAM_OVERLAP = 512
+# Characters kept before the scan position so word-boundary checks see real context
+_CONTEXT = 1
+
+
+def _digits(text: str) -> str:
+    return "".join(ch for ch in text if ch.isdigit())
+
+
+def luhn_valid(number: str) -> bool:
+    digits = [int(d) for d in _digits(number)]
+    checksum = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        checksum += d
+    return checksum % 10 == 0
+
+
+def iban_valid(value: str) -> bool:
+    iban = value.replace(" ", "")
+    if not 15 <= len(iban) <= 34:
+        return False
+    rearranged = iban[4:] + iban[:4]
+    return int("".join(str(int(ch, 36)) for ch in rearranged)) % 97 == 1
+
+
+_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "CREDIT_CARD": lambda v: 13 <= len(_digits(v)) <= 19 and luhn_valid(v),
+    "IBAN": iban_valid,
+    "PHONE_INTL": lambda v: 8 <= len(_digits(v)) <= 15,
+}
+
+
+def _validated(text: str, name: str, start: int, end: int) -> Optional[Span]:
+    """The span if its match validates, else the first later entity type matching at the same position."""
+    validator = _VALIDATORS.get(name)
+    if validator is None or validator(text[start:end]):
+        return Span(start, end, _ENTITY_TYPES[name])
+    for other, pattern in _FALLBACKS[name]:
+        m = pattern.match(text, start)
+        if m and _VALIDATORS.get(other, bool)(m.group()):
+            return Span(start, m.end(), _ENTITY_TYPES[other])
+    return None
+
+
+def _token_start(text: str, pos: int, end: int) -> int:
+    return max(pos, text.rfind(" ", pos, end) + 1, text.rfind("\n", pos, end) + 1, text.rfind("\t", pos, end) + 1)
+
+
+def _scan(text: str, pos: int = 0) -> Iterator[Span]:
+    """
+    Every entity has a trigger starting in its first whitespace-separated token,
+    so the full pattern is only tried between the start of that token and the
+    trigger. Ordinary prose and short numbers never trigger and are skipped by
+    one cheap search instead of testing every alternative at every character.
+    """
+    trigger, match = TRIGGER.search, PATTERN.match
+    while True:
+        t = trigger(text, pos)
+        if t is None:
+            return
+        hit = t.start()
+        for start in range(_token_start(text, pos, hit), hit + 1):
+            m = match(text, start)
+            if m is None:
+                continue
+            span = _validated(text, m.lastgroup, start, m.end())
+            if span is not None:
+                yield span
+                pos = span.end
+                break
+        else:
+            pos = hit + 1
+
+
+def detect(text: str) -> List[Span]:
+    """All entities in the text, in order, non-overlapping."""
+    return list(_scan(text))
+
+
+def label(entity_type: str) -> str:
+    return f"[REDACTED_{entity_type}]"
+
+
+def redact_spans(text: str, spans: Iterable[Span]) -> str:
+    out, pos = [], 0
+    for span in spans:
+        out.append(text[pos:span.start])
+        out.append(label(span.type))
+        pos = span.end
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def redact(text: str) -> Tuple[str, List[Span]]:
+    """Redacted text and the spans (in the original text) that were replaced."""
+    spans = detect(text)
+    return redact_spans(text, spans), spans
+
+
+def _committed(chunks: Iterable[str], overlap: int) -> Iterator[Tuple[str, int, List[Span]]]:
+    """
+    Yields (segment, segment offset, spans relative to the segment) for
+    consecutive segments of the input whose entities are final. A segment ends
+    `overlap` characters before the end of the buffered text, or earlier at the
+    start of an entity that reaches into that tail, which is re-scanned with
+    the next chunk.
+    """
+    buf, base, pos = "", 0, 0
+    for chunk in chunks:
+        buf += chunk
+        if len(buf) - pos < 2 * overlap:
+            continue
+        cut = len(buf) - overlap
+        spans = []
+        for span in _scan(buf, pos):
+            if span.end > cut:
+                cut = min(cut, span.start)
+                break
+            spans.append(span)
+        yield buf[pos:cut], base + pos, [Span(s.start - pos, s.end - pos, s.type) for s in spans]
+        keep = max(cut - _CONTEXT, 0)
+        buf, base, pos = buf[keep:], base + keep, cut - keep
+    spans = list(_scan(buf, pos))
+    yield buf[pos:], base + pos, [Span(s.start - pos, s.end - pos, s.type) for s in spans]
+
+
+def scan_stream(chunks: Iterable[str], overlap: int = STREAM_OVERLAP) -> Iterator[Span]:
+    """Entities of a chunked input, with offsets into the whole input."""
+    for _, offset, spans in _committed(chunks, overlap):
+        for span in spans:
+            yield Span(span.start + offset, span.end + offset, span.type)
+
+
+def redact_stream(chunks: Iterable[str], overlap: int = STREAM_OVERLAP) -> Iterator[str]:
+    """Redacted text of a chunked input, piece by piece; joined, it equals redact() of the whole input."""
+    for segment, _, spans in _committed(chunks, overlap):
+        if segment:
+            yield redact_spans(segment, spans)
@@ -1,20 +1,23 @@
 from mcp.server.fastmcp import FastMCP
-import re
+from typing import Any, Dict, List
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from mcp_servers.compliance.detector import detect, redact
 
 mcp = FastMCP("compliance")
 
 @mcp.tool()
 def redact_pii(text: str) -> str:
-    """Redact PII (emails, phone numbers) from text."""
-    # Redact emails
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    text = re.sub(email_pattern, "[REDACTED_EMAIL]", text)
-    
-    # Redact phone numbers (simple pattern)
-    phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-    text = re.sub(phone_pattern, "[REDACTED_PHONE]", text)
-    
-    return text
+    """Redact PII (emails, phone numbers, credit cards, IBANs, SSNs, IP addresses, API keys) from text."""
+    redacted, _ = redact(text)
+    return redacted
+
+@mcp.tool()
+def detect_pii(text: str) -> List[Dict[str, Any]]:
+    """Find PII in text without changing it. Returns the type and character offsets of each entity."""
+    return [{"type": span.type, "start": span.start, "end": span.end} for span in detect(text)]
 
 if __name__ == "__main__":
     mcp.run()
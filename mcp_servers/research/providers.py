@@ -0,0 +1,280 @@
+"""
+Search providers behind web_search.
+
+SEARCH_PROVIDER picks the backend: "duckduckgo" (default) queries the web,
+"local" ranks an offline document set (Markdown, text or HTML files under
+SEARCH_LOCAL_CORPUS) with BM25, so load tests, CI and air-gapped deployments
+need no network. Every provider returns DuckDuckGo-shaped results
+({"title", "href", "body"}).
+
+SEARCH_SIMULATED_LATENCY_MS / _JITTER_MS / _ERROR_RATE wrap the provider with
+reproducible delays and failures (seeded by SEARCH_SIMULATED_SEED) for
+deterministic benchmarks.
+"""
+import math
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SEARCH_PROVIDER = os.getenv("SEARCH_PROVIDER", "duckduckgo").lower()
+SEARCH_LOCAL_CORPUS = os.getenv("SEARCH_LOCAL_CORPUS", "search_corpus")
+SEARCH_SIMULATED_LATENCY_MS = float(os.getenv("SEARCH_SIMULATED_LATENCY_MS", "0"))
+SEARCH_SIMULATED_JITTER_MS = float(os.getenv("SEARCH_SIMULATED_JITTER_MS", "0"))
+SEARCH_SIMULATED_ERROR_RATE = float(os.getenv("SEARCH_SIMULATED_ERROR_RATE", "0"))
+SEARCH_SIMULATED_SEED = int(os.getenv("SEARCH_SIMULATED_SEED", "0"))
+
+CORPUS_EXTENSIONS = (".md", ".markdown", ".txt", ".html", ".htm")
+# Characters of the best-matching passage returned as the result body
+SNIPPET_CHARS = 300
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_PASSAGE = re.compile(r"[^\n]+(?:\n[^\n]+)*")
+_MD_HEADING = re.compile(r"^#{1,6}\s+(.+)$", re.M)
+_MD_MARKUP = re.compile(r"[#*_`>\[\]]|\(https?://[^)]*\)")
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class SearchError(RuntimeError):
+    pass
+
+
+class SearchProvider(ABC):
+    """A search backend: search() returns up to max_results DuckDuckGo-shaped results."""
+
+    name = "base"
+
+    @abstractmethod
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        ...
+
+
+class DuckDuckGoProvider(SearchProvider):
+    name = "duckduckgo"
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        # Imported here so offline deployments do not need the package
+        from duckduckgo_search import DDGS
+        return list(DDGS().text(query, max_results=max_results))
+
+
+class _HTMLText(HTMLParser):
+    """Title and visible text of an HTML page; scripts, styles and navigation chrome are dropped."""
+
+    _SKIP = {"script", "style", "nav", "header", "footer", "noscript"}
+    _BLOCK = {"p", "div", "li", "br", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "tr"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.title = ""
+        self.parts: List[str] = []
+        self._skipping = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skipping += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self._BLOCK:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP:
+            self._skipping = max(self._skipping - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self._BLOCK:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skipping:
+            self.parts.append(data)
+
+
+def html_text(html: str) -> Tuple[str, str]:
+    """(title, text) of an HTML document, paragraphs separated by blank lines."""
+    parser = _HTMLText()
+    parser.feed(html)
+    text = re.sub(r"[ \t]+", " ", "".join(parser.parts))
+    text = re.sub(r"\s*\n\s*\n\s*", "\n\n", text).strip()
+    return parser.title.strip(), text
+
+
+def markdown_text(markdown: str) -> Tuple[str, str]:
+    """(title, text) of a Markdown document: the first heading is the title, markup is dropped."""
+    heading = _MD_HEADING.search(markdown)
+    return (heading.group(1).strip() if heading else ""), _MD_MARKUP.sub("", markdown).strip()
+
+
+class Document:
+    __slots__ = ("url", "title", "text", "length", "terms")
+
+    def __init__(self, url: str, title: str, text: str) -> None:
+        self.url = url
+        self.title = title
+        self.text = text
+        words = tokens(f"{title} {text}")
+        self.length = len(words)
+        self.terms = Counter(words)
+
+
+class BM25Index:
+    """Okapi BM25 over an in-memory document list."""
+
+    def __init__(self, documents: Sequence[Document], k1: float = 1.5, b: float = 0.75) -> None:
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self.avg_length = sum(d.length for d in self.documents) / len(self.documents) if self.documents else 0.0
+        # Postings: term -> [(doc index, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for i, doc in enumerate(self.documents):
+            for term, tf in doc.terms.items():
+                self.postings.setdefault(term, []).append((i, tf))
+        n = len(self.documents)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+
+    def search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        scores: Dict[int, float] = {}
+        for term in set(tokens(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                norm = tf + self.k1 * (1 - self.b + self.b * self.documents[i].length / (self.avg_length or 1))
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.documents[i], score) for i, score in ranked]
+
+
+def best_passage(text: str, query: str, limit: int = SNIPPET_CHARS) -> str:
+    """The paragraph sharing the most distinct terms with the query, cut to about `limit` characters."""
+    wanted = set(tokens(query))
+    best, best_score = "", -1
+    for passage in _PASSAGE.findall(text):
+        score = len(wanted & set(tokens(passage)))
+        if score > best_score:
+            best, best_score = passage, score
+    best = " ".join(best.split())
+    return best if len(best) <= limit else best[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def load_corpus(directory: str) -> List[Document]:
+    """Every Markdown, text and HTML file under the directory, addressed as local://<relative path>."""
+    documents = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.lower().endswith(CORPUS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                raw = f.read()
+            if name.lower().endswith((".html", ".htm")):
+                title, text = html_text(raw)
+            else:
+                title, text = markdown_text(raw)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            documents.append(Document(f"local://{relative}", title or os.path.splitext(name)[0], text))
+    return documents
+
+
+class LocalCorpusProvider(SearchProvider):
+    """BM25 search over an offline document directory, indexed once on first use."""
+
+    name = "local"
+
+    def __init__(self, directory: str = SEARCH_LOCAL_CORPUS) -> None:
+        self.directory = directory
+        self._index: Optional[BM25Index] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> BM25Index:
+        with self._lock:
+            if self._index is None:
+                if not os.path.isdir(self.directory):
+                    raise SearchError(f"Local search corpus not found: {self.directory}")
+                self._index = BM25Index(load_corpus(self.directory))
+        return self._index
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        return [
+            {"title": doc.title, "href": doc.url, "body": best_passage(doc.text, query)}
+            for doc, _ in self.index.search(query, max_results)
+        ]
+
+
+class SimulatedProvider(SearchProvider):
+    """
+    Wraps a provider with simulated network conditions: a delay of latency ± jitter
+    and a failure with probability error_rate per call, drawn from a seeded
+    generator so a benchmark run is reproducible.
+    """
+
+    def __init__(
+        self, inner: SearchProvider, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0, seed: int = 0
+    ) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        with self._lock:
+            delay = max(self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000
+            fail = self._random.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            raise SearchError("Simulated search failure")
+        return self.inner.search(query, max_results)
+
+
+PROVIDERS = {"duckduckgo": DuckDuckGoProvider, "local": LocalCorpusProvider}
+
+_provider: Optional[SearchProvider] = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name: str = SEARCH_PROVIDER) -> SearchProvider:
+    """The named provider, wrapped with simulated latency/errors when those are configured."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown search provider {name!r}; expected one of {', '.join(PROVIDERS)}")
+    provider = PROVIDERS[name]()
+    if SEARCH_SIMULATED_LATENCY_MS or SEARCH_SIMULATED_JITTER_MS or SEARCH_SIMULATED_ERROR_RATE:
+        provider = SimulatedProvider(
+            provider,
+            SEARCH_SIMULATED_LATENCY_MS,
+            SEARCH_SIMULATED_JITTER_MS,
+            SEARCH_SIMULATED_ERROR_RATE,
+            SEARCH_SIMULATED_SEED,
+        )
+    return provider
+
+
+def get_provider() -> SearchProvider:
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider: Optional[SearchProvider]) -> None:
+    """Replaces the process-wide provider (benchmarks, tests); None goes back to the configured one."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
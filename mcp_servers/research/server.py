@@ -1,14 +1,17 @@
 from mcp.server.fastmcp import FastMCP
-from duckduckgo_search import DDGS
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from mcp_servers.research.providers import get_provider
 
 mcp = FastMCP("research")
 
 @mcp.tool()
 def web_search(query: str, max_results: int = 5) -> list[dict]:
-    """Perform a web search using DuckDuckGo."""
+    """Perform a web search with the configured provider (DuckDuckGo unless SEARCH_PROVIDER says otherwise)."""
     try:
-        results = DDGS().text(query, max_results=max_results)
-        return list(results)
+        return get_provider().search(query, max_results=max_results)
     except Exception as e:
         return [{"error": f"Error performing search: {str(e)}"}]
 
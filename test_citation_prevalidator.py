@@ -0,0 +1,74 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from mcp_servers.citation_validation.prevalidator import Claim, batch_claims, extract_claims, prevalidate, summarize
+
+SOURCES = [
+    {"id": "1", "title": "Battery review", "text": "Solid-state batteries replace the liquid electrolyte with a solid ceramic electrolyte, improving energy density."},
+    {"id": "2", "title": "Market outlook", "text": "Analysts expect electric vehicle sales to grow strongly through 2030."},
+]
+
+DRAFT = """Summary
+=======
+
+Solid-state batteries replace the liquid electrolyte with a solid ceramic electrolyte [1]. Penguins migrate across Antarctica every winter [2].
+Quantum computers will replace batteries [7].
+
+References
+==========
+[1] Battery review — https://example.com/1
+[2] Market outlook — https://example.com/2"""
+
+
+def test_extract_claims():
+    print("--- Testing claim extraction ---")
+    claims = extract_claims(DRAFT)
+    texts = [c.text for c in claims]
+    print(f"Claims: {texts}")
+    if len(claims) == 3 and all("[" not in t for t in texts) and claims[2].citations == ["7"]:
+        print("✓ Claims extracted, references list skipped")
+    else:
+        print("✗ Unexpected claims")
+    if DRAFT[claims[1].offset:].startswith("Penguins"):
+        print("✓ Claim offsets point into the draft")
+    else:
+        print("✗ Claim offset mismatch")
+
+
+def test_local_verdicts():
+    print("\n--- Testing local verdicts (lexical only) ---")
+    claims = prevalidate(DRAFT, SOURCES)
+    statuses = [c.status for c in claims]
+    print(f"Statuses: {statuses}")
+    if statuses == ["supported", "unsupported", "unknown_source"]:
+        print("✓ Clear claims decided without the LLM")
+    else:
+        print("✗ Unexpected statuses")
+
+    result = summarize(claims, "local")
+    print(f"Score: {result['score']}, issues: {result['issues']}")
+    if result["supported_claims"] == 1 and result["total_claims"] == 3 and len(result["issues"]) == 2:
+        print("✓ Result uses the score/issues schema")
+    else:
+        print("✗ Unexpected result")
+
+
+def test_batching():
+    print("\n--- Testing claim batching by cited source ---")
+    claims = [Claim(i, f"claim {i}", 0, [str(i % 3 + 1)]) for i in range(10)]
+    batches = batch_claims(claims, size=4)
+    sizes = [len(b) for b in batches]
+    print(f"Batch sizes: {sizes}, sources: {[sorted({c.citations[0] for c in b}) for b in batches]}")
+    if sum(sizes) == 10 and max(sizes) <= 4 and all(len({c.citations[0] for c in b}) <= 2 for b in batches):
+        print("✓ Claims batched by source within the size limit")
+    else:
+        print("✗ Unexpected batches")
+
+
+if __name__ == "__main__":
+    test_extract_claims()
+    test_local_verdicts()
+    test_batching()
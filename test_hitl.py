@@ -8,31 +8,44 @@ from langgraph.types import Command
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
 
 from backend.graph import graph
+from backend.database import create_db_and_tables
+from backend.compliance_policy import evaluate
 
-async def test_hitl():
-    print("\n==== RUNNING HITL TEST ====\n")
-
-    # Use a thread_id to persist state for resumption
-    config = {"configurable": {"thread_id": "test_thread_1"}}
 
-    # Build initial state
-    initial_state = {
+def initial_state(job_id):
+    return {
         "messages": [HumanMessage(content="Explain the impact of AI in healthcare")],
         "next_step": "start",
-        "job_id": 123, # Mock job ID
+        "job_id": job_id, # Mock job ID
         "artifacts": {},
         "research_data": {},
         "final_report": {}
     }
 
+
+async def test_hitl():
+    print("\n==== RUNNING HITL TEST ====\n")
+
+    # Reports without PII are auto-approved by default; force the review path
+    os.environ["COMPLIANCE_AUTO_APPROVE"] = "false"
+    # The compliance node indexes the waiting thread in pending_approvals
+    create_db_and_tables()
+
+    # Use a thread_id to persist state for resumption
+    config = {"configurable": {"thread_id": "test_thread_1"}}
+
     print("--- 1. Starting Graph Execution ---")
     # Run until interrupt
     # We use stream to see updates, or invoke. invoke will stop at interrupt.
-    result = await graph.ainvoke(initial_state, config=config)
-    
+    result = await graph.ainvoke(initial_state(123), config=config)
+
     print("\n--- 2. Graph Interrupted (Expected) ---")
-    print("State at interrupt:", result)
-    
+    snapshot = await graph.aget_state(config)
+    if "compliance" in snapshot.next:
+        print("✓ Graph paused at the compliance review")
+    else:
+        print(f"✗ No interrupt, next nodes: {snapshot.next}")
+
     # Check if we have a final answer yet (should be empty or partial)
     print("Draft Answer:", result.get("artifacts", {}).get("draft_answer", "N/A"))
     print("Final Answer:", result.get("artifacts", {}).get("final_answer", "N/A"))
@@ -41,9 +54,9 @@ async def test_hitl():
     # Resume with approval command
     # The interrupt key was "msg", but we just need to pass the value expected by the variable assigned to interrupt()
     # In compliance_node: approval_data = interrupt(...)
-    
+
     resume_command = Command(resume={"action": "approve"})
-    
+
     # Run again with the same config (thread_id) and the resume command
     final_result = await graph.ainvoke(resume_command, config=config)
 
@@ -56,5 +69,29 @@ async def test_hitl():
     print("\n==== REPORT PATHS ====\n")
     print(final_result.get("final_report", {}))
 
+
+async def test_auto_approve():
+    print("\n==== RUNNING AUTO-APPROVE TEST ====\n")
+    os.environ["COMPLIANCE_AUTO_APPROVE"] = "true"
+
+    if evaluate({}).approved and not evaluate({"EMAIL": 2}).approved:
+        print("✓ Policy approves clean reports and holds ones with PII")
+    else:
+        print("✗ Unexpected policy decisions")
+
+    config = {"configurable": {"thread_id": "test_thread_auto"}}
+    result = await graph.ainvoke(initial_state(124), config=config)
+    snapshot = await graph.aget_state(config)
+    assessment = result.get("artifacts", {}).get("compliance_assessment", {})
+    print("Compliance assessment:", assessment)
+    if snapshot.next:
+        print(f"✗ Graph paused at {snapshot.next} (draft contained PII?)")
+    elif assessment.get("auto_approved") and result.get("artifacts", {}).get("final_answer"):
+        print("✓ Clean report finished without waiting for a reviewer")
+    else:
+        print("✗ Graph ended without a final answer")
+
+
 if __name__ == "__main__":
     asyncio.run(test_hitl())
+    asyncio.run(test_auto_approve())
@@ -0,0 +1,253 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from backend import page_fetcher
+from backend.page_fetcher import enrich_results, fetch_page, passages
+
+ARTICLE = (
+    "<html><head><title>Solid-state batteries</title><script>var ad = 'buy now';</script></head><body>"
+    "<nav>Home | Shop | Contact</nav>"
+    "<p>" + "Our newsletter covers many topics in technology, science and business every single week. " * 7 + "</p>"
+    "<p>Solid-state batteries replace the liquid electrolyte with a ceramic or polymer solid electrolyte, "
+    "which raises energy density and removes the flammable liquid from the cell.</p>"
+    "<p>Manufacturing costs remain the main obstacle: thin solid electrolyte layers are hard to produce at scale.</p>"
+    "<footer>Copyright</footer></body></html>"
+)
+
+# A long page: many content-length paragraphs, one of them on topic
+LONG_ARTICLE = "<html><body>" + "".join(
+    f"<p>Paragraph {i} is about gardening, weather and local news, written long enough to count as content here.</p>"
+    for i in range(150)
+) + "<p>Solid-state cells raise energy density with a solid electrolyte instead of a flammable liquid one.</p></body></html>"
+
+
+class StandIn(BaseHTTPRequestHandler):
+    # Concurrent /slow requests (the ones enrichment makes)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        slow = self.path.startswith("/slow")
+        if slow:
+            with StandIn.lock:
+                StandIn.active += 1
+                StandIn.peak = max(StandIn.peak, StandIn.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.3)
+                self._send("text/html", ARTICLE.encode())
+            elif self.path == "/hang":
+                time.sleep(2)
+                self._send("text/html", ARTICLE.encode())
+            elif self.path == "/long":
+                self._send("text/html", LONG_ARTICLE.encode())
+            elif self.path == "/huge":
+                self._send("text/html", ARTICLE.encode() + b"<p>" + b"x" * 500_000 + b"</p>")
+            elif self.path == "/binary":
+                self._send("application/pdf", b"%PDF-1.4")
+            elif self.path == "/redirect-metadata":
+                self.send_response(302)
+                self.send_header("Location", "http://169.254.169.254/latest/meta-data/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.path == "/redirect-article":
+                self.send_response(302)
+                self.send_header("Location", "/article")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.path == "/missing":
+                self._send("text/html", b"not found", status=404)
+            else:
+                self._send("text/html; charset=utf-8", ARTICLE.encode())
+        finally:
+            if slow:
+                with StandIn.lock:
+                    StandIn.active -= 1
+
+    def _send(self, content_type, body, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+
+
+def server_url() -> str:
+    """Base URL of the stand-in server, started once per process."""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{_server.server_address[1]}"
+
+
+def run(scenario, allow_loopback=True):
+    """Runs one scenario on a fresh event loop with fresh fetcher pools."""
+    async def wrapped():
+        page_fetcher.PAGE_FETCH_ALLOW_LOOPBACK = allow_loopback
+        try:
+            await scenario(server_url())
+        finally:
+            page_fetcher.PAGE_FETCH_ALLOW_LOOPBACK = False
+            await page_fetcher.aclose()
+            page_fetcher._host_limits.clear()
+            page_fetcher._limiter = None
+    asyncio.run(wrapped())
+
+
+async def check_extraction(base):
+    print("--- Testing fetch and main-text extraction ---")
+    text = await fetch_page(f"{base}/article")
+    print(f"Text: {text!r}")
+    if text and "electrolyte" in text and "buy now" not in text and "Home | Shop" not in text:
+        print("✓ Main text extracted, scripts and navigation dropped")
+    else:
+        print("✗ Extraction failed")
+    chunks = passages(text or "")
+    if chunks and all(len(p) >= page_fetcher.MIN_PASSAGE_CHARS for p in chunks) and "Copyright" not in " ".join(chunks):
+        print("✓ Boilerplate-length paragraphs dropped from passages")
+    else:
+        print("✗ Boilerplate kept")
+
+
+async def check_limits(base):
+    print("\n--- Testing timeout, size cap and content types ---")
+    page_fetcher.PAGE_FETCH_MAX_BYTES = 4096
+    huge = await fetch_page(f"{base}/huge")
+    page_fetcher.PAGE_FETCH_MAX_BYTES = 2 * 1024 * 1024
+    if huge is not None and len(huge) < 4096:
+        print(f"✓ Response cut at the size cap ({len(huge)} chars)")
+    else:
+        print("✗ Size cap not applied")
+
+    import httpx
+    client = httpx.AsyncClient(timeout=httpx.Timeout(0.5))
+    start = time.perf_counter()
+    hung = await fetch_page(f"{base}/hang", client)
+    await client.aclose()
+    if hung is None and time.perf_counter() - start < 1.5:
+        print("✓ Slow page given up at the timeout")
+    else:
+        print("✗ Timeout not applied")
+
+    if await fetch_page(f"{base}/binary") is None and await fetch_page(f"{base}/missing") is None:
+        print("✓ Non-text and error responses skipped")
+    else:
+        print("✗ Non-text or error response used")
+
+
+async def check_enrich_concurrently(base):
+    print("\n--- Testing concurrent enrichment with a per-host limit ---")
+    results = [
+        {"id": str(i + 1), "title": f"Result {i}", "url": f"{base}/slow/{i}", "quote": "short snippet"}
+        for i in range(6)
+    ] + [{"id": "7", "title": "Gone", "url": f"{base}/missing", "quote": "kept snippet"}]
+    StandIn.peak = 0
+    start = time.perf_counter()
+    enriched = await enrich_results("solid electrolyte energy density", results, top_n=7)
+    elapsed = time.perf_counter() - start
+    print(f"Peak concurrent requests: {StandIn.peak}, {elapsed:.2f}s")
+    if StandIn.peak <= page_fetcher.PAGE_FETCH_PER_HOST and StandIn.peak > 1:
+        print("✓ Requests ran concurrently within the per-host limit")
+    else:
+        print("✗ Per-host limit not respected")
+    first = enriched[0]
+    if (
+        first.get("fetched") and "energy density" in first["quote"] and "newsletter" not in first["quote"]
+        and first["snippet"] == "short snippet"
+    ):
+        print("✓ Quote is the most relevant passage, snippet kept alongside")
+    else:
+        print(f"✗ Unexpected quote: {first}")
+    if enriched[-1]["quote"] == "kept snippet" and not enriched[-1].get("fetched"):
+        print("✓ Unfetchable page keeps its search snippet")
+    else:
+        print("✗ Failed page changed")
+
+
+async def check_passage_cap(base):
+    print("\n--- Testing the per-page passage cap ---")
+    embedded = []
+
+    def embed(texts):
+        embedded.append(len(texts))
+        return [[float("energy" in t), float("density" in t), 1.0] for t in texts]
+
+    results = [{"id": "1", "title": "Long", "url": f"{base}/long", "quote": "snippet"}]
+    enriched = await enrich_results("solid electrolyte energy density", results, top_n=1, embed=embed)
+    print(f"Embedding batch sizes: {embedded}")
+    if embedded and embedded[0] <= 1 + page_fetcher.PAGE_FETCH_MAX_PASSAGES:
+        print("✓ Only the top passages of a long page are embedded")
+    else:
+        print("✗ Every passage embedded")
+    if "energy density" in enriched[0].get("quote", ""):
+        print("✓ The on-topic passage survives the cap")
+    else:
+        print(f"✗ On-topic passage dropped: {enriched[0]}")
+
+
+async def check_address_guard(base):
+    print("\n--- Testing private-address protection ---")
+    if await fetch_page(f"{base}/redirect-article"):
+        print("✓ Redirects to allowed addresses are followed")
+    else:
+        print("✗ Redirect not followed")
+    if await fetch_page(f"{base}/redirect-metadata") is None:
+        print("✓ Redirect to the link-local metadata address refused")
+    else:
+        print("✗ Followed a redirect to a link-local address")
+    blocked = [await fetch_page(url) for url in ("http://10.0.0.1/", "http://[::ffff:192.168.0.1]/", "file:///etc/passwd")]
+    if blocked == [None, None, None]:
+        print("✓ Private addresses and non-HTTP schemes refused")
+    else:
+        print("✗ Private address fetched")
+
+
+async def check_loopback_off(base):
+    if await fetch_page(f"{base}/article") is None:
+        print("✓ Loopback refused unless PAGE_FETCH_ALLOW_LOOPBACK is set")
+    else:
+        print("✗ Loopback fetched by default")
+
+
+def test_extraction():
+    run(check_extraction)
+
+
+def test_limits():
+    run(check_limits)
+
+
+def test_enrich_concurrently():
+    run(check_enrich_concurrently)
+
+
+def test_passage_cap():
+    run(check_passage_cap)
+
+
+def test_address_guard():
+    run(check_address_guard)
+    run(check_loopback_off, allow_loopback=False)
+
+
+if __name__ == "__main__":
+    test_extraction()
+    test_limits()
+    test_enrich_concurrently()
+    test_passage_cap()
+    test_address_guard()
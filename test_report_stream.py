@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from backend.agents.synthesis_agent import ReportStreamHandler
+
+REPORT = {
+    "summary": "Solid-state batteries trade cost for energy density.",
+    "sections": [
+        {"title": "Chemistry", "content": "A solid electrolyte replaces the liquid one [1]."},
+        {"title": "Cost", "content": "Manufacturing remains expensive [2]."},
+        {"title": "Outlook", "content": "Pilot lines are expected by 2027 [1]."},
+    ],
+    "tables": [],
+    "citations": [{"id": 1, "source": "Review", "url": "https://example.com/a", "quote": "q"}],
+}
+
+
+def pieces(size=7):
+    text = json.dumps(REPORT)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def json_schema_chunk(piece):
+    """What langchain-openai streams for method="json_schema": the JSON as message content."""
+    return ChatGenerationChunk(message=AIMessageChunk(content=piece), text=piece)
+
+
+def function_calling_chunk(piece):
+    """What it streams for method="function_calling": the JSON as tool-call argument chunks."""
+    message = AIMessageChunk(content="", tool_call_chunks=[{"name": None, "args": piece, "id": None, "index": 0}])
+    return ChatGenerationChunk(message=message, text="")
+
+
+async def stream(make_chunk, token_of):
+    events = []
+    received = 0
+
+    async def on_item(kind, index, item):
+        events.append((kind, index, received))
+
+    handler = ReportStreamHandler(on_item, mode="single")
+    chunks = pieces()
+    for piece in chunks:
+        received += 1
+        await handler.on_llm_new_token(token_of(piece), chunk=make_chunk(piece))
+    return events, len(chunks)
+
+
+def check(name, events, total):
+    kinds = [(kind, index) for kind, index, _ in events]
+    print(f"Events: {kinds}")
+    first_section = next((at for kind, _, at in events if kind == "section"), None)
+    if ("summary", 0) in kinds and ("section", 1) in kinds:
+        print(f"✓ {name}: summary and sections emitted from the stream")
+    else:
+        print(f"✗ {name}: items missing")
+    if first_section is not None and first_section < total:
+        print(f"✓ {name}: first section arrived at chunk {first_section} of {total}")
+    else:
+        print(f"✗ {name}: first section only at the end")
+
+
+def test_json_schema_stream():
+    print("--- Testing json_schema (content) streaming ---")
+    events, total = asyncio.run(stream(json_schema_chunk, lambda piece: piece))
+    check("json_schema", events, total)
+
+
+def test_function_calling_stream():
+    print("\n--- Testing function_calling (tool-call) streaming ---")
+    events, total = asyncio.run(stream(function_calling_chunk, lambda piece: ""))
+    check("function_calling", events, total)
+
+
+if __name__ == "__main__":
+    test_json_schema_stream()
+    test_function_calling_stream()
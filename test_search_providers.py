@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from mcp_servers.research.providers import LocalCorpusProvider, SearchError, SimulatedProvider
+
+DOCUMENTS = {
+    "batteries.md": (
+        "# Solid-state batteries\n\n"
+        "Solid-state batteries replace the liquid electrolyte with a solid one.\n\n"
+        "They promise higher energy density and better safety than lithium-ion cells."
+    ),
+    "heat/pumps.html": (
+        "<html><head><title>Heat pumps</title><script>var tracking = 'battery';</script></head>"
+        "<body><nav>Home | Battery shop</nav><p>A heat pump moves heat instead of burning fuel.</p>"
+        "<p>Running costs depend on electricity prices and the coefficient of performance.</p></body></html>"
+    ),
+    "notes.txt": "Grid storage often uses lithium-ion batteries for short durations.",
+    "ignored.pdf": "not indexed",
+}
+
+
+def make_corpus() -> str:
+    directory = tempfile.mkdtemp()
+    for name, content in DOCUMENTS.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return directory
+
+
+_provider = None
+
+
+def local_provider() -> LocalCorpusProvider:
+    """Provider over the test corpus, built once per process."""
+    global _provider
+    if _provider is None:
+        _provider = LocalCorpusProvider(make_corpus())
+    return _provider
+
+
+def test_local_ranking():
+    provider = local_provider()
+    print("--- Testing BM25 ranking over the local corpus ---")
+    results = provider.search("solid-state battery electrolyte", max_results=5)
+    print(f"Results: {[r['href'] for r in results]}")
+    if results and results[0]["href"] == "local://batteries.md" and results[0]["title"] == "Solid-state batteries":
+        print("✓ Most relevant document ranked first")
+    else:
+        print("✗ Unexpected ranking")
+    if all(r["href"] != "local://heat/pumps.html" for r in results):
+        print("✓ Script and navigation text of HTML pages is not indexed")
+    else:
+        print("✗ HTML boilerplate matched the query")
+
+
+def test_html_and_snippets():
+    provider = local_provider()
+    print("\n--- Testing HTML extraction and snippets ---")
+    results = provider.search("heat pump running costs electricity", max_results=1)
+    print(f"Result: {results}")
+    if results and results[0]["title"] == "Heat pumps" and results[0]["body"].startswith("Running costs"):
+        print("✓ Title from <title>, snippet is the best-matching paragraph")
+    else:
+        print("✗ Unexpected HTML result")
+    if provider.search("quantum chromodynamics", max_results=3) == []:
+        print("✓ No results for unrelated queries")
+    else:
+        print("✗ Unrelated query matched")
+
+
+def test_simulated_conditions():
+    provider = local_provider()
+    print("\n--- Testing simulated latency and errors ---")
+
+    def outcomes(seed):
+        simulated = SimulatedProvider(provider, latency_ms=5, jitter_ms=2, error_rate=0.3, seed=seed)
+        result = []
+        for _ in range(20):
+            try:
+                simulated.search("battery", max_results=1)
+                result.append("ok")
+            except SearchError:
+                result.append("error")
+        return result
+
+    start = time.perf_counter()
+    first = outcomes(seed=7)
+    elapsed = time.perf_counter() - start
+    print(f"Outcomes: {first.count('error')} errors in 20 calls, {elapsed:.3f}s")
+    if first == outcomes(seed=7) and 0 < first.count("error") < 20:
+        print("✓ Same seed, same failures")
+    else:
+        print("✗ Simulated failures are not reproducible")
+    if elapsed >= 20 * 0.003:
+        print("✓ Simulated latency applied")
+    else:
+        print("✗ Simulated latency missing")
+
+
+if __name__ == "__main__":
+    test_local_ranking()
+    test_html_and_snippets()
+    test_simulated_conditions()
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from backend.section_verification import split_sections, reverify
+
+REPORT = """Summary
+=======
+
+Batteries are improving [1].
+
+
+Chemistry
+---------
+Solid electrolytes replace liquids [1].
+
+
+Market
+------
+Sales will grow [2].
+
+References
+==========
+[1] Battery review — https://example.com/1
+[2] Market outlook — https://example.com/2"""
+
+SOURCES = [{"id": "1", "title": "Battery review", "text": ""}, {"id": "2", "title": "Market outlook", "text": ""}]
+
+
+def make_verifier(calls):
+    async def verify(text, sources):
+        calls.append(text)
+        claims = text.count("[")
+        return {
+            "supported_claims": claims,
+            "total_claims": claims,
+            "issues": [],
+        }
+    return verify
+
+
+async def test_incremental():
+    print("--- Testing section split ---")
+    titles = [title for title, _, _ in split_sections(REPORT)]
+    print(f"Sections: {titles}")
+    if titles == ["Summary", "Chemistry", "Market"]:
+        print("✓ Sections split on rendered headings, references skipped")
+    else:
+        print("✗ Unexpected sections")
+
+    print("\n--- Testing incremental re-verification ---")
+    calls = []
+    first = await reverify(REPORT, SOURCES, None, make_verifier(calls))
+    edited = REPORT.replace("Sales will grow [2].", "Sales will grow quickly [2]. Prices fall [2].")
+    calls.clear()
+    second = await reverify(edited, SOURCES, first["sections"], make_verifier(calls))
+    print(f"Re-verified: {second['reverified_sections']}, claims: {second['supported_claims']}/{second['total_claims']}")
+    if len(calls) == 1 and second["reverified_sections"] == ["Market"] and second["total_claims"] == 4:
+        print("✓ Only the edited section was re-verified")
+    else:
+        print("✗ Unexpected re-verification")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_incremental())